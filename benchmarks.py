@@ -0,0 +1,813 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks for the scraper's CPU-bound stages
+Uses real pages from a cassette recorded with `cli.py --record` when one is
+given, and generated pages otherwise.
+
+Usage:
+    python benchmarks.py parse --cassette crawl.jsonl.gz
+    python benchmarks.py parse --repeat 10
+    python benchmarks.py extract --cassette crawl.jsonl.gz
+    python benchmarks.py linkedin --cassette crawl.jsonl.gz
+    python benchmarks.py keywords --count 100000
+    python benchmarks.py citizenship --count 100000
+    python benchmarks.py features --count 100000
+    python benchmarks.py frame --count 100000 --unique 0.3
+"""
+
+import argparse
+import base64
+import gzip
+import json
+import random
+import re
+import statistics
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from bs4 import BeautifulSoup
+
+from citizenship import (CITIZENSHIP_KEYWORDS, CLEARANCE_KEYWORDS, SPONSORSHIP_KEYWORDS,
+                         SPONSORSHIP_OVERRIDE_KEYWORDS, CitizenshipClassifier)
+from html_parsing import BACKENDS, DEFAULT_BACKEND, HTML_PARSER, make_soup
+from job_parsers import detect_linkedin_card_flags, parse_indeed_results
+from keyword_matching import KeywordMatcher
+
+# How each page type's scraper finds its elements (mirrors job_scraper.py)
+PAGE_QUERIES = {
+    'indeed': ('div', {'class': 'job_seen_beacon'}),
+    'indeed_detail': ('div', {'class': 'jobsearch-jobDescriptionText'}),
+    'linkedin': ('div', {'class': 'job-search-card'}),
+    'glassdoor': ('div', {'data-test': 'jobListing'}),
+    'ziprecruiter': ('div', {'class': 'job_content'}),
+    'dice': ('div', {'class': 'card'}),
+}
+
+
+def measure(fn: Callable[[], object], repeat: int = 5) -> float:
+    """Median wall time of fn() in seconds"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def page_type_for_url(url: str):
+    if 'indeed.com/jobs' in url:
+        return 'indeed'
+    if 'indeed.com/viewjob' in url or 'indeed.com/rc/clk' in url:
+        return 'indeed_detail'
+    if 'linkedin.com/jobs/search' in url:
+        return 'linkedin'
+    if 'glassdoor.com/Job' in url:
+        return 'glassdoor'
+    if 'ziprecruiter.com' in url:
+        return 'ziprecruiter'
+    if 'dice.com/jobs' in url:
+        return 'dice'
+    return None
+
+
+def load_cassette_pages(path: str) -> List[Tuple[str, bytes]]:
+    """(page type, body) for every recorded 200 response of a known job board"""
+    pages = []
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            page_type = page_type_for_url(entry['url'])
+            if page_type and entry['status'] == 200:
+                pages.append((page_type, base64.b64decode(entry['body'])))
+    return pages
+
+
+def _page_chrome(size: int) -> str:
+    """Navigation, scripts and footer links that surround the cards on a real results page"""
+    nav = ''.join(f'<li class="nav-item"><a href="/browse/{i}">Category {i}</a></li>' for i in range(size))
+    script = '<script>window.__data = {' + ','.join(f'"k{i}": {i}' for i in range(size * 5)) + '};</script>'
+    footer = ''.join(f'<div class="footer-col"><span>Link {i}</span><a href="/l/{i}">More</a></div>' for i in range(size))
+    return f'<header><ul>{nav}</ul></header>{script}', f'<footer>{footer}</footer>'
+
+
+def synthetic_pages(cards: int = 15) -> List[Tuple[str, bytes]]:
+    header, footer = _page_chrome(300)
+    indeed_cards = ''.join(
+        f'<div class="job_seen_beacon"><table><tr><td><h2 class="jobTitle"><a href="/rc/clk?jk={i}">'
+        f'Senior Software Engineer {i}</a></h2><span data-testid="company-name">Company {i}</span>'
+        f'<div class="companyLocation">Austin, TX</div><span class="date">{i % 7} days ago</span>'
+        f'<ul>{"<li>Build scalable services in Python and Go</li>" * 4}</ul></td></tr></table></div>'
+        for i in range(cards)
+    )
+    linkedin_cards = ''.join(
+        f'<div class="base-card job-search-card"><a href="https://www.linkedin.com/jobs/view/{i}"></a>'
+        f'<h3 class="base-search-card__title">Security Engineer {i}</h3>'
+        f'<h4 class="base-search-card__subtitle">Company {i}</h4>'
+        f'<span class="job-search-card__location">Remote</span><span>Easy Apply</span></div>'
+        for i in range(cards)
+    )
+    detail = '<div class="jobsearch-jobDescriptionText">' + '<p>Design, build and operate services.</p>' * 60 + '</div>'
+    page = '<html><head><title>Jobs</title></head><body>{}<main>{}</main>{}</body></html>'
+    return [
+        ('indeed', page.format(header, indeed_cards, footer).encode()),
+        ('linkedin', page.format(header, linkedin_cards, footer).encode()),
+        ('indeed_detail', page.format(header, detail, footer).encode()),
+    ]
+
+
+def bench_parse(args):
+    pages = load_cassette_pages(args.cassette) if args.cassette else synthetic_pages()
+    if not pages:
+        print("No job board pages found in the cassette")
+        return
+
+    by_type: Dict[str, List[bytes]] = {}
+    for page_type, body in pages:
+        by_type.setdefault(page_type, []).append(body)
+
+    print(f"Parser backend: {HTML_PARSER}")
+    print(f"{'page type':<15}{'pages':>6}{'html.parser ms':>16}{'make_soup ms':>14}{'speedup':>9}")
+    for page_type, bodies in sorted(by_type.items()):
+        name, attrs = PAGE_QUERIES[page_type]
+
+        def legacy():
+            return [len(BeautifulSoup(body, 'html.parser').find_all(name, attrs=attrs)) for body in bodies]
+
+        def current():
+            return [len(make_soup(body, page_type).find_all(name, attrs=attrs)) for body in bodies]
+
+        if legacy() != current():
+            print(f"{page_type:<15} element counts differ between parsers, skipping")
+            continue
+        before = measure(legacy, args.repeat) * 1000
+        after = measure(current, args.repeat) * 1000
+        print(f"{page_type:<15}{len(bodies):>6}{before:>16.1f}{after:>14.1f}{before / after:>8.1f}x")
+
+
+def bench_extract(args):
+    pages = load_cassette_pages(args.cassette) if args.cassette else synthetic_pages(cards=50)
+    bodies = [body for page_type, body in pages if page_type == 'indeed']
+    if not bodies:
+        print("No Indeed results pages found in the cassette")
+        return
+
+    def extract(backend):
+        return [parse_indeed_results(body, 'United States', backend=backend) for body in bodies]
+
+    def comparable(results):
+        # posted_date is relative to the moment of parsing
+        return [[{k: v for k, v in card.items() if k != 'posted_date'} for card in page] for page in results]
+
+    backends = [backend for backend in BACKENDS if backend == 'soup' or DEFAULT_BACKEND == 'selectolax']
+    reference = comparable(extract('soup'))
+    print(f"Indeed card extraction, {len(bodies)} pages, {sum(len(page) for page in reference)} cards")
+    baseline = None
+    for backend in reversed(backends):
+        if comparable(extract(backend)) != reference:
+            print(f"{backend:<12} extracted different cards than soup, skipping")
+            continue
+        elapsed = measure(lambda: extract(backend), args.repeat) * 1000
+        baseline = baseline or elapsed
+        print(f"{backend:<12}{elapsed:>10.1f} ms{baseline / elapsed:>8.1f}x")
+
+
+def legacy_linkedin_flags(listing, job_url: str) -> Tuple[bool, bool]:
+    """(easy_apply, sponsored) exactly as scrape_linkedin_jobs computed them before detect_linkedin_card_flags"""
+    sponsored = "sponsored" in listing.get_text().lower()
+    job_text = listing.get_text().lower()
+    is_easy_apply = any(keyword in job_text for keyword in [
+        "easy apply", "quick apply", "apply now", "one-click apply",
+        "instant apply", "apply instantly", "fast apply", "in easy apply"
+    ])
+    easy_apply_buttons = listing.find_all(['button', 'span', 'div'],
+        string=lambda text: text and any(keyword in text.lower() for keyword in [
+            "easy apply", "quick apply", "apply now", "in easy apply"
+        ]))
+    if easy_apply_buttons:
+        is_easy_apply = True
+    if 'linkedin' in job_url.lower():
+        if any(indicator in job_url.lower() for indicator in ['easy-apply', 'quick-apply']):
+            is_easy_apply = True
+    easy_apply_elements = listing.find_all(['button', 'span', 'div'],
+        attrs={'aria-label': lambda x: x and any(keyword in x.lower() for keyword in [
+            "easy apply", "quick apply", "apply now", "in easy apply"
+        ])})
+    if easy_apply_elements:
+        is_easy_apply = True
+
+    if not is_easy_apply:
+        # The old "improved" detection: serialize the card and scan it again (result only logged)
+        job_html = str(listing).lower()
+        easy_apply_keywords = [
+            'easy apply', 'quick apply', 'apply now', 'one-click apply',
+            'instant apply', 'apply instantly', 'fast apply', 'in easy apply',
+            'easyapply', 'quickapply', 'applynow', 'easy-apply', 'quick-apply'
+        ]
+        if not any(keyword in job_html for keyword in easy_apply_keywords) and 'linkedin' in job_url.lower():
+            for button in listing.find_all(['button', 'span', 'div', 'a']):
+                if any(keyword in button.get_text().lower().strip() for keyword in easy_apply_keywords):
+                    break
+    return is_easy_apply, sponsored
+
+
+def synthetic_linkedin_cards(count: int = 300) -> bytes:
+    variants = [
+        '<span class="job-search-card__benefits">Easy Apply</span>',
+        '<button aria-label="Easy Apply to this job"><svg></svg></button>',
+        '<span class="job-posting-benefits__text">Promoted</span><span>Sponsored</span>',
+        '<span>Actively recruiting</span>',
+        '<div class="apply-method">Apply on company website</div>',
+    ]
+    cards = ''.join(
+        f'<div class="base-card job-search-card" data-entity-urn="urn:li:jobPosting:{i}">'
+        f'<a class="base-card__full-link" href="https://www.linkedin.com/jobs/view/{"easy-apply-" if i % 11 == 0 else ""}{i}?refId=x"></a>'
+        f'<div class="base-search-card__info"><h3 class="base-search-card__title">Engineer {i}</h3>'
+        f'<h4 class="base-search-card__subtitle"><a href="/company/{i}">Company {i}</a></h4>'
+        f'<div class="base-search-card__metadata"><span class="job-search-card__location">Remote</span>'
+        f'{variants[i % len(variants)]}<time datetime="2024-01-01">1 day ago</time></div></div></div>'
+        for i in range(count)
+    )
+    return f'<html><body><ul class="jobs-search__results-list">{cards}</ul></body></html>'.encode()
+
+
+def bench_linkedin(args):
+    if args.cassette:
+        bodies = [body for page_type, body in load_cassette_pages(args.cassette) if page_type == 'linkedin']
+    else:
+        bodies = [synthetic_linkedin_cards()]
+    cards = []
+    for body in bodies:
+        for listing in make_soup(body, 'linkedin').find_all('div', class_='job-search-card'):
+            link_elem = listing.find('a')
+            cards.append((listing, link_elem.get('href', '') if link_elem else ""))
+    if not cards:
+        print("No LinkedIn cards found in the cassette")
+        return
+
+    def legacy():
+        return [legacy_linkedin_flags(listing, url) for listing, url in cards]
+
+    def current():
+        return [(flags.easy_apply, flags.sponsored)
+                for flags in (detect_linkedin_card_flags(listing, url) for listing, url in cards)]
+
+    mismatches = sum(1 for old, new in zip(legacy(), current()) if old != new)
+    before = measure(legacy, args.repeat) * 1000
+    after = measure(current, args.repeat) * 1000
+    print(f"LinkedIn card flags, {len(cards)} cards, {mismatches} mismatches")
+    print(f"legacy        {before:>10.1f} ms")
+    print(f"single pass   {after:>10.1f} ms{before / after:>8.1f}x")
+
+
+SYNTHETIC_TECH_TITLE_WORDS = [
+    'senior', 'junior', 'staff', 'software', 'security', 'data', 'cloud', 'platform',
+    'engineer', 'developer', 'analyst', 'python', 'react', 'soc',
+]
+SYNTHETIC_OTHER_TITLE_WORDS = [
+    'senior', 'lead', 'registered', 'nurse', 'sales', 'account', 'executive', 'internal',
+    'auditor', 'driver', 'teacher', 'restaurant', 'manager', 'international', 'recruiter',
+]
+SYNTHETIC_DESCRIPTION_WORDS = [
+    'we', 'are', 'hiring', 'a', 'to', 'join', 'our', 'team', 'with', 'experience', 'in', 'and',
+    'customers', 'benefits', 'weekends', 'uniform', 'schedule', 'shifts', 'growing', 'company',
+    'salary', 'training', 'staffing', 'store', 'guests', 'location', 'paid', 'time', 'off',
+]
+
+
+def synthetic_postings(count: int, seed: int = 7) -> List[Tuple[str, str]]:
+    """(title, description) pairs, half with a tech title and half without"""
+    rng = random.Random(seed)
+    postings = []
+    for index in range(count):
+        title_words = SYNTHETIC_TECH_TITLE_WORDS if index % 2 else SYNTHETIC_OTHER_TITLE_WORDS
+        postings.append((' '.join(rng.choices(title_words, k=3)).title(),
+                         ' '.join(rng.choices(SYNTHETIC_DESCRIPTION_WORDS, k=60))))
+    return postings
+
+
+def bench_keywords(args):
+    from job_scraper import SoftwareEngineeringJobScraper
+    scraper = SoftwareEngineeringJobScraper()
+    terms = scraper.software_keywords + scraper.job_titles
+    postings = synthetic_postings(args.count)
+
+    def legacy():
+        # The per-keyword substring loops is_software_engineering_job used before
+        hits = 0
+        for title, description in postings:
+            text = (title + ' ' + description).lower()
+            if any(keyword.lower() in text for keyword in scraper.software_keywords) or \
+                    any(job_title.lower() in text.lower() for job_title in scraper.job_titles):
+                hits += 1
+        return hits
+
+    substring = KeywordMatcher(terms, word_boundaries=False)
+    whole_words = KeywordMatcher(terms)
+
+    def compiled(matcher):
+        return lambda: sum(1 for title, description in postings if matcher.matches(title + ' ' + description))
+
+    # Whole-word matching reports fewer relevant postings on purpose ("intern" no longer hits "internal")
+    baseline = measure(legacy, args.repeat)
+    print(f"Relevance check on {args.count} synthetic postings ({len(terms)} keywords and titles)")
+    print(f"{'legacy loops':<26}{baseline:>8.2f} s  {legacy():>7} relevant")
+    for name, matcher in (('compiled, substring', substring), ('compiled, whole words', whole_words)):
+        elapsed = measure(compiled(matcher), args.repeat)
+        print(f"{name:<26}{elapsed:>8.2f} s  {compiled(matcher)():>7} relevant{baseline / elapsed:>8.1f}x")
+
+
+def legacy_classify_citizenship(text: str) -> Dict:
+    """classify_citizenship_clearance as it was before CitizenshipClassifier"""
+    text_lower = text.lower()
+    citizenship_score = sum(1 for keyword in CITIZENSHIP_KEYWORDS if keyword in text_lower)
+    sponsorship_score = sum(1 for keyword in SPONSORSHIP_KEYWORDS if keyword in text_lower)
+    requires_citizenship = citizenship_score > 0
+    is_sponsorship_friendly = sponsorship_score > 0
+    if requires_citizenship and any(keyword in text_lower for keyword in SPONSORSHIP_OVERRIDE_KEYWORDS):
+        is_sponsorship_friendly = False
+    return {
+        'requires_us_citizenship': requires_citizenship,
+        'requires_security_clearance': any(keyword in text_lower for keyword in CLEARANCE_KEYWORDS),
+        'is_sponsorship_friendly': is_sponsorship_friendly,
+        'is_f1_student_friendly': is_sponsorship_friendly and not requires_citizenship,
+        'citizenship_score': citizenship_score,
+        'sponsorship_score': sponsorship_score
+    }
+
+
+def synthetic_citizenship_texts(count: int, words: int = 300, seed: int = 11) -> List[str]:
+    """Job texts mixing filler with a few citizenship/sponsorship phrases"""
+    rng = random.Random(seed)
+    phrases = CITIZENSHIP_KEYWORDS + SPONSORSHIP_KEYWORDS + ('U.S. Citizens Only', 'Sponsorship: none')
+    texts = []
+    for _ in range(count):
+        text = rng.choices(SYNTHETIC_DESCRIPTION_WORDS, k=words)
+        for _ in range(rng.randint(0, 3)):
+            text.insert(rng.randrange(len(text) + 1), rng.choice(phrases))
+        texts.append(' '.join(text))
+    return texts
+
+
+def bench_citizenship(args):
+    texts = synthetic_citizenship_texts(args.count, args.words)
+    legacy = [legacy_classify_citizenship(text) for text in texts]
+    baseline = measure(lambda: [legacy_classify_citizenship(text) for text in texts], args.repeat)
+    print(f"Citizenship classification of {args.count} synthetic job texts ({args.words} words each)")
+    print(f"{'legacy loops':<26}{baseline:>8.2f} s")
+    for name, classifier in (('classify_many', CitizenshipClassifier(use_automaton=False)),
+                             ('classify_many, automaton', CitizenshipClassifier())):
+        if name.endswith('automaton') and classifier._automaton is None:
+            print(f"{name:<26}  skipped (pyahocorasick is not installed)")
+            continue
+        mismatches = sum(1 for old, new in zip(legacy, classifier.classify_many(texts)) if old != new)
+        elapsed = measure(lambda: classifier.classify_many(texts), args.repeat)
+        print(f"{name:<26}{elapsed:>8.2f} s{baseline / elapsed:>8.1f}x  {mismatches} results differ")
+
+
+def synthetic_jobs(count: int, words: int = 300, seed: int = 13) -> List[Dict]:
+    """Job dicts with synthetic titles, descriptions and locations"""
+    rng = random.Random(seed)
+    titles = [title for title, _ in synthetic_postings(count, seed)]
+    descriptions = synthetic_citizenship_texts(count, words, seed)
+    locations = ['Remote', 'New York, NY', 'Austin, TX', 'Work from home', 'Seattle, WA']
+    return [
+        {'title': title, 'company': f"Company {index % 500}", 'location': rng.choice(locations),
+         'description': description, 'url': f"https://example.com/jobs/{index}", 'source': 'Synthetic',
+         'posted_date': '', 'experience_level': rng.choice([None, None, 'senior'])}
+        for index, (title, description) in enumerate(zip(titles, descriptions))
+    ]
+
+
+# classify_job's keyword lists and substring checks before FeatureExtractor
+LEGACY_FEATURE_KEYWORDS = {
+    'remote_friendly': ('remote', 'work from home', 'telecommute', 'distributed', 'anywhere'),
+    'visa_sponsorship': ('visa sponsorship', 'h1b', 'sponsor visa', 'work authorization'),
+    'security_clearance_required': ('security clearance', 'top secret', 'secret clearance', 'ts/sci'),
+}
+LEGACY_EXPERIENCE_KEYWORDS = (
+    ('senior', ('senior', 'sr.', 'lead', 'principal', 'staff')),
+    ('entry', ('junior', 'jr.', 'entry', 'associate', 'intern')),
+)
+LEGACY_CITIZENSHIP_REQUIRED_KEYWORDS = (
+    'us citizen', 'citizenship required', 'must be citizen', 'security clearance', 'clearance required'
+)
+
+
+def legacy_job_features(text: str) -> Tuple[Dict[str, bool], str, bool]:
+    text = text.lower()
+    flags = {flag: any(keyword in text for keyword in keywords) for flag, keywords in LEGACY_FEATURE_KEYWORDS.items()}
+    level = next((level for level, keywords in LEGACY_EXPERIENCE_KEYWORDS
+                  if any(keyword in text for keyword in keywords)), 'mid')
+    return flags, level, any(keyword in text for keyword in LEGACY_CITIZENSHIP_REQUIRED_KEYWORDS)
+
+
+def bench_features(args):
+    from job_features import FeatureExtractor
+    texts = [f"{job['title']} {job['description']} {job['location']}" for job in synthetic_jobs(args.count, args.words)]
+    extractor = FeatureExtractor()
+
+    def extracted(text):
+        features = extractor.extract(text)
+        return features.flags, features.experience_level, features.citizenship_required
+
+    # Whole-word matching changes some decisions on purpose ("staff" no longer hits "staffing")
+    changed = sum(1 for text in texts if legacy_job_features(text) != extracted(text))
+    baseline = measure(lambda: [legacy_job_features(text) for text in texts], args.repeat)
+    single_pass = measure(lambda: [extractor.extract(text) for text in texts], args.repeat)
+    labels = measure(lambda: [extractor.labels(text) for text in texts], args.repeat)
+    mismatched = sum(1 for text in texts if extractor.labels(text) != extracted(text))
+    assert not mismatched, f"labels() and extract() disagree on {mismatched} jobs"
+    backend = 'pyahocorasick' if extractor.matcher.has_automaton else 'regex'
+    print(f"classify_job features for {args.count} synthetic jobs ({args.words} words each)")
+    print(f"{'substring loops':<26}{baseline:>8.2f} s")
+    print(f"{'FeatureExtractor.labels':<26}{labels:>8.2f} s{baseline / labels:>8.1f}x  "
+          f"{changed} jobs classified differently")
+    print(f"{'FeatureExtractor, ' + backend:<26}{single_pass:>8.2f} s{baseline / single_pass:>8.1f}x  "
+          f"{changed} jobs classified differently")
+
+
+def bench_frame(args):
+    import tempfile
+    import job_frame
+    from job_scraper import SoftwareEngineeringJobScraper
+    from keyword_matching import compile_keywords
+    from unified_scraper import JobCategory, ScrapingConfig, UnifiedJobScraper
+    distinct = synthetic_jobs(max(1, int(args.count * args.unique)), args.words)
+    # A saved history: the same postings come back from several sources and runs
+    jobs = [dict(distinct[index % len(distinct)], url=f"https://example.com/jobs/{index}") for index in range(args.count)]
+    # After a keyword change nothing is cached yet
+    config = ScrapingConfig(state_dir=tempfile.mkdtemp(prefix='frame-bench-'), classification_cache_size=0)
+    scraper = SoftwareEngineeringJobScraper(config)
+    unified = UnifiedJobScraper(JobCategory.SOFTWARE_ENGINEERING, config)
+    matcher = compile_keywords(tuple(scraper.software_keywords) + tuple(scraper.job_titles))
+
+    def retag_rows():
+        relevant = [job for job in jobs if scraper.is_software_engineering_job(job['title'], job['description'])]
+        tagged = scraper.filter_citizenship_clearance([dict(job) for job in relevant], exclude_citizenship_required=True)
+        return scraper.filter_f1_student_friendly(tagged, f1_student=True)
+
+    def features_frame():
+        return job_frame.classify_features(job_frame.job_frame(jobs), unified.feature_extractor)
+
+    rows = retag_rows()
+    framed = scraper.retag(jobs, exclude_citizenship_required=True, f1_student=True)
+    assert [job['url'] for job in rows] == [job['url'] for job in framed], "retag() and the dict filters disagree"
+    backend = 'pyahocorasick' if matcher.has_automaton else 'regex'
+    print(f"Re-tagging {args.count} saved jobs ({len(distinct)} distinct postings, {args.words} words each, {backend})")
+    for name, baseline, columnar in (
+            ('relevance + citizenship', retag_rows,
+             lambda: scraper.retag(jobs, exclude_citizenship_required=True, f1_student=True)),
+            ('classify_job features', lambda: [unified.classify_job(job) for job in jobs], features_frame)):
+        dicts = measure(baseline, args.repeat)
+        frame = measure(columnar, args.repeat)
+        print(f"{name:<26}dicts {dicts:>6.2f} s   frame {frame:>6.2f} s{dicts / frame:>8.1f}x")
+    scraper.close()
+    unified.close()
+
+
+def bench_classifications(args):
+    import tempfile
+    from job_scraper import SoftwareEngineeringJobScraper
+    from unified_scraper import JobCategory, ScrapingConfig, UnifiedJobScraper
+    distinct = synthetic_jobs(max(1, int(args.count * args.unique)), args.words)
+    # The same postings come back from several sources and pages
+    jobs = [dict(distinct[index % len(distinct)], url=f"https://example.com/jobs/{index}") for index in range(args.count)]
+    state_dir = tempfile.mkdtemp(prefix='classification-bench-')
+
+    def run(config):
+        scraper = SoftwareEngineeringJobScraper(config)
+        unified = UnifiedJobScraper(JobCategory.SOFTWARE_ENGINEERING, config)
+
+        def classify():
+            scraper.filter_citizenship_clearance([dict(job) for job in jobs], exclude_citizenship_required=True)
+            for job in jobs:
+                unified.is_relevant_job(job['title'], job['description'])
+                unified.classify_job(job)
+
+        start = time.perf_counter()
+        classify()
+        first = time.perf_counter() - start
+        start = time.perf_counter()
+        classify()
+        scraper.classifications.save()
+        unified.classifications.save()
+        return first, time.perf_counter() - start
+
+    print(f"Classifying {args.count} synthetic jobs ({len(distinct)} distinct postings, {args.words} words each), "
+          f"then re-filtering them")
+    uncached, _ = run(ScrapingConfig(state_dir=state_dir, classification_cache_size=0))
+    print(f"{'no cache':<26}{uncached:>8.2f} s")
+    first, again = run(ScrapingConfig(state_dir=state_dir))
+    print(f"{'memory cache':<26}{first:>8.2f} s{uncached / first:>8.1f}x   re-filter {again:>6.2f} s"
+          f"{uncached / again:>8.1f}x")
+    persisted = ScrapingConfig(state_dir=state_dir, persist_classifications=True)
+    run(persisted)
+    restarted, _ = run(persisted)
+    print(f"{'persisted, next run':<26}{restarted:>8.2f} s{uncached / restarted:>8.1f}x")
+
+
+SYNTHETIC_COMPANY_WORDS = [
+    'acme', 'globex', 'initech', 'umbrella', 'stark', 'wayne', 'hooli', 'vandelay', 'wonka', 'tyrell',
+    'cyberdyne', 'soylent', 'oscorp', 'aperture', 'massive', 'dynamic', 'blue', 'north', 'summit', 'harbor',
+    'pioneer', 'vertex', 'quantum', 'bright', 'silver', 'granite', 'cedar', 'atlas', 'nova', 'delta',
+]
+SYNTHETIC_COMPANY_KINDS = ['labs', 'systems', 'health', 'analytics', 'logistics', 'retail', 'bank', 'energy',
+                           'media', 'foods', 'robotics', 'security', 'networks', 'partners', 'group']
+SYNTHETIC_COMPANY_SUFFIXES = ['', '', ' Inc.', ' LLC', ' Corporation', ', Inc']
+
+
+SYNTHETIC_AGENCIES = ['Robert Half', 'TEKsystems', 'Insight Global', 'Randstad', 'Kforce']
+
+
+def synthetic_listings(count: int, duplicate_share: float = 0.3, seed: int = 17,
+                       companies: Optional[int] = None, description_words: int = 0) -> List[Dict]:
+    """Scraped job dicts where duplicate_share of them repost an earlier job with typical variations.
+
+    companies limits how many distinct employers post, which makes the company blocks larger.
+    With description_words, postings get descriptions and some reposts come from
+    a staffing agency under its own name and a reworded title. Reposts share
+    the original's posting_id.
+    """
+    rng = random.Random(seed)
+    employers = None
+    if companies:
+        employers = [' '.join(rng.sample(SYNTHETIC_COMPANY_WORDS, 2) + [rng.choice(SYNTHETIC_COMPANY_KINDS)])
+                     for _ in range(companies)]
+    title_words = SYNTHETIC_TECH_TITLE_WORDS + SYNTHETIC_OTHER_TITLE_WORDS
+    locations = ['Remote', 'New York, NY', 'Austin, TX', 'Seattle, WA', 'Chicago, IL', 'Denver, CO']
+    jobs = []
+    for index in range(count):
+        if jobs and rng.random() < duplicate_share:
+            original = rng.choice(jobs)
+            job = dict(original, url=f"https://jobs.example.com/{index}")
+            variation = rng.randrange(6 if description_words else 5)
+            if variation == 0:  # Same posting on another board, company spelled with a suffix
+                job['company'] = original['company'].split(',')[0].replace(' Inc.', '') + rng.choice(
+                    SYNTHETIC_COMPANY_SUFFIXES[2:])
+            elif variation == 1:  # Same URL with tracking parameters
+                job['url'] = original['url'] + '?utm_source=newsletter&utm_medium=email'
+            elif variation == 2:  # Title reworded
+                job['title'] = f"{original['title']} - {rng.choice(['Remote', 'Hybrid', 'Contract'])}"
+            elif variation == 3:  # Typo
+                position = rng.randrange(len(original['title']))
+                job['title'] = original['title'][:position] + original['title'][position + 1:]
+            elif variation == 4:  # Posted again for another city
+                job['location'] = rng.choice(locations)
+            else:  # Reposted by a staffing agency
+                job['company'] = rng.choice(SYNTHETIC_AGENCIES)
+                job['title'] = f"{original['title']} ({rng.choice(['Contract', 'W2', 'Contract to Hire'])})"
+        else:
+            company = rng.choice(employers) if employers else ' '.join(
+                rng.sample(SYNTHETIC_COMPANY_WORDS, 2) + [rng.choice(SYNTHETIC_COMPANY_KINDS)])
+            job = {
+                'title': ' '.join(rng.choices(title_words, k=rng.randint(2, 4))).title(),
+                'company': company.title() + rng.choice(SYNTHETIC_COMPANY_SUFFIXES),
+                'location': rng.choice(locations),
+                'description': ' '.join(rng.choices(SYNTHETIC_DESCRIPTION_WORDS + title_words, k=description_words)),
+                'url': f"https://jobs.example.com/{index}",
+                'posting_id': index,
+                'source': rng.choice(['Indeed', 'LinkedIn', 'Glassdoor']),
+            }
+        jobs.append(job)
+    return jobs
+
+
+def legacy_remove_duplicates(scraper, jobs: List[Dict]) -> List[Dict]:
+    """job_scraper.py's remove_duplicates before blocking: token_set_ratio against every kept job"""
+    from rapidfuzz import fuzz
+    unique_jobs = []
+    for job in jobs:
+        title = scraper.canonicalize_text(job.get('title', ''))
+        company = scraper.canonicalize_company(job.get('company', ''))
+        duplicate = False
+        for existing in unique_jobs:
+            if title == existing[0] and company == existing[1]:
+                duplicate = True
+                break
+            if title and company and existing[0] and existing[1] and \
+                    fuzz.token_set_ratio(f"{title} {company}", f"{existing[0]} {existing[1]}") >= 92:
+                duplicate = True
+                break
+        if not duplicate:
+            unique_jobs.append((title, company, job))
+    return [job for _, _, job in unique_jobs]
+
+
+def legacy_unified_remove_duplicates(jobs: List[Dict], similarity_threshold: int = 85) -> List[Dict]:
+    """unified_scraper.py's remove_duplicates before blocking: fuzz.ratio against every kept job"""
+    from rapidfuzz import fuzz
+    unique_jobs, seen = [], []
+    for job in jobs:
+        signature = f"{job['title']} {job['company']} {job['location']}".lower()
+        if not any(fuzz.ratio(signature, other) >= similarity_threshold for other in seen):
+            unique_jobs.append(job)
+            seen.append(signature)
+    return unique_jobs
+
+
+def bench_dedup(args):
+    from dedup import deduplicate
+    from job_scraper import SoftwareEngineeringJobScraper
+    from rapidfuzz import fuzz
+    from unified_scraper import JobCategory, UnifiedJobScraper
+    scraper = SoftwareEngineeringJobScraper()
+    unified = UnifiedJobScraper(JobCategory.SOFTWARE_ENGINEERING)
+
+    def without_urls(signature):
+        # The old loops had no URL rule; compare like with like
+        return lambda job: signature(job)._replace(url='')
+
+    hierarchies = (
+        ('job_scraper', lambda jobs: legacy_remove_duplicates(scraper, jobs),
+         lambda jobs, urls=True, **options: deduplicate(
+             jobs, scraper._dedup_signature if urls else without_urls(scraper._dedup_signature), **options)),
+        ('unified_scraper', legacy_unified_remove_duplicates,
+         lambda jobs, urls=True, **options: deduplicate(
+             jobs, unified._dedup_signature if urls else without_urls(unified._dedup_signature),
+             scorer=fuzz.ratio, threshold=85, **options)),
+    )
+    sample = synthetic_listings(args.legacy_count, args.duplicates)
+    employers = f", {args.companies} employers" if args.companies else ''
+    descriptions = f", {args.description_words}-word descriptions" if args.description_words else ''
+    print(f"Deduplicating synthetic listings ({args.duplicates:.0%} reposts{employers}{descriptions})")
+    for name, legacy, blocked in hierarchies:
+        start = time.perf_counter()
+        expected = legacy(sample)
+        legacy_time = time.perf_counter() - start
+        start = time.perf_counter()
+        kept = blocked(sample, urls=False)
+        blocked_time = time.perf_counter() - start
+        # Jobs kept by one and not the other: pairs that share no block
+        differ = len({id(job) for job in expected} ^ {id(job) for job in kept})
+        url_drops = len(kept) - len(blocked(sample))
+        print(f"{name:<16}{args.legacy_count:>8} jobs  all pairs {legacy_time:>7.2f} s  blocked {blocked_time:>6.2f} s"
+              f"{legacy_time / blocked_time:>8.1f}x  {differ} jobs differ, {url_drops} more dropped by URL")
+        for count in args.counts:
+            jobs = synthetic_listings(count, args.duplicates, companies=args.companies,
+                                      description_words=args.description_words)
+            postings = len({job['posting_id'] for job in jobs})
+            reference = None
+            # Sharded runs of every engine that supports them, after the in-process ones
+            runs = [(engine, None) for engine in args.engines] + [
+                (engine, workers) for workers in args.workers for engine in args.engines if engine != 'minhash']
+            for engine, workers in runs:
+                start = time.perf_counter()
+                kept = blocked(jobs, engine=engine, jaccard_threshold=args.jaccard, workers=workers)
+                elapsed = time.perf_counter() - start
+                label = engine if workers is None else f"{engine}/{workers}"
+                kept_ids = [id(job) for job in kept]
+                reference = reference or kept_ids
+                # Against the generator's ground truth: reposts that survived, postings lost entirely
+                kept_postings = len({job['posting_id'] for job in kept})
+                print(f"{name:<16}{count:>8} jobs  {label:<10}{elapsed:>7.2f} s  kept {len(kept)}  "
+                      f"reposts kept {len(kept) - kept_postings}, postings lost {postings - kept_postings}"
+                      f"{'' if kept_ids == reference else '  (differs from ' + args.engines[0] + ')'}")
+
+
+LEGACY_COMPANY_SUFFIXES = [
+    r'\b(inc\.?|incorporated)\b', r'\b(llc\.?|limited liability company)\b', r'\b(corp\.?|corporation)\b',
+    r'\b(ltd\.?|limited)\b', r'\b(co\.?|company)\b', r'\b(llp\.?|limited liability partnership)\b',
+    r'\b(plc\.?|public limited company)\b', r'\b(ag\.?|aktiengesellschaft)\b',
+    r'\b(gmbh\.?|gesellschaft mit beschränkter haftung)\b',
+]
+LEGACY_TRACKING_PARAMS = ['utm_source', 'utm_medium', 'utm_campaign', 'utm_term', 'utm_content', 'gclid', 'fbclid',
+                          'msclkid', 'ref', 'source', 'campaign', 'clickid', 'affiliate', 'partner', 'referrer']
+
+
+def legacy_canonicalize_text(text: str) -> str:
+    """job_scraper.py's canonicalize_text before the canonicalization module"""
+    if not text:
+        return ""
+    return re.sub(r'\s+', ' ', re.sub(r'[^\w\s]', ' ', text.lower())).strip()
+
+
+def legacy_canonicalize_company(company: str) -> str:
+    """job_scraper.py's canonicalize_company before the canonicalization module: one re.sub per suffix"""
+    if not company:
+        return ""
+    text = company.lower()
+    for suffix in LEGACY_COMPANY_SUFFIXES:
+        text = re.sub(suffix, '', text)
+    return legacy_canonicalize_text(text)
+
+
+def legacy_canonicalize_url(url: str) -> str:
+    """job_scraper.py's canonicalize_url before the canonicalization module"""
+    if not url:
+        return ""
+    parsed = urlparse(url)
+    cleaned = {key: values for key, values in parse_qs(parsed.query).items()
+               if any(word in key.lower() for word in ['job', 'id', 'req', 'position', 'posting'])
+               or key.lower() not in LEGACY_TRACKING_PARAMS}
+    query = '&'.join(f"{key}={values[0]}" for key, values in cleaned.items())
+    return f"{parsed.scheme}://{parsed.netloc}{parsed.path}" + (f"?{query}" if query else '')
+
+
+def bench_canonicalize(args):
+    import canonicalization
+    from canonicalization import canonicalize_many
+    jobs = synthetic_listings(args.count, args.duplicates, companies=args.companies)
+    legacy = [(legacy_canonicalize_text(job['title']), legacy_canonicalize_company(job['company']),
+               legacy_canonicalize_url(job['url'])) for job in jobs]
+
+    def cold(run):
+        def timed():
+            canonicalization.canonicalize_company.cache_clear()
+            canonicalization.canonicalize_url.cache_clear()
+            run()
+        return timed
+
+    canonicalize_many(jobs)
+    mismatches = sum(1 for job, old in zip(jobs, legacy)
+                     if (job['canonical_title'], job['canonical_company'], job['canonical_url']) != old)
+    baseline = measure(lambda: [(legacy_canonicalize_text(job['title']), legacy_canonicalize_company(job['company']),
+                                 legacy_canonicalize_url(job['url'])) for job in jobs], args.repeat)
+    print(f"Canonicalizing {args.count} synthetic listings ({args.duplicates:.0%} reposts, "
+          f"{len({job['company'] for job in jobs})} distinct companies)")
+    print(f"{'legacy methods':<26}{baseline:>8.2f} s")
+    for name, run in (('canonicalize_many', cold(lambda: canonicalize_many(jobs))),
+                      ('canonicalize_many, warm', lambda: canonicalize_many(jobs))):
+        elapsed = measure(run, args.repeat)
+        print(f"{name:<26}{elapsed:>8.2f} s{baseline / elapsed:>8.1f}x")
+    print(f"{mismatches} jobs canonicalized differently")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the scraper\'s CPU-bound stages')
+    subparsers = parser.add_subparsers(dest='benchmark', required=True)
+
+    parse_parser = subparsers.add_parser('parse', help='HTML parsing: html.parser vs make_soup')
+    parse_parser.add_argument('--cassette', help='Cassette recorded with cli.py --record')
+    parse_parser.add_argument('--repeat', type=int, default=5)
+    parse_parser.set_defaults(func=bench_parse)
+
+    extract_parser = subparsers.add_parser('extract', help='Indeed card extraction per HTML backend')
+    extract_parser.add_argument('--cassette', help='Cassette recorded with cli.py --record')
+    extract_parser.add_argument('--repeat', type=int, default=5)
+    extract_parser.set_defaults(func=bench_extract)
+
+    linkedin_parser = subparsers.add_parser('linkedin', help='LinkedIn Easy Apply/sponsored detection')
+    linkedin_parser.add_argument('--cassette', help='Cassette recorded with cli.py --record')
+    linkedin_parser.add_argument('--repeat', type=int, default=5)
+    linkedin_parser.set_defaults(func=bench_linkedin)
+
+    keywords_parser = subparsers.add_parser('keywords', help='Job relevance keyword matching')
+    keywords_parser.add_argument('--count', type=int, default=100000)
+    keywords_parser.add_argument('--repeat', type=int, default=3)
+    keywords_parser.set_defaults(func=bench_keywords)
+
+    citizenship_parser = subparsers.add_parser('citizenship', help='Citizenship/clearance classification')
+    citizenship_parser.add_argument('--count', type=int, default=100000)
+    citizenship_parser.add_argument('--words', type=int, default=300, help='Filler words per job text')
+    citizenship_parser.add_argument('--repeat', type=int, default=3)
+    citizenship_parser.set_defaults(func=bench_citizenship)
+
+    features_parser = subparsers.add_parser('features', help='classify_job feature extraction')
+    features_parser.add_argument('--count', type=int, default=100000)
+    features_parser.add_argument('--words', type=int, default=300, help='Filler words per description')
+    features_parser.add_argument('--repeat', type=int, default=3)
+    features_parser.set_defaults(func=bench_features)
+
+    frame_parser = subparsers.add_parser('frame', help='Re-tagging saved jobs: dicts vs a pandas frame')
+    frame_parser.add_argument('--count', type=int, default=100000)
+    frame_parser.add_argument('--unique', type=float, default=0.3, help='Share of distinct postings')
+    frame_parser.add_argument('--words', type=int, default=300, help='Filler words per description')
+    frame_parser.add_argument('--repeat', type=int, default=3)
+    frame_parser.set_defaults(func=bench_frame)
+
+    classifications_parser = subparsers.add_parser('classifications', help='Memoized classification results')
+    classifications_parser.add_argument('--count', type=int, default=100000)
+    classifications_parser.add_argument('--unique', type=float, default=0.3, help='Share of distinct postings')
+    classifications_parser.add_argument('--words', type=int, default=300, help='Filler words per description')
+    classifications_parser.set_defaults(func=bench_classifications)
+
+    canonicalize_parser = subparsers.add_parser('canonicalize', help='Title, company and URL canonicalization')
+    canonicalize_parser.add_argument('--count', type=int, default=100000)
+    canonicalize_parser.add_argument('--duplicates', type=float, default=0.3, help='Share of reposted jobs')
+    canonicalize_parser.add_argument('--companies', type=int, help='Distinct employers')
+    canonicalize_parser.add_argument('--repeat', type=int, default=3)
+    canonicalize_parser.set_defaults(func=bench_canonicalize)
+
+    dedup_parser = subparsers.add_parser('dedup', help='remove_duplicates: all pairs vs blocking')
+    dedup_parser.add_argument('--counts', type=int, nargs='+', default=[10000, 100000])
+    dedup_parser.add_argument('--legacy-count', type=int, default=2000,
+                              help='Jobs to run the quadratic loops on (they take minutes beyond a few thousand)')
+    dedup_parser.add_argument('--duplicates', type=float, default=0.3, help='Share of reposted jobs')
+    dedup_parser.add_argument('--companies', type=int, help='Distinct employers (fewer means larger blocks)')
+    dedup_parser.add_argument('--description-words', type=int, default=0,
+                              help='Give postings descriptions (and add staffing-agency reposts)')
+    dedup_parser.add_argument('--engines', nargs='+', default=['blocking', 'cdist', 'minhash', 'cluster'])
+    dedup_parser.add_argument('--jaccard', type=float, default=0.6, help='MinHash engine threshold')
+    dedup_parser.add_argument('--workers', type=int, nargs='+', default=[],
+                              help='Also run each engine sharded over this many processes (1: inline)')
+    dedup_parser.set_defaults(func=bench_dedup)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
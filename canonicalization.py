@@ -0,0 +1,92 @@
+"""
+Canonical forms of job titles, company names and URLs
+Shared by both scraper hierarchies and the dedup stage. Company suffixes are
+stripped by one precompiled alternation, and companies and URLs, which repeat
+heavily within and across runs, are memoized in bounded LRU caches
+"""
+
+import re
+import logging
+from functools import lru_cache
+from typing import Dict, Iterable, List
+from urllib.parse import parse_qs, urlparse
+
+logger = logging.getLogger(__name__)
+
+# Legal-form suffixes, in the order the scrapers used to strip them one re.sub at a
+# time. 'limited liability partnership' and 'public limited company' are left out:
+# 'limited' was always stripped before they were tried, so they never matched
+_COMPANY_SUFFIX = re.compile(
+    r'\b(?:inc\.?|incorporated|llc\.?|limited liability company|corp\.?|corporation|ltd\.?|limited'
+    r'|co\.?|company|llp\.?|plc\.?|ag\.?|aktiengesellschaft|gmbh\.?|gesellschaft mit beschränkter haftung)\b'
+)
+_PUNCTUATION = re.compile(r'[^\w\s]')
+
+TRACKING_PARAMS = frozenset([
+    'utm_source', 'utm_medium', 'utm_campaign', 'utm_term', 'utm_content',
+    'gclid', 'fbclid', 'msclkid', 'ref', 'source', 'campaign',
+    'clickid', 'affiliate', 'partner', 'referrer'
+])
+# Query parameters naming one of these are kept even when they look like tracking
+_JOB_PARAM_WORDS = ('job', 'id', 'req', 'position', 'posting')
+# Already canonical: lowercase http(s), a plain host and path, no query, params or fragment
+_PLAIN_URL = re.compile(r'https?://[^/?#;\[\]\\\x00-\x20\x7f]*(?:/[^?#;\\\x00-\x20\x7f]*)?')
+
+# Distinct companies and URLs remembered; a crawl rarely sees more
+CACHE_SIZE = 1 << 16
+
+
+def canonicalize_text(text: str) -> str:
+    """Lowercased text with punctuation turned into spaces and whitespace collapsed"""
+    if not text:
+        return ""
+    return ' '.join(_PUNCTUATION.sub(' ', text.lower()).split())
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def canonicalize_company(company: str) -> str:
+    """Canonical company name: canonicalize_text without legal-form suffixes ("Acme, Inc." -> "acme")"""
+    if not company:
+        return ""
+    return canonicalize_text(_COMPANY_SUFFIX.sub('', company.lower()))
+
+
+@lru_cache(maxsize=256)
+def _keep_param(key: str) -> bool:
+    key = key.lower()
+    return any(word in key for word in _JOB_PARAM_WORDS) or key not in TRACKING_PARAMS
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def canonicalize_url(url: str) -> str:
+    """URL without tracking parameters, fragment or params, keeping job id parameters"""
+    if not url:
+        return ""
+    # Most job URLs carry no query; urlparse would only hand them back unchanged
+    if url.isascii() and _PLAIN_URL.fullmatch(url):
+        return url
+
+    try:
+        parsed = urlparse(url)
+        query = '&'.join(f"{key}={values[0]}" for key, values in parse_qs(parsed.query).items()
+                         if _keep_param(key))
+        canonical_url = f"{parsed.scheme}://{parsed.netloc}{parsed.path}"
+        if query:
+            canonical_url += f"?{query}"
+        return canonical_url
+    except Exception as e:
+        logger.warning(f"Error canonicalizing URL {url}: {e}")
+        return url
+
+
+def canonicalize_job(job: Dict) -> Dict:
+    """Set job's canonical_title, canonical_company and canonical_url (in place) and return it"""
+    job['canonical_title'] = canonicalize_text(job.get('title', ''))
+    job['canonical_company'] = canonicalize_company(job.get('company', ''))
+    job['canonical_url'] = canonicalize_url(job.get('url', ''))
+    return job
+
+
+def canonicalize_many(jobs: Iterable[Dict]) -> List[Dict]:
+    """canonicalize_job for every job of a batch, e.g. before remove_duplicates builds its signatures"""
+    return [canonicalize_job(job) for job in jobs]
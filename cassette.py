@@ -0,0 +1,158 @@
+"""
+Record/replay cassettes for scraper HTTP traffic
+In record mode every request/response pair that goes through a ScraperSession is
+appended to a gzip-compressed JSON-lines corpus; in replay mode the corpus is
+served back with no network access, so parsing, classification and dedup can be
+profiled offline on real pages
+"""
+
+import base64
+import gzip
+import json
+import os
+import threading
+import time
+import logging
+from collections import defaultdict, deque
+from typing import Deque, Dict, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+logger = logging.getLogger(__name__)
+
+# Query parameters that must never be written to disk or used as replay keys
+SECRET_PARAMS = {'api_key', 'apikey', 'key', 'token', 'access_token'}
+
+_DROPPED_HEADERS = {'content-encoding', 'content-length', 'transfer-encoding', 'connection', 'set-cookie'}
+
+
+def scrub_url(url: str) -> str:
+    """Remove credentials from a URL so it can be stored and matched safely"""
+    parsed = urlparse(url)
+    if not parsed.query:
+        return url
+    query = [(k, v) for k, v in parse_qsl(parsed.query, keep_blank_values=True) if k.lower() not in SECRET_PARAMS]
+    return urlunparse(parsed._replace(query=urlencode(query)))
+
+
+class Cassette:
+    """On-disk corpus of recorded responses.
+
+    A recording is only a complete gzip file once close() has run, which
+    ScraperSession.close() (and so the scrapers' close()) takes care of.
+    """
+
+    def __init__(self, path: str, mode: str):
+        if mode not in ('record', 'replay'):
+            raise ValueError(f"Unsupported cassette mode: {mode}")
+        self.path = path
+        self.mode = mode
+        self._lock = threading.Lock()
+        self._entries: Dict[Tuple[str, str], Deque[Dict]] = defaultdict(deque)
+        self._file = None
+        self.recorded = 0
+        self.replayed = 0
+        self.missed = 0
+
+        if mode == 'replay':
+            self._load()
+        else:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._file = gzip.open(path, 'at', encoding='utf-8')
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            raise FileNotFoundError(f"Cassette not found: {self.path}")
+        with gzip.open(self.path, 'rt', encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                self._entries[(entry['method'], entry['url'])].append(entry)
+        logger.info(f"Loaded {sum(len(v) for v in self._entries.values())} recorded responses from {self.path}")
+
+    def record(self, request: requests.PreparedRequest, response: requests.Response):
+        entry = {
+            'method': request.method,
+            'url': scrub_url(request.url),
+            'status': response.status_code,
+            'reason': response.reason,
+            'headers': {k: v for k, v in response.headers.items() if k.lower() not in _DROPPED_HEADERS},
+            'body': base64.b64encode(response.content or b'').decode('ascii'),
+            'recorded_at': time.time(),
+        }
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(json.dumps(entry, separators=(',', ':')) + '\n')
+            self.recorded += 1
+
+    def play(self, request: requests.PreparedRequest) -> Optional[Dict]:
+        """Next recorded response for the request; the last one repeats once a URL is exhausted"""
+        key = (request.method, scrub_url(request.url))
+        with self._lock:
+            queue = self._entries.get(key)
+            if not queue:
+                self.missed += 1
+                return None
+            self.replayed += 1
+            return queue.popleft() if len(queue) > 1 else queue[0]
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+                logger.info(f"Recorded {self.recorded} responses to {self.path}")
+
+
+class RecordingAdapter(BaseAdapter):
+    """Sends requests through the real transport and writes every response to the cassette"""
+
+    def __init__(self, adapter: BaseAdapter, cassette: Cassette):
+        super().__init__()
+        self.adapter = adapter
+        self.cassette = cassette
+
+    def send(self, request, **kwargs):
+        response = self.adapter.send(request, **kwargs)
+        self.cassette.record(request, response)
+        return response
+
+    def close(self):
+        self.adapter.close()
+        self.cassette.close()
+
+
+class ReplayAdapter(BaseAdapter):
+    """Serves responses from the cassette and never touches the network"""
+
+    def __init__(self, cassette: Cassette):
+        super().__init__()
+        self.cassette = cassette
+
+    def send(self, request, **kwargs):
+        entry = self.cassette.play(request)
+        if entry is None:
+            raise requests.ConnectionError(f"No recorded response for {request.method} {scrub_url(request.url)}",
+                                           request=request)
+        response = requests.Response()
+        response.status_code = entry['status']
+        response.reason = entry.get('reason') or ''
+        response.headers = CaseInsensitiveDict(entry['headers'])
+        response.encoding = get_encoding_from_headers(response.headers)
+        response._content = base64.b64decode(entry['body'])
+        response._content_consumed = True
+        response.url = request.url
+        response.request = request
+        response.from_cassette = True
+        return response
+
+    def close(self):
+        pass
@@ -0,0 +1,131 @@
+"""
+Citizenship, security clearance and sponsorship classification
+The keyword lists are compiled once and every distinct phrase is looked up once
+per text, with a single Aho-Corasick scan when pyahocorasick is installed
+"""
+
+import logging
+from typing import Dict, FrozenSet, Iterable, List, Optional, Sequence, Union
+
+try:
+    import ahocorasick
+except ImportError:  # Optional: the plain substring checks give identical results
+    ahocorasick = None
+
+from classification_cache import ClassificationCache, keyword_version
+
+logger = logging.getLogger(__name__)
+
+CITIZENSHIP_KEYWORDS = (
+    # Direct citizenship requirements
+    'us citizen', 'u.s. citizen', 'united states citizen',
+    'us citizenship', 'u.s. citizenship', 'united states citizenship',
+    'must be a us citizen', 'requires us citizenship',
+    'us citizen only', 'citizenship required',
+
+    # Security clearance requirements
+    'eligible for security clearance', 'security clearance required',
+    'security clearance', 'government clearance', 'public trust',
+    'background check', 'federal clearance', 'defense clearance',
+    'top secret', 'secret clearance', 'confidential clearance',
+    'government contractor', 'department of defense', 'dod',
+    'federal government', 'national security',
+
+    # Exclusion keywords
+    'no sponsorship', 'no visa sponsorship', 'citizens only',
+    'us citizens only', 'must be us citizen'
+)
+
+# Sponsorship/OPT-CPT friendly keywords
+SPONSORSHIP_KEYWORDS = (
+    # Explicit sponsorship mentions
+    'sponsor', 'sponsorship', 'h1b', 'h-1b', 'visa sponsorship',
+    'international', 'global', 'remote', 'work from home',
+    'f1', 'opt', 'cpt', 'stem opt', 'optional practical training',
+    'diversity', 'inclusive', 'equal opportunity',
+
+    # Positive indicators
+    'sponsor h1b', 'h1b sponsorship', 'visa support',
+    'international candidates welcome', 'global talent',
+    'remote work', 'work from anywhere'
+)
+
+# An explicit citizenship requirement with one of these overrides any sponsorship hint
+SPONSORSHIP_OVERRIDE_KEYWORDS = ('citizens only', 'us citizens only', 'no sponsorship')
+
+CLEARANCE_KEYWORDS = ('security clearance', 'government clearance', 'top secret', 'secret clearance')
+
+
+class CitizenshipClassifier:
+    """Precompiled citizenship/clearance/sponsorship classifier.
+
+    Keywords match as plain substrings of the lowercased text and each score
+    counts the distinct keywords of its list that occur, exactly as the
+    scrapers' original per-keyword loops did. With a ClassificationCache, a
+    text classified before (under the same keyword lists) is not scanned again.
+    """
+
+    def __init__(self, citizenship_keywords: Sequence[str] = CITIZENSHIP_KEYWORDS,
+                 sponsorship_keywords: Sequence[str] = SPONSORSHIP_KEYWORDS,
+                 override_keywords: Sequence[str] = SPONSORSHIP_OVERRIDE_KEYWORDS,
+                 clearance_keywords: Sequence[str] = CLEARANCE_KEYWORDS,
+                 use_automaton: bool = True, cache: Optional[ClassificationCache] = None):
+        self.citizenship_keywords = tuple(citizenship_keywords)
+        self.sponsorship_keywords = tuple(sponsorship_keywords)
+        self.override_keywords = frozenset(override_keywords)
+        self.clearance_keywords = frozenset(clearance_keywords)
+        # Each distinct phrase is looked up once even when several lists share it
+        self.terms = tuple(dict.fromkeys(
+            self.citizenship_keywords + self.sponsorship_keywords
+            + tuple(self.override_keywords) + tuple(self.clearance_keywords)
+        ))
+        self.version = keyword_version('citizenship', self.citizenship_keywords, self.sponsorship_keywords,
+                                       self.override_keywords, self.clearance_keywords)
+        self.cache = cache
+        self._automaton = None
+        if use_automaton and ahocorasick is not None:
+            self._automaton = ahocorasick.Automaton()
+            for term in self.terms:
+                self._automaton.add_word(term, term)
+            self._automaton.make_automaton()
+
+    def found(self, text_lower: str) -> FrozenSet[str]:
+        """The distinct keywords (of any list) occurring in already lowercased text"""
+        if self._automaton is not None:
+            return frozenset(term for _, term in self._automaton.iter(text_lower))
+        return frozenset(term for term in self.terms if term in text_lower)
+
+    def classify(self, text: str) -> Dict[str, Union[bool, int]]:
+        if self.cache is not None:
+            return dict(self.cache.get_or_compute(self.version, text, self._classify))
+        return self._classify(text)
+
+    def _classify(self, text: str) -> Dict[str, Union[bool, int]]:
+        found = self.found(text.lower())
+        citizenship_score = sum(1 for keyword in self.citizenship_keywords if keyword in found)
+        sponsorship_score = sum(1 for keyword in self.sponsorship_keywords if keyword in found)
+
+        requires_citizenship = citizenship_score > 0
+        is_sponsorship_friendly = sponsorship_score > 0
+        # Override logic: if explicit citizenship requirement, override sponsorship
+        if requires_citizenship and not found.isdisjoint(self.override_keywords):
+            is_sponsorship_friendly = False
+
+        return {
+            'requires_us_citizenship': requires_citizenship,
+            'requires_security_clearance': not found.isdisjoint(self.clearance_keywords),
+            'is_sponsorship_friendly': is_sponsorship_friendly,
+            'is_f1_student_friendly': is_sponsorship_friendly and not requires_citizenship,
+            'citizenship_score': citizenship_score,
+            'sponsorship_score': sponsorship_score
+        }
+
+    def classify_many(self, texts: Iterable[str]) -> List[Dict[str, Union[bool, int]]]:
+        """classify() for each text, in order; repeated texts are only scanned once"""
+        results: Dict[str, Dict] = {}
+        classified = []
+        for text in texts:
+            if text not in results:
+                results[text] = self.classify(text)
+            classified.append(dict(results[text]))
+        return classified
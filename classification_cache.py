@@ -0,0 +1,175 @@
+"""
+Memoized classification results
+Results are keyed by a hash of the lowercased text and the classifier's version,
+a digest of the keyword sets it was built from, so a description seen on another
+source, page or run is classified once and editing a keyword list retires every
+result computed with the old one. Entries can also be kept in SQLite between runs
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+
+def normalize_text(text: str) -> str:
+    """Lowercased text; what classifiers see and cache keys hash.
+
+    Whitespace is left alone: classifiers match phrases as written, so "us
+    citizen" split by a line break must not share a result with "us citizen".
+    """
+    return text.lower()
+
+
+def keyword_version(*parts: Any) -> str:
+    """Short digest of the keyword sets (and any other JSON-able settings) a classifier depends on.
+
+    Sets are hashed in sorted order, so the version only changes when their contents do.
+    """
+    blob = json.dumps(parts, sort_keys=True, default=sorted)
+    return hashlib.sha1(blob.encode('utf-8')).hexdigest()[:16]
+
+
+class ClassificationCache:
+    """LRU of classification results keyed by (normalized text, classifier version).
+
+    max_entries 0 disables caching; compute still receives the normalized text,
+    so results never depend on whether they came from the cache. With a path,
+    misses are looked up in (and new results written to) a SQLite table trimmed
+    to max_entries, so results must be JSON-serializable; they reach the disk
+    on save() or close(), which the scrapers call when a scrape ends. Cached
+    values are shared; callers copy mutable ones before handing them out.
+    """
+
+    def __init__(self, max_entries: int = 100_000, path: Optional[str] = None, flush_every: int = 1000):
+        self.max_entries = max_entries
+        self.path = path if max_entries > 0 else None
+        self.flush_every = flush_every
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries: 'OrderedDict[str, Any]' = OrderedDict()
+        self._pending: Dict[str, str] = {}
+        self._touched: Dict[str, None] = {}
+        self._conn = None
+        if self.path:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute('''
+                CREATE TABLE IF NOT EXISTS classifications (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    used_at REAL NOT NULL
+                )
+            ''')
+            self._conn.execute('CREATE INDEX IF NOT EXISTS classifications_used_at ON classifications (used_at)')
+            self._conn.commit()
+
+    @staticmethod
+    def key(version: str, text: str) -> str:
+        """Cache key of already normalized text under a classifier version"""
+        return hashlib.sha1(f"{version}\0{text}".encode('utf-8', 'surrogatepass')).hexdigest()
+
+    def get_or_compute(self, version: str, text: str, compute: Callable[[str], T]) -> T:
+        """compute(normalized text), or the result cached for the same text and version"""
+        text = normalize_text(text)
+        if self.max_entries <= 0:
+            return compute(text)
+        key = self.key(version, text)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            stored = self._load(key)
+        if stored is not None:
+            value = json.loads(stored)
+            self._store(key, value, None, hit=True)
+            return value
+
+        value = compute(text)
+        self._store(key, value, json.dumps(value) if self._conn is not None else None, hit=False)
+        return value
+
+    def _load(self, key: str) -> Optional[str]:
+        if self._conn is None:
+            return None
+        stored = self._pending.get(key)
+        if stored is None:
+            row = self._conn.execute('SELECT value FROM classifications WHERE key = ?', (key,)).fetchone()
+            stored = row[0] if row else None
+        return stored
+
+    def _store(self, key: str, value: Any, serialized: Optional[str], hit: bool):
+        with self._lock:
+            if hit:
+                self.hits += 1
+                # Disk hits refresh used_at, so trimming keeps what is still in use
+                if key not in self._pending:
+                    self._touched[key] = None
+            else:
+                self.misses += 1
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            if serialized is not None:
+                self._pending[key] = serialized
+            if len(self._pending) + len(self._touched) >= self.flush_every:
+                self._flush()
+
+    def _flush(self):
+        now = time.time()
+        self._conn.executemany('INSERT OR REPLACE INTO classifications VALUES (?, ?, ?)',
+                               [(key, value, now) for key, value in self._pending.items()])
+        self._conn.executemany('UPDATE classifications SET used_at = ? WHERE key = ?',
+                               [(now, key) for key in self._touched])
+        self._conn.commit()
+        self._pending.clear()
+        self._touched.clear()
+
+    def save(self):
+        """Write pending results to disk and drop the least recently used beyond max_entries"""
+        if self._conn is None:
+            return
+        with self._lock:
+            self._flush()
+            self._conn.execute('''
+                DELETE FROM classifications WHERE used_at < (
+                    SELECT used_at FROM classifications ORDER BY used_at DESC LIMIT 1 OFFSET ?
+                )
+            ''', (self.max_entries - 1,))
+            self._conn.commit()
+
+    def close(self):
+        """save(), then release the SQLite connection; results in memory stay usable"""
+        self.save()
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def clear(self):
+        """Forget every cached result, on disk too"""
+        with self._lock:
+            self._entries.clear()
+            self._pending.clear()
+            self._touched.clear()
+            if self._conn is not None:
+                self._conn.execute('DELETE FROM classifications')
+                self._conn.commit()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {'entries': len(self._entries), 'hits': self.hits, 'misses': self.misses}
@@ -4,10 +4,13 @@ Command-line interface for the Cybersecurity Job Scraper
 """
 
 import argparse
+import json
 import sys
 import os
 import socket
 from job_scraper import CyberSecurityJobScraper
+from unified_scraper import ScrapingConfig
+from dedup import ENGINES
 
 def find_available_port(start_port=5000, max_port=5100):
     """Find an available port starting from start_port"""
@@ -44,10 +47,37 @@ def main():
                        help='Filter for F1 student friendly jobs (excludes US citizenship/security clearance requirements)')
     parser.add_argument('--no-dedup', action='store_true',
                        help='Skip duplicate removal')
+    parser.add_argument('--dedup-engine', choices=ENGINES, default='blocking',
+                       help='Duplicate removal engine (cdist scores whole blocks at once on all cores, '
+                            'for large blocks on multi-core machines; '
+                            'cluster merges duplicates into one job listing all their URLs)')
+    parser.add_argument('--dedup-workers', type=int, metavar='N',
+                       help='Remove duplicates in N worker processes, sharded by company (-1: one per core); '
+                            'fuzzy matches are then only looked for within a company, for any N')
     parser.add_argument('--web', '-w', action='store_true',
                        help='Start web interface after scraping')
+    parser.add_argument('--stream', action='store_true',
+                       help='Print jobs as soon as each page is scraped')
+    parser.add_argument('--parse-workers', type=int, default=0, metavar='N',
+                       help='Parse pages in N worker processes (default: parse on the scraping threads)')
+    parser.add_argument('--incremental', action='store_true',
+                       help='Only fetch postings not returned by the same search on a previous run')
+    parser.add_argument('--persist-classifications', action='store_true',
+                       help='Reuse citizenship/relevance/feature classifications from previous runs')
+    parser.add_argument('--remember-seen', action='store_true',
+                       help='Mark postings returned by a previous run as seen before and skip refetching them')
+    parser.add_argument('--retag', metavar='JOBS_JSON',
+                       help='Re-classify and re-filter jobs saved by an earlier run instead of scraping')
+    cassette_group = parser.add_mutually_exclusive_group()
+    cassette_group.add_argument('--record', metavar='CASSETTE',
+                       help='Record every HTTP response to a cassette file for offline replay')
+    cassette_group.add_argument('--replay', metavar='CASSETTE',
+                       help='Serve HTTP responses from a recorded cassette instead of the network')
     
     args = parser.parse_args()
+    if args.dedup_workers is not None and args.dedup_engine == 'minhash':
+        parser.error('--dedup-workers cannot be used with --dedup-engine minhash, '
+                     'which compares jobs across companies')
     
     # Convert source names to proper case
     source_mapping = {
@@ -75,110 +105,138 @@ def main():
     print(f"Output format: {args.output}")
     print()
     
-    scraper = CyberSecurityJobScraper()
+    config = ScrapingConfig(incremental=args.incremental, parse_workers=args.parse_workers,
+                            persist_classifications=args.persist_classifications,
+                            remember_seen=args.remember_seen)
+    if args.record:
+        config.cassette_mode, config.cassette_path = 'record', args.record
+    elif args.replay:
+        config.cassette_mode, config.cassette_path = 'replay', args.replay
     
-    # Use the enhanced scraping method
-    all_jobs = scraper.scrape_all_sources(
-        location=args.location,
-        time_filter=args.time_filter,
-        experience_level=args.experience,
-        sources=sources,
-        exclude_citizenship_required=args.citizenship,
-        f1_student=getattr(args, 'f1_student', False)
-    )
+    scraper = CyberSecurityJobScraper(config)
     
-    # Remove duplicates unless explicitly disabled
-    if not args.no_dedup:
-        all_jobs = scraper.remove_duplicates(all_jobs)
+    try:
+        scrape_kwargs = dict(
+            location=args.location,
+            time_filter=args.time_filter,
+            experience_level=args.experience,
+            sources=sources,
+            exclude_citizenship_required=args.citizenship,
+            f1_student=getattr(args, 'f1_student', False)
+        )
     
-    print(f"🎯 Total jobs found: {len(all_jobs)}")
+        if args.retag:
+            # Saved jobs get the current keyword lists' tags and filters, without any requests
+            with open(args.retag, encoding='utf-8') as f:
+                saved_jobs = json.load(f)
+            all_jobs = scraper.retag(saved_jobs, exclude_citizenship_required=args.citizenship,
+                                     f1_student=args.f1_student)
+            print(f"Re-tagged {len(saved_jobs)} saved jobs")
+        elif args.stream:
+            # Deduplicated and classified page by page as results arrive
+            all_jobs = []
+            for job in scraper.iter_all_sources(**scrape_kwargs):
+                all_jobs.append(job)
+                print(f"   [{job['source']}] {job['title']} - {job['company']}")
+            print()
+        else:
+            # Use the enhanced scraping method
+            all_jobs = scraper.scrape_all_sources(**scrape_kwargs)
+    
+        # Remove duplicates unless explicitly disabled
+        if not args.no_dedup:
+            all_jobs = scraper.remove_duplicates(all_jobs, engine=args.dedup_engine, workers=args.dedup_workers)
+    
+        print(f"🎯 Total jobs found: {len(all_jobs)}")
     
-    if all_jobs:
-        # Show summary by source
-        source_counts = {}
-        for job in all_jobs:
-            source = job['source']
-            source_counts[source] = source_counts.get(source, 0) + 1
+        if all_jobs:
+            # Show summary by source
+            source_counts = {}
+            for job in all_jobs:
+                source = job['source']
+                source_counts[source] = source_counts.get(source, 0) + 1
         
-        print("\n📈 Jobs by source:")
-        for source, count in source_counts.items():
-            print(f"   {source}: {count} jobs")
+            print("\n📈 Jobs by source:")
+            for source, count in source_counts.items():
+                print(f"   {source}: {count} jobs")
         
-        # Show sponsored jobs count
-        sponsored_count = sum(1 for job in all_jobs if job.get('sponsored', False))
-        if sponsored_count > 0:
-            print(f"   💰 Sponsored jobs: {sponsored_count}")
+            # Show sponsored jobs count
+            sponsored_count = sum(1 for job in all_jobs if job.get('sponsored', False))
+            if sponsored_count > 0:
+                print(f"   💰 Sponsored jobs: {sponsored_count}")
         
-        # Show experience level breakdown
-        exp_counts = {}
-        for job in all_jobs:
-            exp_level = job.get('experience_level', 'unknown')
-            exp_counts[exp_level] = exp_counts.get(exp_level, 0) + 1
+            # Show experience level breakdown
+            exp_counts = {}
+            for job in all_jobs:
+                exp_level = job.get('experience_level', 'unknown')
+                exp_counts[exp_level] = exp_counts.get(exp_level, 0) + 1
         
-        if len(exp_counts) > 1:
-            print("\n🎯 Jobs by experience level:")
-            for exp_level, count in exp_counts.items():
-                if exp_level != 'unknown':
-                    print(f"   {exp_level.title()}: {count} jobs")
+            if len(exp_counts) > 1:
+                print("\n🎯 Jobs by experience level:")
+                for exp_level, count in exp_counts.items():
+                    if exp_level != 'unknown':
+                        print(f"   {exp_level.title()}: {count} jobs")
         
-        # Save files
-        print("\n💾 Saving files...")
-        files_saved = []
+            # Save files
+            print("\n💾 Saving files...")
+            files_saved = []
         
-        if args.output in ['csv', 'all']:
-            csv_file = scraper.save_to_csv(all_jobs)
-            files_saved.append(csv_file)
-            print(f"   📄 CSV: {os.path.basename(csv_file)}")
+            if args.output in ['csv', 'all']:
+                csv_file = scraper.save_to_csv(all_jobs)
+                files_saved.append(csv_file)
+                print(f"   📄 CSV: {os.path.basename(csv_file)}")
         
-        if args.output in ['json', 'all']:
-            json_file = scraper.save_to_json(all_jobs)
-            files_saved.append(json_file)
-            print(f"   📄 JSON: {os.path.basename(json_file)}")
+            if args.output in ['json', 'all']:
+                json_file = scraper.save_to_json(all_jobs)
+                files_saved.append(json_file)
+                print(f"   📄 JSON: {os.path.basename(json_file)}")
         
-        if args.output in ['pdf', 'all']:
-            pdf_file = scraper.generate_pdf_report(all_jobs)
-            files_saved.append(pdf_file)
-            print(f"   📄 PDF: {os.path.basename(pdf_file)}")
+            if args.output in ['pdf', 'all']:
+                pdf_file = scraper.generate_pdf_report(all_jobs)
+                files_saved.append(pdf_file)
+                print(f"   📄 PDF: {os.path.basename(pdf_file)}")
         
-        if args.output in ['all']:
-            viz_file = scraper.create_visualization(all_jobs)
-            files_saved.append(viz_file)
-            print(f"   📊 Visualization: {os.path.basename(viz_file)}")
+            if args.output in ['all']:
+                viz_file = scraper.create_visualization(all_jobs)
+                files_saved.append(viz_file)
+                print(f"   📊 Visualization: {os.path.basename(viz_file)}")
         
-        # Show sample jobs
-        print("\n🔍 Sample jobs:")
-        for i, job in enumerate(all_jobs[:5]):
-            print(f"   {i+1}. {job['title']}")
-            print(f"      Company: {job['company']}")
-            print(f"      Location: {job['location']}")
-            print(f"      Source: {job['source']}")
-            print()
+            # Show sample jobs
+            print("\n🔍 Sample jobs:")
+            for i, job in enumerate(all_jobs[:5]):
+                print(f"   {i+1}. {job['title']}")
+                print(f"      Company: {job['company']}")
+                print(f"      Location: {job['location']}")
+                print(f"      Source: {job['source']}")
+                print()
         
-        if len(all_jobs) > 5:
-            print(f"   ... and {len(all_jobs) - 5} more")
+            if len(all_jobs) > 5:
+                print(f"   ... and {len(all_jobs) - 5} more")
         
-        # Start web interface if requested
-        if args.web:
-            print("\n🌐 Starting web interface...")
+            # Start web interface if requested
+            if args.web:
+                print("\n🌐 Starting web interface...")
             
-            try:
-                port = find_available_port(start_port=5000, max_port=5100)
-                print(f"   Open your browser and go to: http://localhost:{port}")
-                print("   Press Ctrl+C to stop the web server")
+                try:
+                    port = find_available_port(start_port=5000, max_port=5100)
+                    print(f"   Open your browser and go to: http://localhost:{port}")
+                    print("   Press Ctrl+C to stop the web server")
                 
-                from web_app import app
-                app.run(debug=False, host='0.0.0.0', port=port)
-            except RuntimeError as e:
-                print(f"❌ Error: {e}")
-                print("   Please check if any processes are using ports 5000-5099")
-            except KeyboardInterrupt:
-                print("\n👋 Web server stopped")
-            except ImportError:
-                print("❌ Web interface not available. Run 'python3 web_app.py' separately.")
+                    from web_app import app
+                    app.run(debug=False, host='0.0.0.0', port=port)
+                except RuntimeError as e:
+                    print(f"❌ Error: {e}")
+                    print("   Please check if any processes are using ports 5000-5099")
+                except KeyboardInterrupt:
+                    print("\n👋 Web server stopped")
+                except ImportError:
+                    print("❌ Web interface not available. Run 'python3 web_app.py' separately.")
     
-    else:
-        print("❌ No cybersecurity jobs found. Try adjusting your search criteria.")
-        sys.exit(1)
+        else:
+            print("❌ No cybersecurity jobs found. Try adjusting your search criteria.")
+            sys.exit(1)
+    finally:
+        scraper.close()
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -0,0 +1,85 @@
+"""
+Persistent crawl watermarks for incremental scraping
+Remembers which postings each (source, query, location) search has already returned
+so repeat runs can stop paginating and skip detail fetches for known jobs
+"""
+
+import os
+import sqlite3
+import threading
+import time
+import logging
+from typing import Iterable, Set
+
+logger = logging.getLogger(__name__)
+
+
+class WatermarkStore:
+    """SQLite-backed set of seen job keys per search, trimmed to the newest max_keys entries"""
+
+    def __init__(self, path: str, max_keys: int = 2000):
+        self.path = path
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS watermarks (
+                source TEXT NOT NULL,
+                query TEXT NOT NULL,
+                location TEXT NOT NULL,
+                job_key TEXT NOT NULL,
+                seen_at REAL NOT NULL,
+                PRIMARY KEY (source, query, location, job_key)
+            )
+        ''')
+        self._conn.commit()
+
+    def known(self, source: str, query: str, location: str, job_keys: Iterable[str]) -> Set[str]:
+        """Subset of job_keys this search has returned before"""
+        job_keys = list(set(job_keys))
+        if not job_keys:
+            return set()
+        found = set()
+        with self._lock:
+            # Stay well under SQLite's bound-parameter limit
+            for start in range(0, len(job_keys), 500):
+                chunk = job_keys[start:start + 500]
+                placeholders = ','.join('?' * len(chunk))
+                rows = self._conn.execute(
+                    f'SELECT job_key FROM watermarks WHERE source = ? AND query = ? AND location = ? '
+                    f'AND job_key IN ({placeholders})',
+                    (source, query, location, *chunk)
+                ).fetchall()
+                found.update(row[0] for row in rows)
+        return found
+
+    def update(self, source: str, query: str, location: str, job_keys: Iterable[str]):
+        """Record job_keys as seen now and drop the oldest keys beyond max_keys"""
+        now = time.time()
+        rows = [(source, query, location, key, now) for key in set(job_keys) if key]
+        if not rows:
+            return
+        with self._lock:
+            self._conn.executemany('INSERT OR REPLACE INTO watermarks VALUES (?, ?, ?, ?, ?)', rows)
+            self._conn.execute('''
+                DELETE FROM watermarks
+                WHERE source = ? AND query = ? AND location = ? AND job_key NOT IN (
+                    SELECT job_key FROM watermarks
+                    WHERE source = ? AND query = ? AND location = ?
+                    ORDER BY seen_at DESC LIMIT ?
+                )
+            ''', (source, query, location, source, query, location, self.max_keys))
+            self._conn.commit()
+
+    def reset(self, source: str = None):
+        """Forget every watermark, or only those of one source"""
+        with self._lock:
+            if source:
+                self._conn.execute('DELETE FROM watermarks WHERE source = ?', (source,))
+            else:
+                self._conn.execute('DELETE FROM watermarks')
+            self._conn.commit()
@@ -0,0 +1,489 @@
+"""
+Duplicate detection for scraped job listings
+OnlineDeduplicator answers "have we already kept this job?" one job at a time,
+so results can be deduplicated while they are still streaming in. Exact keys
+and canonical URLs are hash lookups; fuzzy comparison only runs against kept
+jobs that share a blocking key (company, title tokens, leading words), not against every job.
+batch_deduplicate gets the same result from chunked rapidfuzz cdist matrices;
+minhash_deduplicate finds near duplicates across blocks by Jaccard similarity;
+cluster_deduplicate merges every cluster of duplicates into one record, and
+sharded_deduplicate spreads blocking, cdist or cluster over worker processes
+"""
+
+import multiprocessing
+import os
+import threading
+import logging
+import zlib
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from itertools import repeat
+from typing import Callable, Dict, Hashable, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+import numpy as np
+from rapidfuzz import fuzz, process
+
+from canonicalization import canonicalize_company
+from near_duplicates import MinHashIndex
+
+logger = logging.getLogger(__name__)
+
+
+class Signature(NamedTuple):
+    """What deduplication needs to know about a job"""
+    key: Hashable  # Jobs with equal keys are duplicates
+    text: Optional[str]  # Text for fuzzy comparison, or None to skip fuzzy matching
+    url: str = ''  # Jobs with the same (canonical) URL are duplicates; '' when unknown
+    blocks: Tuple[Hashable, ...] = ()  # Fuzzy candidates share a block; () compares against every kept job
+
+
+# Block of every job whose signature names no blocks
+_ALL = ('all',)
+# remove_duplicates(engine=...): jobs in order, whole blocks at once, MinHash/LSH,
+# or merged clusters of every job matching another
+ENGINES = ('blocking', 'cdist', 'minhash', 'cluster')
+# batch_deduplicate scores fewer pairs than _MATRIX_CELLS without a cdist call,
+# which costs more than that, and matrices below _PARALLEL_CELLS on the calling
+# thread, since starting cdist's worker threads costs more than scoring them
+_MATRIX_CELLS = 16 * 16
+_PARALLEL_CELLS = 64 * 64
+# sharded_deduplicate always cuts jobs into this many shards, whatever the number of
+# workers, so its result does not depend on it; several per worker even out their load
+SHARDS = 64
+
+
+def company_block(company: str) -> Tuple[str, str]:
+    """Blocking key of a company name: its canonical form, so "Acme Inc." and "Acme, LLC" share a block"""
+    return 'company', canonicalize_company(company)
+
+
+def leading_words_block(canonical_title: str, canonical_company: str) -> Tuple[str, str, str]:
+    """Blocking key of the first words of a job's title and company.
+
+    token_set_ratio scores 100 when one text's words are a subset of the
+    other's, as with "software engineer meta" and "software engineer backend
+    meta platforms", which share neither the company nor the title tokens.
+    Such variants mostly keep the leading words, so this block still pairs
+    them, without putting a company's every posting in one block.
+    """
+    title_words, company_words = canonical_title.split(), canonical_company.split()
+    return 'leading', title_words[0] if title_words else '', company_words[0] if company_words else ''
+
+
+def title_block(title: str) -> Tuple[str, str]:
+    """Blocking key of a title: its distinct tokens, so reordered titles share a block"""
+    return 'title', ' '.join(sorted(set(title.split())))
+
+
+class OnlineDeduplicator:
+    """Incremental equivalent of the scrapers' remove_duplicates.
+
+    signature(job) returns a Signature. A job is a duplicate when its key or
+    URL was kept before, or when its fuzzy text scores at least threshold
+    against the fuzzy text of a kept job in one of its blocks. Feeding jobs
+    through add() in order keeps exactly the jobs remove_duplicates keeps.
+
+    Blocking is what makes this roughly linear instead of quadratic: a
+    fuzzy match between jobs that share no block (a different company key,
+    different title tokens *and* different leading words) is not looked for.
+    """
+
+    def __init__(self, signature: Callable[[Dict], Signature],
+                 scorer: Callable = fuzz.token_set_ratio, threshold: float = 92):
+        self.signature = signature
+        self.scorer = scorer
+        self.threshold = threshold
+        self._keys = set()
+        self._urls = set()
+        self._blocks: Dict[Hashable, List[str]] = defaultdict(list)
+        self._lock = threading.Lock()
+        self.kept = 0
+        self.dropped = 0
+
+    def add(self, job: Dict) -> bool:
+        """Remember job and return True if it is new, False if it duplicates a kept job"""
+        key, text, url, blocks = self.signature(job)
+        blocks = blocks or _ALL
+        with self._lock:
+            duplicate = key in self._keys or (url and url in self._urls)
+            if not duplicate and text:
+                duplicate = self._fuzzy_match(text, blocks)
+            if duplicate:
+                self.dropped += 1
+                return False
+            self._keys.add(key)
+            if url:
+                self._urls.add(url)
+            if text:
+                for block in blocks:
+                    self._blocks[block].append(text)
+            self.kept += 1
+            return True
+
+    def _fuzzy_match(self, text: str, blocks: Iterable[Hashable]) -> bool:
+        for block in blocks:
+            candidates = self._blocks.get(block)
+            if not candidates:
+                continue
+            # processor=None: rapidfuzz 2.x extractOne would otherwise run default_process on both texts
+            match = process.extractOne(text, candidates, scorer=self.scorer, processor=None,
+                                       score_cutoff=self.threshold)
+            if match is not None:
+                logger.debug(f"Fuzzy duplicate found: '{text}' vs '{match[0]}' (similarity: {match[1]}%)")
+                return True
+        return False
+
+    def block_sizes(self) -> Dict[Hashable, int]:
+        """Kept fuzzy texts per block; a few huge blocks mean the blocking keys are too coarse"""
+        with self._lock:
+            return {block: len(texts) for block, texts in self._blocks.items()}
+
+
+def _score_matrix(queries: List[str], choices: List[str], scorer: Callable, threshold: float,
+                  workers: int) -> np.ndarray:
+    """cdist scores (0 below threshold), on cdist's worker threads only when the matrix is big enough"""
+    cells = len(queries) * len(choices)
+    return process.cdist(queries, choices, scorer=scorer, score_cutoff=threshold, dtype=np.float32,
+                         workers=workers if cells >= _PARALLEL_CELLS else 1)
+
+
+def _matching_rows(queries: List[str], choices: List[str], scorer: Callable, threshold: float,
+                   chunk_size: int, workers: int) -> Set[int]:
+    """Indices of queries scoring at least threshold against any choice"""
+    if len(queries) * len(choices) < _MATRIX_CELLS:
+        return {row for row, query in enumerate(queries)
+                if process.extractOne(query, choices, scorer=scorer, processor=None,
+                                      score_cutoff=threshold) is not None}
+    found = set()
+    remaining = list(range(len(queries)))
+    for start in range(0, len(choices), chunk_size):
+        scores = _score_matrix([queries[row] for row in remaining], choices[start:start + chunk_size],
+                               scorer, threshold, workers)
+        matched = (scores >= threshold).any(axis=1)
+        # Rows that matched already need no more columns
+        found.update(row for row, hit in zip(remaining, matched.tolist()) if hit)
+        remaining = [row for row, hit in zip(remaining, matched.tolist()) if not hit]
+        if not remaining:
+            break
+    return found
+
+
+def _similar_pairs(texts: List[str], scorer: Callable, threshold: float, workers: int) -> Iterator[Tuple[int, int]]:
+    """(i, j) with j < i for every pair of texts scoring at least threshold"""
+    if len(texts) * len(texts) < _MATRIX_CELLS:
+        for later in range(1, len(texts)):
+            for earlier in range(later):
+                if scorer(texts[later], texts[earlier], score_cutoff=threshold) >= threshold:
+                    yield later, earlier
+        return
+    later, earlier = np.nonzero(np.tril(_score_matrix(texts, texts, scorer, threshold, workers) >= threshold, k=-1))
+    yield from zip(later.tolist(), earlier.tolist())
+
+
+def batch_deduplicate(jobs: Iterable[Dict], signature: Callable[[Dict], Signature],
+                      scorer: Callable = fuzz.token_set_ratio, threshold: float = 92,
+                      chunk_size: int = 256, workers: int = -1) -> List[Dict]:
+    """deduplicate() with fuzzy scores computed as rapidfuzz.process.cdist matrices.
+
+    Jobs are taken chunk_size at a time. Within each block, the chunk's jobs
+    are scored against the jobs the block kept so far and against each other
+    in native code (on all cores with workers=-1), instead of one extractOne
+    call per job; then the chunk is resolved in job order exactly like
+    OnlineDeduplicator.add, so the result is deduplicate()'s. Matrices are at
+    most chunk_size x chunk_size.
+    """
+    jobs = list(jobs)
+    signatures = [signature(job) for job in jobs]
+    keys, urls = set(), set()
+    kept_texts: Dict[Hashable, List[str]] = defaultdict(list)
+    kept = [False] * len(jobs)
+    for chunk_start in range(0, len(jobs), chunk_size):
+        chunk = range(chunk_start, min(chunk_start + chunk_size, len(jobs)))
+        # Jobs matching a key or URL kept by an earlier chunk are duplicates whatever they score
+        members: Dict[Hashable, List[int]] = defaultdict(list)
+        for index in chunk:
+            key, text, url, blocks = signatures[index]
+            if text and key not in keys and not (url and url in urls):
+                for block in blocks or _ALL:
+                    members[block].append(index)
+
+        matches_kept = set()
+        matches: Dict[int, List[int]] = defaultdict(list)  # Job -> earlier jobs of this chunk it matches
+        for block, indices in members.items():
+            texts = [signatures[index].text for index in indices]
+            if kept_texts.get(block):
+                rows = _matching_rows(texts, kept_texts[block], scorer, threshold, chunk_size, workers)
+                matches_kept.update(indices[row] for row in rows)
+            for later, earlier in _similar_pairs(texts, scorer, threshold, workers):
+                matches[indices[later]].append(indices[earlier])
+
+        for index in chunk:
+            key, text, url, blocks = signatures[index]
+            if (key in keys or (url and url in urls) or index in matches_kept
+                    or any(kept[earlier] for earlier in matches.get(index, ()))):
+                continue
+            kept[index] = True
+            keys.add(key)
+            if url:
+                urls.add(url)
+            if text:
+                for block in blocks or _ALL:
+                    kept_texts[block].append(text)
+    return [job for job, keep in zip(jobs, kept) if keep]
+
+
+def minhash_deduplicate(jobs: Iterable[Dict], signature: Callable[[Dict], Signature],
+                        jaccard_threshold: float = 0.6, num_perm: int = 128) -> List[Dict]:
+    """Jobs that are not duplicates of an earlier job, with near duplicates found by MinHash/LSH.
+
+    Exact keys and URLs work as in deduplicate(); instead of fuzzy scores within
+    blocks, a job is a near duplicate when the shingles of its fuzzy text and
+    description have an estimated Jaccard similarity of at least
+    jaccard_threshold with a kept job's, whatever block either is in. This
+    catches reposts under a reworded title or an agency's company name.
+    """
+    index = MinHashIndex(threshold=jaccard_threshold, num_perm=num_perm)
+    keys, urls = set(), set()
+    unique_jobs = []
+    for job in jobs:
+        key, text, url, _ = signature(job)
+        if key in keys or (url and url in urls):
+            continue
+        minhash = index.signature(text, job.get('description') or '') if text else None
+        if minhash is not None:
+            match = index.candidates(minhash)
+            if match:
+                logger.debug(f"Near duplicate found: '{text}' vs '{unique_jobs[match[0]].get('title', '')}'")
+                continue
+            index.add(len(unique_jobs), minhash)
+        keys.add(key)
+        if url:
+            urls.add(url)
+        unique_jobs.append(job)
+    return unique_jobs
+
+
+class UnionFind:
+    """Disjoint sets of the integers 0..size-1, with path halving and union by size"""
+
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+        self.size = [1] * size
+
+    def find(self, item: int) -> int:
+        parent = self.parent
+        while parent[item] != item:
+            parent[item] = parent[parent[item]]
+            item = parent[item]
+        return item
+
+    def union(self, first: int, second: int) -> bool:
+        """Join the sets of first and second; False if they already were one"""
+        first, second = self.find(first), self.find(second)
+        if first == second:
+            return False
+        if self.size[first] < self.size[second]:
+            first, second = second, first
+        self.parent[second] = first
+        self.size[first] += self.size[second]
+        return True
+
+    def groups(self) -> List[List[int]]:
+        """Every set as a sorted list, ordered by smallest member"""
+        groups: Dict[int, List[int]] = {}
+        for item in range(len(self.parent)):
+            groups.setdefault(self.find(item), []).append(item)
+        return list(groups.values())
+
+
+def _block_pairs(texts: List[str], scorer: Callable, threshold: float, chunk_size: int,
+                 workers: int) -> Iterator[Tuple[int, int]]:
+    """_similar_pairs in chunk_size x chunk_size tiles, so memory stays bounded for any block size"""
+    if len(texts) <= chunk_size:
+        yield from _similar_pairs(texts, scorer, threshold, workers)
+        return
+    for row_start in range(0, len(texts), chunk_size):
+        rows = texts[row_start:row_start + chunk_size]
+        for column_start in range(0, row_start + len(rows), chunk_size):
+            matched = _score_matrix(rows, texts[column_start:column_start + chunk_size],
+                                    scorer, threshold, workers) >= threshold
+            if column_start == row_start:
+                matched = np.tril(matched, k=-1)
+            later, earlier = np.nonzero(matched)
+            yield from zip((later + row_start).tolist(), (earlier + column_start).tolist())
+
+
+def duplicate_clusters(jobs: List[Dict], signature: Callable[[Dict], Signature],
+                       scorer: Callable = fuzz.token_set_ratio, threshold: float = 92,
+                       chunk_size: int = 256, workers: int = -1) -> List[List[int]]:
+    """Indices of jobs grouped into clusters of duplicates, ordered by first job.
+
+    Two jobs are joined when OnlineDeduplicator would call either a duplicate
+    of the other (equal key or URL, or fuzzy score >= threshold within a
+    shared block), and clusters are the transitive closure of those matches,
+    so they do not depend on job order. Identical fuzzy texts are joined by a
+    dict lookup; only distinct texts of a block are scored, all pairs at once.
+    """
+    sets = UnionFind(len(jobs))
+    first_with: Dict[Tuple[str, Hashable], int] = {}
+    distinct_texts: Dict[Hashable, Dict[str, int]] = defaultdict(dict)
+    for index, job in enumerate(jobs):
+        key, text, url, blocks = signature(job)
+        sets.union(index, first_with.setdefault(('key', key), index))
+        if url:
+            sets.union(index, first_with.setdefault(('url', url), index))
+        if text:
+            for block in blocks or _ALL:
+                sets.union(index, distinct_texts[block].setdefault(text, index))
+
+    for block, owners in distinct_texts.items():
+        texts, indices = list(owners), list(owners.values())
+        for later, earlier in _block_pairs(texts, scorer, threshold, chunk_size, workers):
+            sets.union(indices[later], indices[earlier])
+    return sets.groups()
+
+
+def _posted_at(job: Dict) -> Optional[datetime]:
+    try:
+        posted = datetime.fromisoformat(str(job.get('posted_date') or ''))
+    except ValueError:
+        return None
+    # Naive and aware dates cannot be compared; dates without a zone are taken as they are
+    return posted.replace(tzinfo=None)
+
+
+def merge_duplicates(jobs: List[Dict]) -> Dict:
+    """One record for a cluster of duplicate jobs.
+
+    The job with the longest description is the base (the earliest on a tie);
+    the record adds every distinct URL and source of the cluster as 'urls'
+    and 'sources', the earliest posted_date, and 'duplicate_count'.
+    """
+    base = max(jobs, key=lambda job: len((job.get('description') or '').strip()))
+    merged = dict(base)
+    merged['urls'] = list(dict.fromkeys(job['url'] for job in jobs if job.get('url')))
+    merged['sources'] = list(dict.fromkeys(job['source'] for job in jobs if job.get('source')))
+    dated = [job for job in jobs if _posted_at(job)]
+    if dated:
+        merged['posted_date'] = min(dated, key=_posted_at)['posted_date']
+    merged['duplicate_count'] = len(jobs) - 1
+    return merged
+
+
+def cluster_deduplicate(jobs: Iterable[Dict], signature: Callable[[Dict], Signature],
+                        scorer: Callable = fuzz.token_set_ratio, threshold: float = 92,
+                        merge: Callable[[List[Dict]], Dict] = merge_duplicates) -> List[Dict]:
+    """One merged record (see merge_duplicates) per cluster of duplicate_clusters, in order of first job"""
+    jobs = list(jobs)
+    clusters = duplicate_clusters(jobs, signature, scorer=scorer, threshold=threshold)
+    merged = sum(1 for cluster in clusters if len(cluster) > 1)
+    logger.debug(f"{len(jobs)} jobs form {len(clusters)} clusters, {merged} of them merged")
+    return [merge([jobs[index] for index in cluster]) for cluster in clusters]
+
+
+def _shard(blocks: Tuple[Hashable, ...], shards: int) -> int:
+    # crc32 rather than hash(): str hashes change from one process to the next
+    return zlib.crc32(repr((blocks or _ALL)[0]).encode()) % shards
+
+
+def _deduplicate_shard(signatures: List[Signature], scorer: Callable, threshold: float, engine: str):
+    """Positions of the signatures a shard keeps, or its clusters of positions for 'cluster'"""
+    positions = list(range(len(signatures)))
+    if engine == 'cluster':
+        return duplicate_clusters(positions, signatures.__getitem__, scorer=scorer, threshold=threshold, workers=1)
+    if engine == 'cdist':
+        return batch_deduplicate(positions, signatures.__getitem__, scorer=scorer, threshold=threshold, workers=1)
+    deduplicator = OnlineDeduplicator(signatures.__getitem__, scorer=scorer, threshold=threshold)
+    return [position for position in positions if deduplicator.add(position)]
+
+
+def sharded_deduplicate(jobs: Iterable[Dict], signature: Callable[[Dict], Signature],
+                        scorer: Callable = fuzz.token_set_ratio, threshold: float = 92,
+                        engine: str = 'blocking', workers: int = -1, shards: int = SHARDS) -> List[Dict]:
+    """deduplicate() with the jobs hash-partitioned by their first block and the shards run in worker processes.
+
+    Signatures are computed here and only they are sent to the workers, so
+    signature may be a bound method of a scraper. Within a shard, fuzzy
+    matches are looked for in a job's first block only (the company), which
+    keeps shards independent; equal keys and URLs across shards are then
+    reconciled in job order ('cluster': joined). Shards are fixed by
+    crc32, so the result is the same on every run and for any number of
+    workers (-1: one per core; 0 or 1 runs the shards inline). The MinHash
+    engine compares jobs across blocks and cannot be sharded.
+    """
+    if engine not in ('blocking', 'cdist', 'cluster'):
+        raise ValueError(f"Dedup engine {engine!r} cannot be sharded; expected blocking, cdist or cluster")
+    jobs = list(jobs)
+    signatures = [signature(job) for job in jobs]
+    members: List[List[int]] = [[] for _ in range(shards)]
+    for index, job_signature in enumerate(signatures):
+        members[_shard(job_signature.blocks, shards)].append(index)
+    members = [indices for indices in members if indices]
+    shard_signatures = [[signatures[index]._replace(blocks=(signatures[index].blocks or _ALL)[:1])
+                         for index in indices] for indices in members]
+
+    workers = (os.cpu_count() or 1) if workers < 0 else workers
+    arguments = (shard_signatures, repeat(scorer), repeat(threshold), repeat(engine))
+    if workers > 1 and len(members) > 1:
+        # 'spawn' like ParseStage: the scrapers may already be running threads
+        with ProcessPoolExecutor(max_workers=min(workers, len(members)),
+                                 mp_context=multiprocessing.get_context('spawn')) as executor:
+            results = list(executor.map(_deduplicate_shard, *arguments))
+    else:
+        results = list(map(_deduplicate_shard, *arguments))
+    logger.debug(f"Deduplicated {len(jobs)} jobs in {len(members)} shards on {max(workers, 1)} workers")
+
+    if engine == 'cluster':
+        sets = UnionFind(len(jobs))
+        for indices, clusters in zip(members, results):
+            for cluster in clusters:
+                for position in cluster[1:]:
+                    sets.union(indices[cluster[0]], indices[position])
+        first_with: Dict[Tuple[str, Hashable], int] = {}
+        for index, (key, _, url, _) in enumerate(signatures):
+            sets.union(index, first_with.setdefault(('key', key), index))
+            if url:
+                sets.union(index, first_with.setdefault(('url', url), index))
+        return [merge_duplicates([jobs[index] for index in cluster]) for cluster in sets.groups()]
+
+    keys, urls = set(), set()
+    unique_jobs = []
+    for index in sorted(indices[position] for indices, kept in zip(members, results) for position in kept):
+        key, _, url, _ = signatures[index]
+        if key in keys or (url and url in urls):
+            continue
+        keys.add(key)
+        if url:
+            urls.add(url)
+        unique_jobs.append(jobs[index])
+    return unique_jobs
+
+
+def deduplicate(jobs: Iterable[Dict], signature: Callable[[Dict], Signature],
+                scorer: Callable = fuzz.token_set_ratio, threshold: float = 92,
+                engine: str = 'blocking', jaccard_threshold: float = 0.6,
+                workers: Optional[int] = None) -> List[Dict]:
+    """Jobs that are not duplicates of an earlier job, in order.
+
+    threshold is the fuzzy scorer's ('blocking', 'cdist', 'cluster'); jaccard_threshold
+    the MinHash engine's. 'cluster' returns merged records instead of the jobs
+    themselves (see cluster_deduplicate). Given workers, the jobs are sharded
+    by company and the shards run in that many processes (-1: one per core; 1
+    inline; see sharded_deduplicate). Fuzzy matches are then only looked for
+    within a company, so every number of workers keeps the same jobs, which
+    can differ from the unsharded result of workers=None.
+    """
+    if workers is not None:
+        return sharded_deduplicate(jobs, signature, scorer=scorer, threshold=threshold, engine=engine,
+                                   workers=workers)
+    if engine == 'cluster':
+        return cluster_deduplicate(jobs, signature, scorer=scorer, threshold=threshold)
+    if engine == 'cdist':
+        return batch_deduplicate(jobs, signature, scorer=scorer, threshold=threshold)
+    if engine == 'minhash':
+        return minhash_deduplicate(jobs, signature, jaccard_threshold=jaccard_threshold)
+    if engine != 'blocking':
+        raise ValueError(f"Unknown dedup engine {engine!r}; expected one of {', '.join(ENGINES)}")
+    deduplicator = OnlineDeduplicator(signature, scorer=scorer, threshold=threshold)
+    return [job for job in jobs if deduplicator.add(job)]
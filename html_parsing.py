@@ -0,0 +1,156 @@
+"""
+HTML parsing backend for the job scrapers
+Parses with lxml when it is installed and, for the job boards we know, only
+builds the subtrees the scrapers actually read (job cards, description blocks).
+The Node interface lets card parsers run unchanged on BeautifulSoup or on the
+C-backed selectolax (lexbor) engine when that is installed.
+"""
+
+import logging
+from typing import List, Optional, Union
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+logger = logging.getLogger(__name__)
+
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as _SelectolaxParser
+except ImportError:
+    try:
+        from selectolax.parser import HTMLParser as _SelectolaxParser
+    except ImportError:
+        _SelectolaxParser = None
+
+BACKENDS = ('selectolax', 'soup')
+DEFAULT_BACKEND = 'selectolax' if _SelectolaxParser is not None else 'soup'
+
+
+def _has_class(css_class: str):
+    """Attribute matcher for one CSS class token.
+
+    While parsing, SoupStrainer sees the raw class string ("base-card
+    job-search-card"), so class_='job-search-card' alone would miss
+    multi-class elements that find_all(class_=...) matches.
+    """
+    def match(value) -> bool:
+        if not value:
+            return False
+        tokens = value.split() if isinstance(value, str) else value
+        return css_class in tokens
+    return match
+
+
+# What each page type's scraper reads; everything outside these elements is skipped
+# while the tree is built. Page types missing here (Wellfound's fallback chain,
+# ATS career pages) are parsed in full.
+PAGE_STRAINERS = {
+    'indeed': SoupStrainer('div', class_=_has_class('job_seen_beacon')),
+    'indeed_detail': SoupStrainer('div', class_=_has_class('jobsearch-jobDescriptionText')),
+    'linkedin': SoupStrainer('div', class_=_has_class('job-search-card')),
+    'glassdoor': SoupStrainer('div', attrs={'data-test': 'jobListing'}),
+    'ziprecruiter': SoupStrainer('div', class_=_has_class('job_content')),
+    'dice': SoupStrainer('div', class_=_has_class('card')),
+}
+
+
+def make_soup(content: Union[str, bytes], page_type: Optional[str] = None,
+              parser: Optional[str] = None) -> BeautifulSoup:
+    """Parse a page with the fastest available parser, restricted to page_type's elements.
+
+    page_type is a key of PAGE_STRAINERS; None (or an unknown type) parses the
+    whole document. parser overrides the detected backend.
+    """
+    strainer = PAGE_STRAINERS.get(page_type) if page_type else None
+    return BeautifulSoup(content, parser or HTML_PARSER, parse_only=strainer)
+
+
+class Node:
+    """Backend-neutral element: the operations the card parsers need and nothing more"""
+
+    def select(self, css: str) -> List['Node']:
+        raise NotImplementedError
+
+    def select_one(self, css: str) -> Optional['Node']:
+        raise NotImplementedError
+
+    def text(self, strip: bool = True) -> str:
+        """Element text; strip=True strips and concatenates the text nodes like get_text(strip=True)"""
+        raise NotImplementedError
+
+    def attr(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        raise NotImplementedError
+
+
+class SoupNode(Node):
+    """Node over a BeautifulSoup Tag (soupsieve CSS selectors)"""
+
+    __slots__ = ('tag',)
+
+    def __init__(self, tag):
+        self.tag = tag
+
+    def select(self, css: str) -> List[Node]:
+        return [SoupNode(tag) for tag in self.tag.select(css)]
+
+    def select_one(self, css: str) -> Optional[Node]:
+        tag = self.tag.select_one(css)
+        return SoupNode(tag) if tag is not None else None
+
+    def text(self, strip: bool = True) -> str:
+        return self.tag.get_text(strip=strip)
+
+    def attr(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        value = self.tag.get(name, default)
+        # bs4 splits multi-valued attributes such as class into lists
+        return ' '.join(value) if isinstance(value, list) else value
+
+
+class SelectolaxNode(Node):
+    """Node over a selectolax node (lexbor CSS engine)"""
+
+    __slots__ = ('node',)
+
+    def __init__(self, node):
+        self.node = node
+
+    def select(self, css: str) -> List[Node]:
+        return [SelectolaxNode(node) for node in self.node.css(css) if node != self.node]
+
+    def select_one(self, css: str) -> Optional[Node]:
+        node = self.node.css_first(css)
+        # lexbor also matches the node itself; like soupsieve, only descendants count
+        if node is not None and node == self.node:
+            matches = self.node.css(css)
+            node = matches[1] if len(matches) > 1 else None
+        return SelectolaxNode(node) if node is not None else None
+
+    def text(self, strip: bool = True) -> str:
+        return self.node.text(deep=True, separator='', strip=strip)
+
+    def attr(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        value = self.node.attributes.get(name, default)
+        return default if value is None else value
+
+
+def parse_document(content: Union[str, bytes], page_type: Optional[str] = None,
+                   backend: Optional[str] = None) -> Node:
+    """Parse a page into a Node with the requested backend ('selectolax', 'soup' or None for the default).
+
+    The soup backend applies page_type's strainer; selectolax always builds the
+    full tree, which is still faster than a strained BeautifulSoup parse.
+    """
+    backend = backend or DEFAULT_BACKEND
+    if backend == 'selectolax':
+        if _SelectolaxParser is None:
+            raise ValueError("selectolax backend requested but selectolax is not installed")
+        tree = _SelectolaxParser(content)
+        return SelectolaxNode(tree.root if tree.root is not None else tree.body)
+    if backend == 'soup':
+        return SoupNode(make_soup(content, page_type))
+    raise ValueError(f"Unknown HTML backend: {backend}")
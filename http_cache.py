@@ -0,0 +1,176 @@
+"""
+Persistent HTTP response cache for job detail pages
+Bodies are stored in SQLite keyed by canonical URL, revalidated with ETag/Last-Modified
+and evicted least-recently-used once the cache grows past its size budget
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import logging
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+logger = logging.getLogger(__name__)
+
+# Headers that describe the transfer rather than the stored (already decoded) body
+_DROPPED_HEADERS = {'content-encoding', 'content-length', 'transfer-encoding', 'connection'}
+
+
+@dataclass
+class CachedResponse:
+    """A stored response body plus the validators needed to revalidate it"""
+    key: str
+    url: str
+    status_code: int
+    headers: Dict[str, str]
+    body: bytes
+    etag: Optional[str]
+    last_modified: Optional[str]
+    stored_at: float
+
+    def is_fresh(self, ttl: float) -> bool:
+        return time.time() - self.stored_at < ttl
+
+    def conditional_headers(self) -> Dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+    def to_response(self, request_url: str = None) -> requests.Response:
+        response = requests.Response()
+        response.status_code = self.status_code
+        response.reason = 'OK'
+        response.headers = CaseInsensitiveDict(self.headers)
+        response.url = request_url or self.url
+        response.encoding = get_encoding_from_headers(response.headers)
+        response._content = self.body
+        response._content_consumed = True
+        response.from_cache = True
+        return response
+
+
+class ResponseCache:
+    """SQLite-backed response store with a TTL and a size-bounded LRU eviction policy"""
+
+    def __init__(self, path: str, ttl: float = 24 * 3600, max_bytes: int = 256 * 1024 * 1024):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._counters = {'hits': 0, 'misses': 0, 'revalidated': 0, 'stores': 0, 'evictions': 0}
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                status INTEGER NOT NULL,
+                headers TEXT NOT NULL,
+                body BLOB NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                stored_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                size INTEGER NOT NULL
+            )
+        ''')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses (accessed_at)')
+        self._conn.commit()
+        self._total_bytes = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        """Look up a stored response and mark it as recently used"""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT url, status, headers, body, etag, last_modified, stored_at FROM responses WHERE key = ?',
+                (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute('UPDATE responses SET accessed_at = ? WHERE key = ?', (time.time(), key))
+            self._conn.commit()
+        url, status, headers, body, etag, last_modified, stored_at = row
+        return CachedResponse(key, url, status, json.loads(headers), body, etag, last_modified, stored_at)
+
+    def store(self, key: str, response: requests.Response):
+        """Store a successful response unless the server forbids caching it"""
+        if 'no-store' in response.headers.get('Cache-Control', '').lower():
+            return
+        headers = {k: v for k, v in response.headers.items() if k.lower() not in _DROPPED_HEADERS}
+        body = response.content or b''
+        now = time.time()
+        with self._lock:
+            previous = self._conn.execute('SELECT size FROM responses WHERE key = ?', (key,)).fetchone()
+            self._conn.execute(
+                'INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (key, response.url, response.status_code, json.dumps(headers), body,
+                 response.headers.get('ETag'), response.headers.get('Last-Modified'), now, now, len(body))
+            )
+            self._total_bytes += len(body) - (previous[0] if previous else 0)
+            self._counters['stores'] += 1
+            self._evict()
+            self._conn.commit()
+
+    def refresh(self, key: str, response: requests.Response):
+        """Restart the TTL of an entry the server confirmed with 304 Not Modified"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                'UPDATE responses SET stored_at = ?, accessed_at = ?, '
+                'etag = COALESCE(?, etag), last_modified = COALESCE(?, last_modified) WHERE key = ?',
+                (now, now, response.headers.get('ETag'), response.headers.get('Last-Modified'), key)
+            )
+            self._conn.commit()
+
+    def _evict(self):
+        """Drop least-recently-used entries until the cache fits in max_bytes (lock held)"""
+        while self._total_bytes > self.max_bytes:
+            rows = self._conn.execute(
+                'SELECT key, size FROM responses ORDER BY accessed_at LIMIT 50'
+            ).fetchall()
+            if not rows:
+                self._total_bytes = 0
+                break
+            for key, size in rows:
+                self._conn.execute('DELETE FROM responses WHERE key = ?', (key,))
+                self._total_bytes -= size
+                self._counters['evictions'] += 1
+                if self._total_bytes <= self.max_bytes:
+                    break
+
+    def record(self, counter: str):
+        with self._lock:
+            self._counters[counter] += 1
+
+    def stats(self) -> Dict[str, float]:
+        """Hit/miss counters for this process plus the current on-disk footprint"""
+        with self._lock:
+            stats = dict(self._counters)
+            stats['entries'] = self._conn.execute('SELECT COUNT(*) FROM responses').fetchone()[0]
+            stats['bytes'] = self._total_bytes
+        lookups = stats['hits'] + stats['revalidated'] + stats['misses']
+        stats['hit_rate'] = round((stats['hits'] + stats['revalidated']) / lookups, 3) if lookups else 0.0
+        return stats
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute('DELETE FROM responses')
+            self._conn.commit()
+            self._total_bytes = 0
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
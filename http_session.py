@@ -0,0 +1,156 @@
+"""
+HTTP session layer shared by every job scraper
+All scraper traffic goes through ScraperSession so politeness, retries, timeouts,
+caching and record/replay are enforced in one place
+"""
+
+import os
+import random
+import requests
+import logging
+from requests.adapters import HTTPAdapter
+from requests.models import PreparedRequest
+from urllib3.util.retry import Retry
+
+from rate_limiter import HostRateLimiter
+from http_cache import ResponseCache
+from cassette import Cassette, RecordingAdapter, ReplayAdapter
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class JitteredRetry(Retry):
+    """urllib3 Retry with randomized exponential backoff and a ceiling on Retry-After"""
+
+    def __init__(self, *args, max_retry_after: float = 60, **kwargs):
+        self.max_retry_after = max_retry_after
+        super().__init__(*args, **kwargs)
+
+    def new(self, **kwargs):
+        kwargs.setdefault('max_retry_after', self.max_retry_after)
+        return super().new(**kwargs)
+
+    def get_backoff_time(self) -> float:
+        backoff = super().get_backoff_time()
+        # Spread retries out so parallel workers don't hit the host again in lockstep
+        return backoff + random.uniform(0, backoff) if backoff > 0 else 0
+
+    def get_retry_after(self, response):
+        retry_after = super().get_retry_after(response)
+        if retry_after is None:
+            return None
+        return min(retry_after, self.max_retry_after)
+
+
+def build_adapter(config) -> HTTPAdapter:
+    """HTTPAdapter with retry/backoff on 429/5xx and connection pools sized to the scraper's concurrency"""
+    retry = JitteredRetry(
+        total=config.max_retries,
+        connect=config.max_retries,
+        read=config.max_retries,
+        status=config.max_retries,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset({'GET', 'HEAD'}),
+        backoff_factor=config.backoff_factor,
+        respect_retry_after_header=True,
+        raise_on_status=False,
+        max_retry_after=config.max_retry_after,
+    )
+    return HTTPAdapter(
+        max_retries=retry,
+        pool_connections=config.pool_connections,
+        pool_maxsize=max(config.detail_workers, config.per_host_limit, config.source_workers),
+    )
+
+
+class ScraperSession(requests.Session):
+    """requests.Session that waits for the target host's rate limit before every request.
+
+    config is a ScrapingConfig; its host_rates and default_rate declare how fast
+    each job board may be hit. Every request gets config.timeout unless the caller
+    passes one, and failed or throttled GETs are retried with backoff.
+    GET requests made with cache=True are served from the on-disk response cache
+    when config.http_cache is enabled.
+
+    With config.cassette_mode set to 'record', every response is also written to
+    config.cassette_path; with 'replay', responses come from that file instead of
+    the network (the response cache and rate limits are bypassed in both modes so
+    the cassette sees, and serves, every request).
+    """
+
+    def __init__(self, config):
+        super().__init__()
+        self.config = config
+        adapter = build_adapter(config)
+        self.cassette = None
+        if config.cassette_mode:
+            cassette_path = config.cassette_path or os.path.join(config.state_dir, 'cassette.jsonl.gz')
+            self.cassette = Cassette(cassette_path, config.cassette_mode)
+            if config.cassette_mode == 'record':
+                adapter = RecordingAdapter(adapter, self.cassette)
+            else:
+                adapter = ReplayAdapter(self.cassette)
+        self.mount('https://', adapter)
+        self.mount('http://', adapter)
+        self.rate_limiter = HostRateLimiter(config.host_rates, config.default_rate)
+        self.throttle = config.cassette_mode != 'replay'
+        self.cache = None
+        if config.http_cache and not config.cassette_mode:
+            self.cache = ResponseCache(
+                os.path.join(config.state_dir, 'http_cache.sqlite'),
+                ttl=config.cache_ttl,
+                max_bytes=config.cache_max_bytes
+            )
+        # Scrapers replace this with their canonicalize_url so tracking params don't split entries
+        self.cache_key = lambda url: url
+
+    def request(self, method, url, *args, cache: bool = False, **kwargs):
+        if not args:
+            kwargs.setdefault('timeout', self.config.timeout)
+        if cache and self.cache is not None and method.upper() == 'GET' and not args:
+            return self._cached_get(url, **kwargs)
+        if self.throttle:
+            self.rate_limiter.acquire(url)
+        return super().request(method, url, *args, **kwargs)
+
+    def _cached_get(self, url, params=None, headers=None, **kwargs):
+        """GET through the response cache, revalidating stale entries with conditional requests"""
+        prepared = PreparedRequest()
+        prepared.prepare_url(url, params)
+        full_url = prepared.url
+        key = self.cache_key(full_url) or full_url
+
+        entry = self.cache.get(key)
+        if entry is not None and entry.is_fresh(self.cache.ttl):
+            self.cache.record('hits')
+            return entry.to_response(full_url)
+
+        request_headers = dict(headers or {})
+        if entry is not None:
+            request_headers.update(entry.conditional_headers())
+
+        self.rate_limiter.acquire(full_url)
+        response = super().request('GET', full_url, headers=request_headers, **kwargs)
+
+        if entry is not None and response.status_code == 304:
+            self.cache.record('revalidated')
+            self.cache.refresh(key, response)
+            return entry.to_response(full_url)
+
+        self.cache.record('misses')
+        if response.status_code == 200:
+            self.cache.store(key, response)
+        return response
+
+    def cache_stats(self):
+        """Response cache counters, or None when caching is disabled"""
+        return self.cache.stats() if self.cache is not None else None
+
+    def close(self):
+        super().close()
+        if self.cassette is not None:
+            self.cassette.close()
+        if self.cache is not None:
+            self.cache.close()
@@ -0,0 +1,183 @@
+"""
+Columnar job classification with pandas
+Loads jobs into a DataFrame, scans each distinct text once with the scrapers' own
+compiled matchers into a keyword-hit frame, and derives relevance, citizenship,
+clearance, remote and experience flags from it column-wise; tags and filters are
+boolean masks, so re-tagging a large history after a keyword change doesn't loop
+over dicts
+"""
+
+import logging
+from functools import partial
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from citizenship import CitizenshipClassifier
+from job_features import CITIZENSHIP_REQUIRED, DEFAULT_EXPERIENCE_LEVEL, FeatureExtractor
+from keyword_matching import KeywordMatcher
+
+logger = logging.getLogger(__name__)
+
+TEXT_COLUMNS = ('title', 'company', 'location', 'description')
+
+# (boolean column, tag) in the order the row-at-a-time code appends them
+CITIZENSHIP_TAGS = (
+    ('requires_us_citizenship', 'US Citizenship Required'),
+    ('requires_security_clearance', 'Security Clearance Required'),
+    ('is_sponsorship_friendly', 'Sponsorship Friendly'),
+    ('is_f1_student_friendly', 'F1 Student Friendly'),
+)
+# Everything classify_citizenship adds
+CITIZENSHIP_COLUMNS = ('requires_us_citizenship', 'requires_security_clearance', 'is_sponsorship_friendly',
+                       'is_f1_student_friendly', 'citizenship_score', 'sponsorship_score', 'classification_tags')
+FEATURE_TAGS = (
+    ('remote_friendly', 'Remote Friendly'),
+    ('visa_sponsorship', 'Visa Sponsorship Available'),
+    ('security_clearance_required', 'Security Clearance Required'),
+    ('no_security_clearance_required', 'No Security Clearance Required'),
+    ('f1_student_friendly', 'F1 Student Friendly'),
+)
+
+
+def job_frame(jobs: Iterable[Dict]) -> pd.DataFrame:
+    """DataFrame of job dicts with the text columns present and free of NaN"""
+    frame = pd.DataFrame(list(jobs))
+    for column in TEXT_COLUMNS:
+        frame[column] = frame[column].fillna('').astype(str) if column in frame else ''
+    return frame
+
+
+def frame_to_jobs(frame: pd.DataFrame) -> List[Dict]:
+    """Back to job dicts, with missing values as None"""
+    return frame.astype(object).where(frame.notna(), None).to_dict('records')
+
+
+def updated_jobs(jobs: Sequence[Dict], frame: pd.DataFrame, columns: Sequence[str]) -> List[Dict]:
+    """Copies of the jobs job_frame(jobs) rows remain for, in frame order, updated with the given columns.
+
+    Unlike frame_to_jobs, a job keeps exactly its own keys besides those columns.
+    """
+    return [dict(jobs[index], **fields) for index, fields in zip(frame.index, frame_to_jobs(frame[list(columns)]))]
+
+
+def _lowered(frame: pd.DataFrame, columns: Sequence[str]) -> pd.Series:
+    text = frame[columns[0]]
+    for column in columns[1:]:
+        text = text + ' ' + frame[column]
+    return text.str.lower()
+
+
+def per_distinct(text: pd.Series, compute: Callable[[pd.Series], np.ndarray]) -> np.ndarray:
+    """compute() over the distinct values of text only, expanded back to one row per job.
+
+    Saved histories repeat descriptions across sources and runs, so each is scanned once.
+    """
+    codes, uniques = pd.factorize(text)
+    return compute(pd.Series(uniques, dtype=object))[codes]
+
+
+def keyword_hits(text: pd.Series, terms: Sequence[str], found: Callable[[str], Iterable[str]]) -> pd.DataFrame:
+    """Boolean (job, keyword) frame of which terms found() reports in each lowercased text.
+
+    found() is a classifier's own one-pass scan (an Aho-Corasick automaton when
+    pyahocorasick is installed), so the frame agrees with the row-by-row code;
+    every flag is then a column reduction over this frame.
+    """
+    columns = {term: column for column, term in enumerate(terms)}
+
+    def scan(unique: pd.Series) -> np.ndarray:
+        rows, hit_columns = [], []
+        for row, value in enumerate(unique.tolist()):
+            for term in found(value):
+                rows.append(row)
+                hit_columns.append(columns[term])
+        matrix = np.zeros((len(unique), len(columns)), dtype=bool)
+        matrix[rows, hit_columns] = True
+        return matrix
+
+    return pd.DataFrame(per_distinct(text, scan), index=text.index, columns=list(columns))
+
+
+def tag_lists(frame: pd.DataFrame, tags: Sequence[Tuple[str, str]]) -> List[List[str]]:
+    """Per row, the tags whose boolean column is set"""
+    codes = np.zeros(len(frame), dtype=np.int64)
+    for bit, (column, _) in enumerate(tags):
+        codes |= frame[column].to_numpy(dtype=bool).astype(np.int64) << bit
+    # At most 2**len(tags) distinct combinations, each spelled out once
+    combinations = {code: [tag for bit, (_, tag) in enumerate(tags) if code >> bit & 1] for code in np.unique(codes)}
+    return [list(combinations[code]) for code in codes]
+
+
+def relevance_mask(frame: pd.DataFrame, matcher: KeywordMatcher,
+                   columns: Sequence[str] = ('title', 'description')) -> pd.Series:
+    """The scrapers' relevance check (is_cybersecurity_job, ...) as a boolean column"""
+    text = _lowered(frame, columns)
+    if matcher.has_automaton:
+        relevant = per_distinct(text, lambda unique: unique.map(partial(matcher.matches, lowered=True)).to_numpy(bool))
+    else:
+        relevant = per_distinct(text, lambda unique: unique.str.contains(matcher.pattern).to_numpy(bool))
+    return pd.Series(relevant, index=frame.index)
+
+
+def classify_citizenship(frame: pd.DataFrame, classifier: Optional[CitizenshipClassifier] = None) -> pd.DataFrame:
+    """Columns and classification_tags filter_citizenship_clearance adds, for every row at once"""
+    classifier = classifier or CitizenshipClassifier()
+    hits = keyword_hits(_lowered(frame, ('title', 'description')), classifier.terms, classifier.found)
+    citizenship_score = hits[list(classifier.citizenship_keywords)].sum(axis=1)
+    sponsorship_score = hits[list(classifier.sponsorship_keywords)].sum(axis=1)
+    requires_citizenship = citizenship_score > 0
+    # Override logic: if explicit citizenship requirement, override sponsorship
+    is_sponsorship_friendly = (sponsorship_score > 0) & ~(requires_citizenship
+                                                          & hits[list(classifier.override_keywords)].any(axis=1))
+    frame = frame.assign(
+        requires_us_citizenship=requires_citizenship,
+        requires_security_clearance=hits[list(classifier.clearance_keywords)].any(axis=1),
+        is_sponsorship_friendly=is_sponsorship_friendly,
+        is_f1_student_friendly=is_sponsorship_friendly & ~requires_citizenship,
+        citizenship_score=citizenship_score,
+        sponsorship_score=sponsorship_score,
+    )
+    frame['classification_tags'] = tag_lists(frame, CITIZENSHIP_TAGS)
+    return frame
+
+
+def classify_features(frame: pd.DataFrame, extractor: Optional[FeatureExtractor] = None) -> pd.DataFrame:
+    """Flags, experience level and classification_tags BaseJobScraper.classify_job sets, for every row at once"""
+    extractor = extractor or FeatureExtractor()
+    matcher = extractor.matcher
+    hits = keyword_hits(_lowered(frame, ('title', 'description', 'location')), matcher.terms,
+                        partial(matcher.found, lowered=True))
+    found = {feature: hits[list(keywords)].any(axis=1) for feature, keywords in extractor.groups.items()}
+    frame = frame.assign(**{flag: found[flag] for flag in extractor.flags})
+
+    inferred = np.select([found[f"experience:{level}"].to_numpy() for level in extractor.experience_levels],
+                         list(extractor.experience_levels), DEFAULT_EXPERIENCE_LEVEL)
+    if 'experience_level' in frame:
+        known = frame['experience_level'].notna() & (frame['experience_level'] != '')
+        frame['experience_level'] = frame['experience_level'].where(known, pd.Series(inferred, index=frame.index))
+    else:
+        frame['experience_level'] = inferred
+
+    clearance = frame['security_clearance_required']
+    tag_columns = pd.DataFrame({
+        'no_security_clearance_required': ~clearance,
+        'f1_student_friendly': ~found[CITIZENSHIP_REQUIRED] & ~clearance,
+    }, index=frame.index)
+    frame['classification_tags'] = tag_lists(pd.concat([frame, tag_columns], axis=1), FEATURE_TAGS)
+    return frame
+
+
+def filter_frame(frame: pd.DataFrame, exclude_citizenship_required: bool = False, f1_student: bool = False,
+                 relevant: Optional[pd.Series] = None) -> pd.DataFrame:
+    """Rows kept by the scrapers' citizenship, F1 student and (given a relevance mask) relevance filters"""
+    mask = pd.Series(True, index=frame.index)
+    if exclude_citizenship_required:
+        mask &= ~frame['requires_us_citizenship']
+    if f1_student:
+        mask &= frame['is_f1_student_friendly']
+    if relevant is not None:
+        mask &= relevant
+    logger.info(f"Frame filters kept {int(mask.sum())} out of {len(frame)} jobs")
+    return frame[mask]
@@ -0,0 +1,342 @@
+"""
+Per-source page parsers shared by the job scrapers
+Each parser takes a raw response body and returns plain dicts, so it runs on
+either HTML backend and can be called from any thread or process
+"""
+
+import re
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+from bs4 import CData, NavigableString, Tag
+
+from html_parsing import Node, make_soup, parse_document
+
+logger = logging.getLogger(__name__)
+
+# Indeed changes its company markup often; tried in order until one has text.
+# All of these name the company, so a SelectorStrategy may reorder them
+INDEED_COMPANY_SELECTORS = [
+    'span[data-testid="company-name"]',
+    'span.companyName',
+    '.companyName',
+    '[data-testid="company-name"]',
+    'div[data-testid="company-name"]'
+]
+# Tried after INDEED_COMPANY_SELECTORS, never before: also matches the job title's span
+INDEED_COMPANY_FALLBACKS = [
+    'span[title]'
+]
+
+
+def relative_date(date_text: str) -> str:
+    """ISO timestamp for a relative date such as "2 days ago" (now when it can't be read)"""
+    try:
+        if 'day' in date_text:
+            days = int(re.search(r'(\d+)', date_text).group(1))
+            return (datetime.now() - timedelta(days=days)).isoformat()
+    except Exception:
+        pass
+    return datetime.now().isoformat()
+
+
+def _indeed_company(card: Node, company_selectors: Sequence[str]) -> Tuple[str, Optional[str]]:
+    """Company name and the selector that produced it (None for the span fallback)"""
+    company = "Unknown"
+    for selector in company_selectors:
+        company_elem = card.select_one(selector)
+        if company_elem:
+            company = company_elem.text()
+            if company and company != "Unknown":
+                return company, selector
+
+    # Fallback: look for any span with company-like content
+    if company == "Unknown":
+        for span in card.select('span'):
+            text = span.text()
+            if text and len(text) > 2 and len(text) < 50 and not any(char.isdigit() for char in text):
+                company = text
+                break
+    return company, None
+
+
+def parse_indeed_card(card: Node, default_location: str,
+                      company_selectors: Sequence[str] = INDEED_COMPANY_SELECTORS + INDEED_COMPANY_FALLBACKS
+                      ) -> Optional[Dict]:
+    """Fields of one Indeed result card, or None when it has no title.
+
+    company_selector reports which of company_selectors matched so callers can
+    feed a SelectorStrategy.
+    """
+    title_elem = card.select_one('h2.jobTitle')
+    if not title_elem:
+        return None
+
+    location_elem = card.select_one('div.companyLocation')
+    card_text = card.text(strip=False)
+    link_elem = title_elem.select_one('a')
+    href = link_elem.attr('href') if link_elem else None
+    date_elem = card.select_one('span.date')
+    company, company_selector = _indeed_company(card, company_selectors)
+
+    return {
+        'title': title_elem.text(),
+        'company': company,
+        'company_selector': company_selector,
+        'location': location_elem.text() if location_elem else default_location,
+        'url': "https://www.indeed.com" + href if href else "",
+        'posted_date': relative_date(date_elem.text()) if date_elem else datetime.now().isoformat(),
+        'sponsored': "Sponsored" in card_text or "sponsored" in card_text
+    }
+
+
+def parse_indeed_results(content: Union[str, bytes], default_location: str,
+                         backend: Optional[str] = None,
+                         company_selectors: Sequence[str] = INDEED_COMPANY_SELECTORS + INDEED_COMPANY_FALLBACKS
+                         ) -> List[Dict]:
+    """Every job card on an Indeed results page, in page order"""
+    document = parse_document(content, 'indeed', backend)
+    cards = []
+    for card in document.select('div.job_seen_beacon'):
+        try:
+            parsed = parse_indeed_card(card, default_location, company_selectors)
+            if parsed:
+                cards.append(parsed)
+        except Exception as e:
+            logger.warning(f"Error parsing job card: {e}")
+    return cards
+
+
+def parse_indeed_description(content: Union[str, bytes], backend: Optional[str] = None) -> str:
+    """Description text of an Indeed job page"""
+    document = parse_document(content, 'indeed_detail', backend)
+    desc_elem = document.select_one('div.jobsearch-jobDescriptionText')
+    return desc_elem.text() if desc_elem else ""
+
+
+def _first(card: Node, selectors: Sequence[str]) -> Optional[Node]:
+    """First element matched by any of selectors, trying them in order"""
+    for selector in selectors:
+        element = card.select_one(selector)
+        if element is not None:
+            return element
+    return None
+
+
+def _posted_date(card: Node, selectors: Sequence[str]) -> str:
+    """ISO posted date from the span.date inside a card's date element (now when there is none)"""
+    date_elem = _first(card, selectors)
+    date_span = date_elem.select_one('span.date') if date_elem else None
+    return relative_date(date_span.text()) if date_span else datetime.now().isoformat()
+
+
+def parse_glassdoor_results(content: Union[str, bytes], default_location: str,
+                            backend: Optional[str] = None) -> List[Dict]:
+    """Every Glassdoor job listing with a title, in page order"""
+    document = parse_document(content, 'glassdoor', backend)
+    cards = []
+    for card in document.select('div[data-test="jobListing"]'):
+        try:
+            title_elem = card.select_one('div[data-test="job-title"]')
+            title = title_elem.text() if title_elem else ""
+            if not title:
+                continue
+            company_elem = card.select_one('div[data-test="employer-name"]')
+            location_elem = card.select_one('div[data-test="job-location"]')
+            link_elem = card.select_one('a')
+            href = link_elem.attr('href') if link_elem else None
+            cards.append({
+                'title': title,
+                'company': company_elem.text() if company_elem else "",
+                'location': location_elem.text() if location_elem else default_location,
+                'url': f"https://www.glassdoor.com{href}" if href else "",
+            })
+        except Exception as e:
+            logger.warning(f"Error parsing Glassdoor job: {e}")
+    return cards
+
+
+# CSS selectors of job boards whose cards link to the posting from the title
+ZIPRECRUITER_SELECTORS = {
+    'card': 'div.job_content', 'title': 'a.job_link', 'company': 'a.company_link',
+    'location': 'div.job_location', 'description': 'div.job_snippet', 'date': 'div.job_posted',
+}
+DICE_SELECTORS = {
+    'card': 'div.card', 'title': 'a.card-title-link', 'company': 'a.card-company',
+    'location': 'span.jobLocation', 'description': 'div.card-description', 'date': 'span.posted',
+}
+
+
+def _parse_title_link_cards(document: Node, selectors: Dict[str, str], default_location: str,
+                            source: str, url_prefix: str = "") -> List[Dict]:
+    """Every card with a title link, in page order; selectors is ZIPRECRUITER_SELECTORS or the like"""
+    cards = []
+    for card in document.select(selectors['card']):
+        try:
+            title_elem = card.select_one(selectors['title'])
+            if not title_elem:
+                continue
+            company_elem = card.select_one(selectors['company'])
+            location_elem = card.select_one(selectors['location'])
+            desc_elem = card.select_one(selectors['description'])
+            cards.append({
+                'title': title_elem.text(),
+                'company': company_elem.text() if company_elem else "Unknown",
+                'location': location_elem.text() if location_elem else default_location,
+                'description': desc_elem.text() if desc_elem else "",
+                'url': url_prefix + title_elem.attr('href', ''),
+                'posted_date': _posted_date(card, [selectors['date']]),
+            })
+        except Exception as e:
+            logger.warning(f"Error parsing {source} job card: {e}")
+    return cards
+
+
+def parse_ziprecruiter_results(content: Union[str, bytes], default_location: str,
+                               backend: Optional[str] = None) -> List[Dict]:
+    """Every ZipRecruiter job card with a title link, in page order"""
+    return _parse_title_link_cards(parse_document(content, 'ziprecruiter', backend), ZIPRECRUITER_SELECTORS,
+                                   default_location, 'ZipRecruiter', url_prefix="https://www.ziprecruiter.com")
+
+
+def parse_dice_results(content: Union[str, bytes], default_location: str,
+                       backend: Optional[str] = None) -> List[Dict]:
+    """Every Dice job card with a title link, in page order"""
+    return _parse_title_link_cards(parse_document(content, 'dice', backend), DICE_SELECTORS,
+                                   default_location, 'Dice')
+
+
+# Wellfound's markup varies between pages; each field takes the first selector that matches
+WELLFOUND_CARD_SELECTORS = ['div.job-listing', 'div.job-card', 'article']
+WELLFOUND_TITLE_SELECTORS = ['h3', 'h2', 'a.job-title', 'span.job-title']
+WELLFOUND_COMPANY_SELECTORS = ['div.company', 'span.company-name', 'h4.company']
+WELLFOUND_LOCATION_SELECTORS = ['div.location', 'span.location', 'div.job-location']
+WELLFOUND_DESCRIPTION_SELECTORS = ['div.description', 'p.job-description', 'div.job-summary']
+WELLFOUND_DATE_SELECTORS = ['time', 'span.posted-date', 'div.posted']
+
+
+def parse_wellfound_results(content: Union[str, bytes], default_location: str,
+                            backend: Optional[str] = None) -> List[Dict]:
+    """Every Wellfound job card with a title, from the first card markup the page uses"""
+    document = parse_document(content, None, backend)
+    card_nodes = []
+    for selector in WELLFOUND_CARD_SELECTORS:
+        card_nodes = document.select(selector)
+        if card_nodes:
+            break
+    cards = []
+    for card in card_nodes:
+        try:
+            title_elem = _first(card, WELLFOUND_TITLE_SELECTORS)
+            if not title_elem:
+                continue
+            link_elem = card.select_one('a[href]')
+            job_url = link_elem.attr('href', '') if link_elem else ''
+            if job_url and not job_url.startswith('http'):
+                job_url = f"https://wellfound.com{job_url}"
+            company_elem = _first(card, WELLFOUND_COMPANY_SELECTORS)
+            location_elem = _first(card, WELLFOUND_LOCATION_SELECTORS)
+            desc_elem = _first(card, WELLFOUND_DESCRIPTION_SELECTORS)
+            cards.append({
+                'title': title_elem.text(),
+                'company': company_elem.text() if company_elem else "Unknown",
+                'location': location_elem.text() if location_elem else default_location,
+                'description': desc_elem.text() if desc_elem else "",
+                'url': job_url,
+                'posted_date': _posted_date(card, WELLFOUND_DATE_SELECTORS),
+            })
+        except Exception as e:
+            logger.warning(f"Error parsing Wellfound job card: {e}")
+    return cards
+
+
+# LinkedIn Easy Apply / sponsored detection. Phrases are matched against the card's
+# text exactly as get_text() joins it, so results match the old per-keyword checks.
+EASY_APPLY_PHRASES = (
+    "easy apply", "quick apply", "apply now", "one-click apply",
+    "instant apply", "apply instantly", "fast apply", "in easy apply"
+)
+EASY_APPLY_LABEL_PHRASES = ("easy apply", "quick apply", "apply now", "in easy apply")
+EASY_APPLY_MARKUP_PHRASES = EASY_APPLY_PHRASES + ("easyapply", "quickapply", "applynow", "easy-apply", "quick-apply")
+
+_EASY_APPLY_TEXT = re.compile('|'.join(map(re.escape, EASY_APPLY_PHRASES)))
+_EASY_APPLY_LABEL = re.compile('|'.join(map(re.escape, EASY_APPLY_LABEL_PHRASES)))
+_EASY_APPLY_MARKUP = re.compile('|'.join(map(re.escape, EASY_APPLY_MARKUP_PHRASES)))
+_EASY_APPLY_URL = re.compile(r'easy-apply|quick-apply')
+_EASY_APPLY_URL_MARKUP = re.compile(r'easy-apply|quick-apply|easyapply|quickapply')
+_LABELLED_TAGS = frozenset({'button', 'span', 'div'})
+# String classes get_text() includes (comments, scripts and styles are skipped)
+_TEXT_TYPES = (NavigableString, CData)
+
+
+@dataclass
+class CardFlags:
+    """What a LinkedIn result card says about how to apply"""
+    easy_apply: bool
+    easy_apply_markup: bool  # Weaker hint from class names/attributes, only used for logging
+    sponsored: bool
+
+
+def detect_linkedin_card_flags(card: Tag, job_url: str) -> CardFlags:
+    """Classify a LinkedIn card in one walk over its strings and attributes.
+
+    easy_apply is set by an Easy Apply phrase in the card text, in the aria-label
+    of a button/span/div, or in a LinkedIn URL; sponsored by "sponsored" in the text.
+    """
+    texts = []
+    attribute_values = []
+    labelled = False
+    for element in [card, *card.descendants]:
+        if isinstance(element, NavigableString):
+            if type(element) in _TEXT_TYPES:
+                texts.append(element)
+            continue
+        for name, value in element.attrs.items():
+            value = ' '.join(value) if isinstance(value, list) else value
+            attribute_values.append(value)
+            if (name == 'aria-label' and element is not card and element.name in _LABELLED_TAGS
+                    and _EASY_APPLY_LABEL.search(value.lower())):
+                labelled = True
+
+    text = ''.join(texts).lower()
+    url = job_url.lower()
+    is_linkedin_url = 'linkedin' in url
+
+    easy_apply = bool(labelled or _EASY_APPLY_TEXT.search(text)
+                      or (is_linkedin_url and _EASY_APPLY_URL.search(url)))
+    easy_apply_markup = bool(easy_apply or _EASY_APPLY_MARKUP.search(text)
+                             or _EASY_APPLY_MARKUP.search(' '.join(attribute_values).lower())
+                             or (is_linkedin_url and _EASY_APPLY_URL_MARKUP.search(url)))
+    return CardFlags(easy_apply=easy_apply, easy_apply_markup=easy_apply_markup, sponsored='sponsored' in text)
+
+
+def parse_linkedin_results(content: Union[str, bytes], default_location: str,
+                           max_cards: Optional[int] = None) -> List[Dict]:
+    """The first max_cards job cards of a LinkedIn search page, in page order.
+
+    Always parsed with BeautifulSoup since flag detection walks the tree directly.
+    """
+    soup = make_soup(content, 'linkedin')
+    cards = []
+    for listing in soup.find_all('div', class_='job-search-card')[:max_cards]:
+        try:
+            title_elem = listing.find('h3', class_='base-search-card__title')
+            company_elem = listing.find('h4', class_='base-search-card__subtitle')
+            location_elem = listing.find('span', class_='job-search-card__location')
+            link_elem = listing.find('a')
+            job_url = link_elem['href'] if link_elem else ""
+            flags = detect_linkedin_card_flags(listing, job_url)
+            cards.append({
+                'title': title_elem.get_text(strip=True) if title_elem else "",
+                'company': company_elem.get_text(strip=True) if company_elem else "Unknown",
+                'location': location_elem.get_text(strip=True) if location_elem else default_location,
+                'url': job_url,
+                'sponsored': flags.sponsored,
+                'easy_apply': flags.easy_apply,
+                'easy_apply_markup': flags.easy_apply_markup,
+            })
+        except Exception as e:
+            logger.warning(f"Error parsing LinkedIn job: {e}")
+    return cards
@@ -1,5 +1,3 @@
-import requests
-from bs4 import BeautifulSoup
 import pandas as pd
 import time
 import json
@@ -7,14 +5,10 @@ from datetime import datetime, timedelta
 from fake_useragent import UserAgent
 import re
 import random
-from typing import List, Dict, Optional
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 import logging
 import os
 from reportlab.lib.pagesizes import letter, A4
-try:
-    from serpapi import GoogleSearch
-except ImportError:
-    GoogleSearch = None
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib import colors
@@ -24,17 +18,49 @@ matplotlib.use('Agg')  # Use non-interactive backend
 import matplotlib.pyplot as plt
 import io
 import base64
-from rapidfuzz import fuzz
-from urllib.parse import urlparse, parse_qs
+from urllib.parse import urlparse
+from unified_scraper import ScrapingConfig, classification_cache, seen_job_store
+from http_session import ScraperSession
+from scrape_executor import HostConcurrencyLimiter, emit_page, fetch_concurrently, run_sources_parallel, stream_sources
+from crawl_state import WatermarkStore
+from seen_jobs import SeenJob, posting_fingerprints
+from canonicalization import canonicalize_company, canonicalize_job, canonicalize_many, canonicalize_text, canonicalize_url
+from dedup import OnlineDeduplicator, Signature, deduplicate, leading_words_block, title_block
+from html_parsing import make_soup
+from job_parsers import INDEED_COMPANY_FALLBACKS, INDEED_COMPANY_SELECTORS
+from parse_stage import ParseStage
+from selector_strategy import SelectorStrategy
+from citizenship import CitizenshipClassifier
+from keyword_matching import compile_keywords
+from job_frame import CITIZENSHIP_COLUMNS, classify_citizenship, filter_frame, job_frame, relevance_mask, updated_jobs
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+SERP_API_URL = "https://serpapi.com/search"
+
+# Job fields a seen-jobs store keeps, so a posting seen before is neither fetched nor classified again
+SEEN_DETAILS = (
+    'description', 'requires_us_citizenship', 'requires_security_clearance', 'is_sponsorship_friendly',
+    'is_f1_student_friendly', 'citizenship_score', 'sponsorship_score', 'classification_tags',
+)
+
 class SoftwareEngineeringJobScraper:
-    def __init__(self):
+    def __init__(self, config: ScrapingConfig = None):
+        self.config = config or ScrapingConfig()
+        self.host_limiter = HostConcurrencyLimiter(self.config.per_host_limit)
         self.ua = UserAgent()
-        self.session = requests.Session()
+        self.session = ScraperSession(self.config)
+        self.session.cache_key = self.canonicalize_url
+        self.selectors = SelectorStrategy(os.path.join(self.config.state_dir, 'selector_stats.json'))
+        self.parser = ParseStage(self.config.parse_workers)
+        self.classifications = classification_cache(self.config)
+        self.citizenship_classifier = CitizenshipClassifier(cache=self.classifications)
+        self.seen_jobs = seen_job_store(self.config, 'software_engineering')
+        self.watermarks = None
+        if self.config.incremental:
+            self.watermarks = WatermarkStore(os.path.join(self.config.state_dir, 'watermarks.sqlite'))
         self.session.headers.update({
             'User-Agent': self.ua.random,
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
@@ -90,223 +116,130 @@ class SoftwareEngineeringJobScraper:
 
     def is_software_engineering_job(self, title: str, description: str, keywords: str = "") -> bool:
         """Check if a job posting is software engineering-related"""
-        text = (title + ' ' + description + ' ' + keywords).lower()
-        
-        # Check for software engineering keywords
-        for keyword in self.software_keywords:
-            if keyword.lower() in text:
-                return True
-        
-        # Check for software engineering job titles
-        for job_title in self.job_titles:
-            if job_title.lower() in text.lower():
-                return True
-        
-        return False
+        # Keywords and titles compiled into one whole-word matcher (cached per keyword set)
+        matcher = compile_keywords(tuple(self.software_keywords) + tuple(self.job_titles))
+        return self.classifications.get_or_compute(
+            f"relevance:{matcher.version}", title + ' ' + description + ' ' + keywords,
+            lambda text: matcher.matches(text, lowered=True)
+        )
 
     def canonicalize_text(self, text: str) -> str:
         """Canonicalize text for better matching"""
-        if not text:
-            return ""
-        
-        # Convert to lowercase
-        text = text.lower()
-        
-        # Remove common punctuation and normalize whitespace
-        text = re.sub(r'[^\w\s]', ' ', text)
-        text = re.sub(r'\s+', ' ', text)
-        
-        return text.strip()
+        return canonicalize_text(text)
     
     def canonicalize_company(self, company: str) -> str:
         """Canonicalize company name by removing suffixes and common variations"""
-        if not company:
-            return ""
-        
-        # Remove common company suffixes
-        suffixes = [
-            r'\b(inc\.?|incorporated)\b',
-            r'\b(llc\.?|limited liability company)\b',
-            r'\b(corp\.?|corporation)\b',
-            r'\b(ltd\.?|limited)\b',
-            r'\b(co\.?|company)\b',
-            r'\b(llp\.?|limited liability partnership)\b',
-            r'\b(plc\.?|public limited company)\b',
-            r'\b(ag\.?|aktiengesellschaft)\b',
-            r'\b(gmbh\.?|gesellschaft mit beschränkter haftung)\b'
-        ]
-        
-        text = company.lower()
-        for suffix in suffixes:
-            text = re.sub(suffix, '', text)
-        
-        # Clean up and normalize
-        text = self.canonicalize_text(text)
-        
-        return text
+        return canonicalize_company(company)
+    
+    def _job_key(self, url: str, title: str = "", company: str = "") -> str:
+        """Stable identity of a posting for crawl watermarks"""
+        if url:
+            return self.canonicalize_url(url)
+        return f"{self.canonicalize_text(title)}|{self.canonicalize_company(company)}"
     
     def canonicalize_url(self, url: str) -> str:
         """Canonicalize URL by removing tracking parameters and preserving job IDs"""
-        if not url:
-            return ""
-        
-        try:
-            parsed = urlparse(url)
-            
-            # Remove common tracking parameters
-            tracking_params = [
-                'utm_source', 'utm_medium', 'utm_campaign', 'utm_term', 'utm_content',
-                'gclid', 'fbclid', 'msclkid', 'ref', 'source', 'campaign',
-                'clickid', 'affiliate', 'partner', 'referrer'
-            ]
-            
-            query_params = parse_qs(parsed.query)
-            cleaned_params = {}
-            
-            # Keep job-related parameters and IDs
-            for key, values in query_params.items():
-                if any(job_keyword in key.lower() for job_keyword in ['job', 'id', 'req', 'position', 'posting']):
-                    cleaned_params[key] = values
-                elif key.lower() not in tracking_params:
-                    cleaned_params[key] = values
-            
-            # Rebuild URL
-            new_query = '&'.join([f"{k}={v[0]}" for k, v in cleaned_params.items()])
-            canonical_url = f"{parsed.scheme}://{parsed.netloc}{parsed.path}"
-            if new_query:
-                canonical_url += f"?{new_query}"
-            
-            return canonical_url
-            
-        except Exception as e:
-            logger.warning(f"Error canonicalizing URL {url}: {e}")
-            return url
+        return canonicalize_url(url)
     
-    def remove_duplicates(self, jobs: List[Dict]) -> List[Dict]:
-        """Advanced deduplication with canonicalization and fuzzy matching"""
+    def remove_duplicates(self, jobs: List[Dict], engine: str = 'blocking',
+                          jaccard_threshold: float = 0.6, workers: Optional[int] = None) -> List[Dict]:
+        """Advanced deduplication with canonicalization and fuzzy matching.
+
+        engine 'cdist' gives the same result from batched score matrices on all
+        cores; it is slower on one core and only worth it for large blocks (few
+        employers) on a multi-core machine. 'minhash' also finds reposts with a
+        reworded title or another company name, by Jaccard similarity of title,
+        company and description shingles; 'cluster' merges each group of
+        duplicates, transitively, into one record listing all of their URLs and
+        sources (see dedup.merge_duplicates). See dedup.ENGINES.
+
+        Given workers (-1: one per core), a large backfill is split into shards
+        by company, deduplicated in that many processes (see
+        dedup.sharded_deduplicate); not with 'minhash'. Fuzzy matches are then
+        only looked for within a company: any number of workers, 1 included,
+        keeps the same jobs, but they can differ from the default unsharded run.
+        """
         if not jobs:
             return jobs
         
-        unique_jobs = []
-
-        for i, job in enumerate(jobs):
-            is_duplicate = False
-            
-            # Canonicalize current job data
-            canonical_title = self.canonicalize_text(job.get('title', ''))
-            canonical_company = self.canonicalize_company(job.get('company', ''))
-            canonical_url = self.canonicalize_url(job.get('url', ''))
-            
-            # Update job with canonical data
-            job['canonical_title'] = canonical_title
-            job['canonical_company'] = canonical_company
-            job['canonical_url'] = canonical_url
-            
-            # Check against already processed jobs
-            for existing_job in unique_jobs:
-                existing_title = existing_job.get('canonical_title', '')
-                existing_company = existing_job.get('canonical_company', '')
-                
-                # Exact match on canonical data
-                if (canonical_title == existing_title and 
-                    canonical_company == existing_company):
-                    is_duplicate = True
-                    break
-                
-                # Fuzzy match on title + company
-                if canonical_title and canonical_company and existing_title and existing_company:
-                    # Combine title and company for fuzzy matching
-                    current_combined = f"{canonical_title} {canonical_company}"
-                    existing_combined = f"{existing_title} {existing_company}"
-                    
-                    # Use token_set_ratio for better fuzzy matching
-                    similarity = fuzz.token_set_ratio(current_combined, existing_combined)
-                    
-                    if similarity >= 92:
-                        is_duplicate = True
-                        logger.debug(f"Fuzzy duplicate found: '{current_combined}' vs '{existing_combined}' (similarity: {similarity}%)")
-                        break
-            
-            if not is_duplicate:
-                unique_jobs.append(job)
+        # Exact title + company and canonical URL matches are hash lookups; fuzzy
+        # matching (token_set_ratio >= 92 on title + company) only compares jobs
+        # that share the company, the title's tokens or their leading words
+        unique_jobs = deduplicate(canonicalize_many(jobs), self._canonical_signature, engine=engine,
+                                  jaccard_threshold=jaccard_threshold, workers=workers)
         
         logger.info(f"Removed {len(jobs) - len(unique_jobs)} duplicates using advanced deduplication")
         return unique_jobs
 
+    def _dedup_signature(self, job: Dict) -> Signature:
+        """Canonicalize a job in place and return its OnlineDeduplicator signature (same rules as remove_duplicates)"""
+        return self._canonical_signature(canonicalize_job(job))
+
+    def _canonical_signature(self, job: Dict) -> Signature:
+        """_dedup_signature of a job canonicalize_many has already canonicalized"""
+        fuzzy_text = None
+        if job['canonical_title'] and job['canonical_company']:
+            fuzzy_text = f"{job['canonical_title']} {job['canonical_company']}"
+        blocks = (('company', job['canonical_company']), title_block(job['canonical_title']),
+                  leading_words_block(job['canonical_title'], job['canonical_company']))
+        return Signature((job['canonical_title'], job['canonical_company']), fuzzy_text, job['canonical_url'], blocks)
+
+    def _posting_fingerprints(self, job: Dict) -> Tuple[str, ...]:
+        """Seen-jobs store keys of a posting: its canonical URL and canonical title + company"""
+        return posting_fingerprints(self.canonicalize_url(job.get('url', '')), self.canonicalize_text(job.get('title', '')),
+                                    self.canonicalize_company(job.get('company', '')))
+
+    def _seen_before(self, jobs: List[Dict]) -> List[Optional[SeenJob]]:
+        """Earlier-run record of each job or parsed card, looked up in one query; all None without a seen-jobs store"""
+        if self.seen_jobs is None or not jobs:
+            return [None] * len(jobs)
+        return self.seen_jobs.lookup([self._posting_fingerprints(job) for job in jobs])
+
+    def _mark_seen(self, job: Dict, seen: Optional[SeenJob]) -> Dict:
+        """Flag a scraped job as seen before, restoring its stored details, or as new; no-op without a store"""
+        if self.seen_jobs is None:
+            return job
+        if seen is not None:
+            job.update((key, seen.details[key]) for key in SEEN_DETAILS if key in seen.details)
+            job['first_seen'] = datetime.fromtimestamp(seen.first_seen).isoformat()
+        else:
+            job['first_seen'] = None  # Set when _remember_seen records it
+        job['seen_before'] = seen is not None
+        return job
+
+    def _mark_seen_jobs(self, jobs: List[Dict]) -> List[Dict]:
+        """_mark_seen for the jobs of sources that did not look their cards up while scraping"""
+        unmarked = [job for job in jobs if 'seen_before' not in job]
+        for job, seen in zip(unmarked, self._seen_before(unmarked)):
+            self._mark_seen(job, seen)
+        return jobs
+
+    def _remember_seen(self, jobs: List[Dict]):
+        """Record returned jobs in the seen-jobs store, if there is one, dating the new ones' first_seen"""
+        if self.seen_jobs is None:
+            return
+        now = time.time()
+        for job in jobs:
+            if not job.get('first_seen'):
+                job['first_seen'] = datetime.fromtimestamp(now).isoformat()
+        self.seen_jobs.record(((self._posting_fingerprints(job), {key: job[key] for key in SEEN_DETAILS if key in job})
+                               for job in jobs), seen_at=now)
+
     def classify_citizenship_clearance(self, text: str) -> Dict[str, bool]:
         """Classify citizenship and clearance requirements using advanced keyword matching"""
-        text_lower = text.lower()
-        
-        # Enhanced citizenship/clearance keywords
-        citizenship_keywords = [
-            # Direct citizenship requirements
-            'us citizen', 'u.s. citizen', 'united states citizen',
-            'us citizenship', 'u.s. citizenship', 'united states citizenship',
-            'must be a us citizen', 'requires us citizenship',
-            'us citizen only', 'citizenship required',
-            
-            # Security clearance requirements
-            'eligible for security clearance', 'security clearance required',
-            'security clearance', 'government clearance', 'public trust',
-            'background check', 'federal clearance', 'defense clearance',
-            'top secret', 'secret clearance', 'confidential clearance',
-            'government contractor', 'department of defense', 'dod',
-            'federal government', 'national security',
-            
-            # Exclusion keywords
-            'no sponsorship', 'no visa sponsorship', 'citizens only',
-            'us citizens only', 'must be us citizen'
-        ]
-        
-        # Sponsorship/OPT-CPT friendly keywords
-        sponsorship_keywords = [
-            # Explicit sponsorship mentions
-            'sponsor', 'sponsorship', 'h1b', 'h-1b', 'visa sponsorship',
-            'international', 'global', 'remote', 'work from home',
-            'f1', 'opt', 'cpt', 'stem opt', 'optional practical training',
-            'diversity', 'inclusive', 'equal opportunity',
-            
-            # Positive indicators
-            'sponsor h1b', 'h1b sponsorship', 'visa support',
-            'international candidates welcome', 'global talent',
-            'remote work', 'work from anywhere'
-        ]
-        
-        # Calculate scores
-        citizenship_score = sum(1 for keyword in citizenship_keywords if keyword in text_lower)
-        sponsorship_score = sum(1 for keyword in sponsorship_keywords if keyword in text_lower)
-        
-        # Determine classifications
-        requires_citizenship = citizenship_score > 0
-        is_sponsorship_friendly = sponsorship_score > 0
-        
-        # Override logic: if explicit citizenship requirement, override sponsorship
-        if requires_citizenship and any(keyword in text_lower for keyword in ['citizens only', 'us citizens only', 'no sponsorship']):
-            is_sponsorship_friendly = False
-        
-        return {
-            'requires_us_citizenship': requires_citizenship,
-            'requires_security_clearance': any(keyword in text_lower for keyword in [
-                'security clearance', 'government clearance', 'top secret', 'secret clearance'
-            ]),
-            'is_sponsorship_friendly': is_sponsorship_friendly,
-            'is_f1_student_friendly': is_sponsorship_friendly and not requires_citizenship,
-            'citizenship_score': citizenship_score,
-            'sponsorship_score': sponsorship_score
-        }
+        return self.citizenship_classifier.classify(text)
     
     def filter_citizenship_clearance(self, jobs: List[Dict], exclude_citizenship_required: bool = False) -> List[Dict]:
         """Advanced citizenship and clearance filtering with intelligent classification"""
-        for job in jobs:
-            # Combine title and description for analysis
-            full_text = f"{job.get('title', '')} {job.get('description', '')}"
-            
-            # Get intelligent classifications
-            classifications = self.classify_citizenship_clearance(full_text)
-            
+        # Combine title and description for analysis, classifying the whole batch in one go;
+        # jobs seen on an earlier run kept their classification (see _mark_seen)
+        pending = [job for job in jobs if not (job.get('seen_before') and 'requires_us_citizenship' in job)]
+        texts = [f"{job.get('title', '')} {job.get('description', '')}" for job in pending]
+        for job, classifications in zip(pending, self.citizenship_classifier.classify_many(texts)):
             # Update job with all classification data
             job.update(classifications)
-            
+        
+        for job in jobs:
             # Add UI-friendly tags
             tags = []
             if job['requires_us_citizenship']:
@@ -342,6 +275,18 @@ class SoftwareEngineeringJobScraper:
         logger.info(f"F1 student filter: kept {len(filtered_jobs)} out of {len(jobs)} jobs")
         return filtered_jobs
 
+    def retag(self, jobs: List[Dict], exclude_citizenship_required: bool = False, f1_student: bool = False) -> List[Dict]:
+        """Re-classify and re-filter previously scraped jobs (e.g. a saved JSON file) with the current keyword lists.
+
+        Runs column-wise over a pandas frame (see job_frame) rather than job by job, and drops
+        jobs that are no longer software engineering-related, like the scrapers' relevance checks would.
+        """
+        frame = job_frame(jobs)
+        frame = frame[relevance_mask(frame, compile_keywords(tuple(self.software_keywords) + tuple(self.job_titles)))]
+        frame = classify_citizenship(frame, self.citizenship_classifier)
+        frame = filter_frame(frame, exclude_citizenship_required=exclude_citizenship_required, f1_student=f1_student)
+        return updated_jobs(jobs, frame, CITIZENSHIP_COLUMNS)
+
     def scrape_indeed(self, location: str = "United States", max_pages: int = 5, time_filter: str = "7", experience_level: str = "all", keywords: str = "") -> List[Dict]:
         """Scrape software engineering jobs from Indeed with enhanced filtering"""
         jobs = []
@@ -373,6 +318,7 @@ class SoftwareEngineeringJobScraper:
         }
         
         for page in range(max_pages):
+            page_start = len(jobs)
             try:
                 # Build query with experience filter
                 base_query = 'software engineer OR "software developer" OR "full stack" OR "frontend" OR "backend" OR "web developer"'
@@ -395,89 +341,66 @@ class SoftwareEngineeringJobScraper:
                 response = self.session.get(base_url, params=params)
                 response.raise_for_status()
                 
-                soup = BeautifulSoup(response.content, 'html.parser')
-                job_cards = soup.find_all('div', class_='job_seen_beacon')
+                # Parse every card first so detail pages can be fetched in parallel
+                company_selectors = self.selectors.order('indeed.com', 'company', INDEED_COMPANY_SELECTORS,
+                                                         INDEED_COMPANY_FALLBACKS)
+                parsed_cards = self.parser.parse('indeed', response.content, location, backend=self.config.html_backend,
+                                                 company_selectors=company_selectors)
+                for parsed in parsed_cards:
+                    self.selectors.record('indeed.com', 'company', parsed['company_selector'])
                 
-                for card in job_cards:
+                # Incremental crawl: skip postings this search returned on an earlier run
+                card_keys = [self._job_key(parsed['url'], parsed['title'], parsed['company']) for parsed in parsed_cards]
+                if self.watermarks is not None and parsed_cards:
+                    seen_keys = self.watermarks.known('Indeed', query, location, card_keys)
+                    if all(key in seen_keys for key in card_keys):
+                        # Results are sorted by date, so every later page is older still
+                        self.watermarks.update('Indeed', query, location, card_keys)
+                        logger.info(f"Indeed page {page + 1} has no new postings, stopping pagination")
+                        break
+                    parsed_cards = [parsed for parsed, key in zip(parsed_cards, card_keys) if key not in seen_keys]
+                
+                # Fetch all new job descriptions for this page concurrently (order is preserved);
+                # postings returned on an earlier run keep their stored description
+                seen = self._seen_before(parsed_cards)
+                fetched = iter(fetch_concurrently(
+                    self._fetch_indeed_description,
+                    [parsed['url'] for parsed, record in zip(parsed_cards, seen) if record is None],
+                    max_workers=self.config.detail_workers,
+                    limiter=self.host_limiter
+                ))
+                descriptions = [record.details.get('description', '') if record else next(fetched) for record in seen]
+                
+                for parsed, description, record in zip(parsed_cards, descriptions, seen):
                     try:
-                        title_elem = card.find('h2', class_='jobTitle')
-                        if not title_elem:
-                            continue
-                            
-                        title = title_elem.get_text(strip=True)
-                        
-                        # Try multiple selectors for company name (Indeed changes their HTML structure)
-                        company = "Unknown"
-                        company_selectors = [
-                            'span[data-testid="company-name"]',
-                            'span.companyName',
-                            '.companyName',
-                            '[data-testid="company-name"]',
-                            'span[title]',
-                            'div[data-testid="company-name"]'
-                        ]
-                        
-                        for selector in company_selectors:
-                            company_elem = card.select_one(selector)
-                            if company_elem:
-                                company = company_elem.get_text(strip=True)
-                                if company and company != "Unknown":
-                                    break
-                        
-                        # Fallback: look for any span with company-like content
-                        if company == "Unknown":
-                            spans = card.find_all('span')
-                            for span in spans:
-                                text = span.get_text(strip=True)
-                                if text and len(text) > 2 and len(text) < 50 and not any(char.isdigit() for char in text):
-                                    company = text
-                                    break
-                        
-                        location_elem = card.find('div', class_='companyLocation')
-                        job_location = location_elem.get_text(strip=True) if location_elem else location
-                        
-                        # Check for sponsored job
-                        sponsored = "Sponsored" in card.get_text() or "sponsored" in card.get_text()
-                        
-                        # Get job description link
-                        link_elem = title_elem.find('a')
-                        if link_elem:
-                            job_url = "https://www.indeed.com" + link_elem['href']
-                            
-                            # Get job description
-                            try:
-                                desc_response = self.session.get(job_url)
-                                desc_soup = BeautifulSoup(desc_response.content, 'html.parser')
-                                desc_elem = desc_soup.find('div', class_='jobsearch-jobDescriptionText')
-                                description = desc_elem.get_text(strip=True) if desc_elem else ""
-                            except Exception:
-                                description = ""
-                        else:
-                            description = ""
-                            job_url = ""
+                        title = parsed['title']
+                        description = description or ""
                         
                         # Check if it's a software engineering job
-                        if self.is_software_engineering_job(title, description, keywords):
+                        if record is not None or self.is_software_engineering_job(title, description, keywords):
                             job_data = {
                                 'title': title,
-                                'company': company,
-                                'location': job_location,
+                                'company': parsed['company'],
+                                'location': parsed['location'],
                                 'description': description[:1000] + "..." if len(description) > 1000 else description,
-                                'url': job_url,
+                                'url': parsed['url'],
                                 'source': 'Indeed',
                                 'scraped_at': datetime.now().isoformat(),
-                                'posted_date': self._extract_date(card),
-                                'sponsored': sponsored,
+                                'posted_date': parsed['posted_date'],
+                                'sponsored': parsed['sponsored'],
                                 'experience_level': experience_level
                             }
-                            jobs.append(job_data)
+                            jobs.append(self._mark_seen(job_data, record))
                             
                     except Exception as e:
                         logger.warning(f"Error parsing job card: {e}")
                         continue
                 
+                if self.watermarks is not None:
+                    self.watermarks.update('Indeed', query, location, card_keys)
+                
+                emit_page(jobs[page_start:])
                 logger.info(f"Scraped page {page + 1} from Indeed")
-                time.sleep(2)  # Be respectful to the server
                 
             except Exception as e:
                 logger.error(f"Error scraping Indeed page {page + 1}: {e}")
@@ -485,6 +408,14 @@ class SoftwareEngineeringJobScraper:
         
         return jobs
 
+    def _fetch_indeed_description(self, job_url: str) -> str:
+        """Fetch an Indeed job page and return its description text"""
+        try:
+            desc_response = self.session.get(job_url, cache=True)
+            return self.parser.parse('indeed_detail', desc_response.content, backend=self.config.html_backend)
+        except Exception:
+            return ""
+
     def scrape_linkedin_jobs(self, location: str = "United States", max_pages: int = 3, time_filter: str = "7", experience_level: str = "all", exclude_easy_apply: bool = True, keywords: str = "") -> List[Dict]:
         """Scrape software engineering jobs from LinkedIn with enhanced filtering"""
         jobs = []
@@ -528,6 +459,7 @@ class SoftwareEngineeringJobScraper:
             }
             
             for term in search_terms:
+                term_start = len(jobs)
                 # Build URL with filters
                 base_url = f"https://www.linkedin.com/jobs/search/?keywords={term}&location={location}&f_TPR={tpr_filter}"
                 if experience_level != "all" and experience_level in exp_mapping:
@@ -535,63 +467,32 @@ class SoftwareEngineeringJobScraper:
                 
                 response = self.session.get(base_url)
                 if response.status_code == 200:
-                    soup = BeautifulSoup(response.content, 'html.parser')
-                    
                     # LinkedIn structure - this may need adjustment based on current site structure
-                    job_listings = soup.find_all('div', class_='job-search-card')
+                    parsed_cards = self.parser.parse('linkedin', response.content, location, max_cards=15)  # Limit to avoid rate limiting
+                    
+                    # Incremental crawl: skip postings this search returned on an earlier run
+                    listing_keys = []
+                    if self.watermarks is not None:
+                        # LinkedIn appends per-request tracking ids, so key on the bare posting URL
+                        listing_keys = [self._job_key(parsed['url'].split('?')[0], parsed['title'], parsed['company'])
+                                        for parsed in parsed_cards]
+                        seen_keys = self.watermarks.known('LinkedIn', term, location, listing_keys)
+                        parsed_cards = [parsed for parsed, key in zip(parsed_cards, listing_keys) if key not in seen_keys]
                     
-                    for listing in job_listings[:15]:  # Limit to avoid rate limiting
+                    # Postings returned on an earlier run were relevant then and keep their classification
+                    for parsed, record in zip(parsed_cards, self._seen_before(parsed_cards)):
                         try:
-                            title_elem = listing.find('h3', class_='base-search-card__title')
-                            title = title_elem.get_text(strip=True) if title_elem else ""
-                            
-                            company_elem = listing.find('h4', class_='base-search-card__subtitle')
-                            company = company_elem.get_text(strip=True) if company_elem else "Unknown"
-                            
-                            location_elem = listing.find('span', class_='job-search-card__location')
-                            job_location = location_elem.get_text(strip=True) if location_elem else location
-                            
-                            link_elem = listing.find('a')
-                            job_url = link_elem['href'] if link_elem else ""
-                            
-                            # Check for sponsored job
-                            sponsored = "sponsored" in listing.get_text().lower()
-                            
-                            # Check for Easy Apply job (filter these out if exclude_easy_apply is True)
-                            job_text = listing.get_text().lower()
-                            is_easy_apply = any(keyword in job_text for keyword in [
-                                "easy apply", "quick apply", "apply now", "one-click apply", 
-                                "instant apply", "apply instantly", "fast apply", "in easy apply"
-                            ])
-                            
-                            # Also check for Easy Apply button or icon in the HTML
-                            easy_apply_buttons = listing.find_all(['button', 'span', 'div'], 
-                                string=lambda text: text and any(keyword in text.lower() for keyword in [
-                                    "easy apply", "quick apply", "apply now", "in easy apply"
-                                ]))
-                            
-                            if easy_apply_buttons:
-                                is_easy_apply = True
-                            
-                            # Additional check for LinkedIn's specific Easy Apply indicators
-                            if 'linkedin' in job_url.lower():
-                                # Check if the job URL contains Easy Apply indicators
-                                if any(indicator in job_url.lower() for indicator in ['easy-apply', 'quick-apply']):
-                                    is_easy_apply = True
-                            
-                            # Check for Easy Apply in button text or aria-labels
-                            easy_apply_elements = listing.find_all(['button', 'span', 'div'], 
-                                attrs={'aria-label': lambda x: x and any(keyword in x.lower() for keyword in [
-                                    "easy apply", "quick apply", "apply now", "in easy apply"
-                                ])})
-                            
-                            if easy_apply_elements:
-                                is_easy_apply = True
+                            title = parsed['title']
+                            company = parsed['company']
+                            job_location = parsed['location']
+                            job_url = parsed['url']
+                            sponsored = parsed['sponsored']
+                            is_easy_apply = parsed['easy_apply']
                             
                             # Note: We don't skip Easy Apply jobs here anymore
                             # They will be categorized and can be filtered in the frontend
                             
-                            if title and self.is_software_engineering_job(title, "", keywords):
+                            if title and (record is not None or self.is_software_engineering_job(title, "", keywords)):
                                 # Determine source based on company and Easy Apply status
                                 if company.lower() in ['lensa', 'dice']:
                                     source = 'Staffing'
@@ -600,68 +501,11 @@ class SoftwareEngineeringJobScraper:
                                     source = 'Easy Apply'
                                     logger.info(f"🎯 Easy Apply job detected: {title} at {company}")
                                 else:
-                                    # IMPROVED Easy Apply detection
-                                    is_actually_easy_apply = False
-                                    
-                                    # Method 1: Check the entire job listing HTML for Easy Apply indicators
-                                    job_html = str(listing)
-                                    easy_apply_keywords = [
-                                        'easy apply', 'quick apply', 'apply now', 'one-click apply',
-                                        'instant apply', 'apply instantly', 'fast apply', 'in easy apply',
-                                        'easyapply', 'quickapply', 'applynow', 'easy-apply', 'quick-apply'
-                                    ]
-                                    
-                                    # Check if any Easy Apply keywords are in the HTML
-                                    for keyword in easy_apply_keywords:
-                                        if keyword in job_html.lower():
-                                            is_actually_easy_apply = True
-                                            logger.info(f"🔍 Easy Apply detected via keyword '{keyword}': {title}")
-                                            break
-                                    
-                                    # Method 2: Check for LinkedIn's specific Easy Apply button patterns
-                                    if not is_actually_easy_apply and 'linkedin' in job_url.lower():
-                                        # Look for buttons with Easy Apply text
-                                        buttons = listing.find_all(['button', 'span', 'div', 'a'])
-                                        for button in buttons:
-                                            button_text = button.get_text().lower().strip()
-                                            if any(keyword in button_text for keyword in easy_apply_keywords):
-                                                is_actually_easy_apply = True
-                                                logger.info(f"🔍 Easy Apply detected via button text '{button_text}': {title}")
-                                                break
-                                    
-                                    # Method 3: Check for LinkedIn's Easy Apply button classes and attributes
-                                    if not is_actually_easy_apply and 'linkedin' in job_url.lower():
-                                        # Look for elements with Easy Apply related classes or attributes
-                                        easy_apply_elements = listing.find_all(attrs={
-                                            'class': lambda x: x and any(
-                                                'easy' in str(x).lower() or 'apply' in str(x).lower() or 'quick' in str(x).lower()
-                                                for x in (x if isinstance(x, list) else [x])
-                                            )
-                                        })
-                                        
-                                        if easy_apply_elements:
-                                            # Double-check that these elements contain Easy Apply text
-                                            for element in easy_apply_elements:
-                                                element_text = element.get_text().lower()
-                                                if any(keyword in element_text for keyword in easy_apply_keywords):
-                                                    is_actually_easy_apply = True
-                                                    logger.info(f"🔍 Easy Apply detected via LinkedIn element: {title}")
-                                                    break
-                                    
-                                    # Method 4: Check for specific LinkedIn Easy Apply patterns in the URL
-                                    if not is_actually_easy_apply and 'linkedin' in job_url.lower():
-                                        url_indicators = ['easy-apply', 'quick-apply', 'easyapply', 'quickapply']
-                                        if any(indicator in job_url.lower() for indicator in url_indicators):
-                                            is_actually_easy_apply = True
-                                            logger.info(f"🔍 Easy Apply detected via URL: {title}")
-                                    
-                                    # Determine final source - All LinkedIn jobs together
-                                    if company.lower() in ['lensa', 'dice']:
-                                        source = 'Staffing'
-                                        logger.info(f"👥 Staffing job detected: {title} at {company}")
-                                    else:
-                                        source = 'LinkedIn'
-                                        logger.info(f"💼 LinkedIn job: {title} at {company}")
+                                    if parsed['easy_apply_markup']:
+                                        logger.info(f"🔍 Easy Apply markers found in card markup: {title}")
+                                    # All remaining LinkedIn jobs together
+                                    source = 'LinkedIn'
+                                    logger.info(f"💼 LinkedIn job: {title} at {company}")
                                 
                                 job_data = {
                                     'title': title,
@@ -676,13 +520,16 @@ class SoftwareEngineeringJobScraper:
                                     'experience_level': experience_level,
                                     'easy_apply': is_easy_apply
                                 }
-                                jobs.append(job_data)
+                                jobs.append(self._mark_seen(job_data, record))
                                 
                         except Exception as e:
                             logger.warning(f"Error parsing LinkedIn job: {e}")
                             continue
+                    
+                    if self.watermarks is not None:
+                        self.watermarks.update('LinkedIn', term, location, listing_keys)
                 
-                time.sleep(3)  # Longer delay for LinkedIn
+                emit_page(jobs[term_start:])
                 
         except Exception as e:
             logger.error(f"Error scraping LinkedIn: {e}")
@@ -701,25 +548,23 @@ class SoftwareEngineeringJobScraper:
         logger.info(f"Filters: Easy Apply excluded={exclude_easy_apply}, Exclude Citizenship Required={exclude_citizenship_required}, F1 Student={f1_student}")
         logger.info(f"Keywords: {keywords}")
         
-        # Scrape from Indeed
-        if 'Indeed' in sources:
-            logger.info("🔍 Scraping Indeed...")
-            indeed_jobs = self.scrape_indeed(location, time_filter=time_filter, experience_level=experience_level, keywords=keywords)
-            logger.info(f"✅ Found {len(indeed_jobs)} jobs from Indeed")
-            all_jobs.extend(indeed_jobs)
+        # Each selected source runs on its own worker; results are merged in source order
+        tasks = self._source_tasks(location, time_filter, experience_level, sources, exclude_easy_apply, keywords)
         
-        # Scrape from LinkedIn
-        if 'LinkedIn' in sources:
-            logger.info("🔍 Scraping LinkedIn...")
-            linkedin_jobs = self.scrape_linkedin_jobs(location, time_filter=time_filter, experience_level=experience_level, exclude_easy_apply=exclude_easy_apply, keywords=keywords)
-            logger.info(f"✅ Found {len(linkedin_jobs)} jobs from LinkedIn")
-            all_jobs.extend(linkedin_jobs)
+        for name, source_jobs in run_sources_parallel(tasks, max_workers=self.config.source_workers):
+            logger.info(f"✅ Found {len(source_jobs)} jobs from {name}")
+            all_jobs.extend(source_jobs)
         
         # Advanced deduplication with canonicalization and fuzzy matching
         logger.info(f"Total jobs scraped before deduplication: {len(all_jobs)}")
         all_jobs = self.remove_duplicates(all_jobs)
         logger.info(f"Total jobs after deduplication: {len(all_jobs)}")
         
+        # Flag postings returned on an earlier run (Indeed and LinkedIn cards were looked up while scraping)
+        if self.seen_jobs is not None:
+            all_jobs = self._mark_seen_jobs(all_jobs)
+            logger.info(f"Seen on an earlier run: {sum(1 for job in all_jobs if job['seen_before'])}")
+        
         # Apply intelligent citizenship and clearance classification
         all_jobs = self.filter_citizenship_clearance(all_jobs, exclude_citizenship_required=exclude_citizenship_required)
         
@@ -729,8 +574,68 @@ class SoftwareEngineeringJobScraper:
             logger.info(f"Total jobs after F1 student filter: {len(all_jobs)}")
         
         logger.info(f"Final total jobs: {len(all_jobs)}")
+        self._remember_seen(all_jobs)
+        cache_stats = self.session.cache_stats()
+        if cache_stats:
+            logger.info(f"HTTP cache: {cache_stats}")
+        logger.info(f"Classification cache: {self.classifications.stats()}")
+        self.selectors.log_markup_changes()
+        self.selectors.save()
+        self.classifications.save()
         return all_jobs
 
+    def _source_tasks(self, location: str, time_filter: str, experience_level: str, sources: List[str], exclude_easy_apply: bool, keywords: str) -> List[Tuple[str, Callable[[], List[Dict]]]]:
+        """(source name, scrape callable) pairs for the selected sources"""
+        source_tasks = {
+            'Indeed': lambda: self.scrape_indeed(location, time_filter=time_filter, experience_level=experience_level, keywords=keywords),
+            'LinkedIn': lambda: self.scrape_linkedin_jobs(location, time_filter=time_filter, experience_level=experience_level, exclude_easy_apply=exclude_easy_apply, keywords=keywords),
+        }
+        tasks = [(name, task) for name, task in source_tasks.items() if name in sources]
+        for name, _ in tasks:
+            logger.info(f"🔍 Scraping {name}...")
+        return tasks
+
+    def iter_all_sources(self, location: str = "United States", time_filter: str = "7", experience_level: str = "all", sources: List[str] = None, exclude_citizenship_required: bool = False, f1_student: bool = False, exclude_easy_apply: bool = True, keywords: str = "") -> Iterator[Dict]:
+        """Streaming scrape_all_sources: yield deduplicated, classified jobs as each page is parsed.
+
+        Applies the same dedup, classification and filters, but page by page, so the
+        first jobs arrive while the other sources are still running. Duplicates are
+        checked against every job seen so far, which means the kept copy is the one
+        that arrived first rather than the one from the earliest source.
+        """
+        if sources is None:
+            sources = ['Indeed', 'LinkedIn', 'Glassdoor', 'ZipRecruiter', 'Dice', 'Wellfound']
+        
+        logger.info(f"Streaming software engineering jobs from {', '.join(sources)}...")
+        tasks = self._source_tasks(location, time_filter, experience_level, sources, exclude_easy_apply, keywords)
+        deduplicator = OnlineDeduplicator(self._dedup_signature)
+        yielded = 0
+        
+        for name, page_jobs in stream_sources(tasks, max_workers=self.config.source_workers):
+            page_jobs = [job for job in page_jobs if deduplicator.add(job)]
+            if self.seen_jobs is not None:
+                page_jobs = self._mark_seen_jobs(page_jobs)
+            page_jobs = self.filter_citizenship_clearance(page_jobs, exclude_citizenship_required=exclude_citizenship_required)
+            page_jobs = self.filter_f1_student_friendly(page_jobs, f1_student=f1_student)
+            self._remember_seen(page_jobs)
+            for job in page_jobs:
+                yielded += 1
+                yield job
+        
+        logger.info(f"Streamed {yielded} jobs ({deduplicator.dropped} duplicates dropped)")
+        self.selectors.log_markup_changes()
+        self.selectors.save()
+        self.classifications.save()
+
+    def close(self):
+        """Release the scraper's parse workers, connections and files (a recording cassette included) once it is done"""
+        self.parser.close()
+        self.selectors.save()
+        self.classifications.close()
+        if self.seen_jobs is not None:
+            self.seen_jobs.close()
+        self.session.close()
+
     def save_to_csv(self, jobs: List[Dict], filename: str = None) -> str:
         """Save jobs to CSV file"""
         if not filename:
@@ -979,9 +884,20 @@ class SoftwareEngineeringJobScraper:
 
 
 class CyberSecurityJobScraper:
-    def __init__(self):
+    def __init__(self, config: ScrapingConfig = None):
+        self.config = config or ScrapingConfig()
+        self.host_limiter = HostConcurrencyLimiter(self.config.per_host_limit)
         self.ua = UserAgent()
-        self.session = requests.Session()
+        self.session = ScraperSession(self.config)
+        self.session.cache_key = self.canonicalize_url
+        self.selectors = SelectorStrategy(os.path.join(self.config.state_dir, 'selector_stats.json'))
+        self.parser = ParseStage(self.config.parse_workers)
+        self.classifications = classification_cache(self.config)
+        self.citizenship_classifier = CitizenshipClassifier(cache=self.classifications)
+        self.seen_jobs = seen_job_store(self.config, 'cybersecurity')
+        self.watermarks = None
+        if self.config.incremental:
+            self.watermarks = WatermarkStore(os.path.join(self.config.state_dir, 'watermarks.sqlite'))
         self.session.headers.update({
             'User-Agent': self.ua.random,
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
@@ -1061,223 +977,130 @@ class CyberSecurityJobScraper:
 
     def is_cybersecurity_job(self, title: str, description: str) -> bool:
         """Check if a job posting is cybersecurity-related"""
-        text = (title + ' ' + description).lower()
-        
-        # Check for cybersecurity keywords
-        for keyword in self.cyber_keywords:
-            if keyword.lower() in text:
-                return True
-        
-        # Check for security-related job titles
-        for job_title in self.job_titles:
-            if job_title.lower() in text.lower():
-                return True
-        
-        return False
+        # Keywords and titles compiled into one whole-word matcher (cached per keyword set)
+        matcher = compile_keywords(tuple(self.cyber_keywords) + tuple(self.job_titles))
+        return self.classifications.get_or_compute(
+            f"relevance:{matcher.version}", title + ' ' + description,
+            lambda text: matcher.matches(text, lowered=True)
+        )
 
     def canonicalize_text(self, text: str) -> str:
         """Canonicalize text for better matching"""
-        if not text:
-            return ""
-        
-        # Convert to lowercase
-        text = text.lower()
-        
-        # Remove common punctuation and normalize whitespace
-        text = re.sub(r'[^\w\s]', ' ', text)
-        text = re.sub(r'\s+', ' ', text)
-        
-        return text.strip()
+        return canonicalize_text(text)
     
     def canonicalize_company(self, company: str) -> str:
         """Canonicalize company name by removing suffixes and common variations"""
-        if not company:
-            return ""
-        
-        # Remove common company suffixes
-        suffixes = [
-            r'\b(inc\.?|incorporated)\b',
-            r'\b(llc\.?|limited liability company)\b',
-            r'\b(corp\.?|corporation)\b',
-            r'\b(ltd\.?|limited)\b',
-            r'\b(co\.?|company)\b',
-            r'\b(llp\.?|limited liability partnership)\b',
-            r'\b(plc\.?|public limited company)\b',
-            r'\b(ag\.?|aktiengesellschaft)\b',
-            r'\b(gmbh\.?|gesellschaft mit beschränkter haftung)\b'
-        ]
-        
-        text = company.lower()
-        for suffix in suffixes:
-            text = re.sub(suffix, '', text)
-        
-        # Clean up and normalize
-        text = self.canonicalize_text(text)
-        
-        return text
+        return canonicalize_company(company)
+    
+    def _job_key(self, url: str, title: str = "", company: str = "") -> str:
+        """Stable identity of a posting for crawl watermarks"""
+        if url:
+            return self.canonicalize_url(url)
+        return f"{self.canonicalize_text(title)}|{self.canonicalize_company(company)}"
     
     def canonicalize_url(self, url: str) -> str:
         """Canonicalize URL by removing tracking parameters and preserving job IDs"""
-        if not url:
-            return ""
-        
-        try:
-            parsed = urlparse(url)
-            
-            # Remove common tracking parameters
-            tracking_params = [
-                'utm_source', 'utm_medium', 'utm_campaign', 'utm_term', 'utm_content',
-                'gclid', 'fbclid', 'msclkid', 'ref', 'source', 'campaign',
-                'clickid', 'affiliate', 'partner', 'referrer'
-            ]
-            
-            query_params = parse_qs(parsed.query)
-            cleaned_params = {}
-            
-            # Keep job-related parameters and IDs
-            for key, values in query_params.items():
-                if any(job_keyword in key.lower() for job_keyword in ['job', 'id', 'req', 'position', 'posting']):
-                    cleaned_params[key] = values
-                elif key.lower() not in tracking_params:
-                    cleaned_params[key] = values
-            
-            # Rebuild URL
-            new_query = '&'.join([f"{k}={v[0]}" for k, v in cleaned_params.items()])
-            canonical_url = f"{parsed.scheme}://{parsed.netloc}{parsed.path}"
-            if new_query:
-                canonical_url += f"?{new_query}"
-            
-            return canonical_url
-            
-        except Exception as e:
-            logger.warning(f"Error canonicalizing URL {url}: {e}")
-            return url
+        return canonicalize_url(url)
     
-    def remove_duplicates(self, jobs: List[Dict]) -> List[Dict]:
-        """Advanced deduplication with canonicalization and fuzzy matching"""
+    def remove_duplicates(self, jobs: List[Dict], engine: str = 'blocking',
+                          jaccard_threshold: float = 0.6, workers: Optional[int] = None) -> List[Dict]:
+        """Advanced deduplication with canonicalization and fuzzy matching.
+
+        engine 'cdist' gives the same result from batched score matrices on all
+        cores; it is slower on one core and only worth it for large blocks (few
+        employers) on a multi-core machine. 'minhash' also finds reposts with a
+        reworded title or another company name, by Jaccard similarity of title,
+        company and description shingles; 'cluster' merges each group of
+        duplicates, transitively, into one record listing all of their URLs and
+        sources (see dedup.merge_duplicates). See dedup.ENGINES.
+
+        Given workers (-1: one per core), a large backfill is split into shards
+        by company, deduplicated in that many processes (see
+        dedup.sharded_deduplicate); not with 'minhash'. Fuzzy matches are then
+        only looked for within a company: any number of workers, 1 included,
+        keeps the same jobs, but they can differ from the default unsharded run.
+        """
         if not jobs:
             return jobs
         
-        unique_jobs = []
-
-        for i, job in enumerate(jobs):
-            is_duplicate = False
-            
-            # Canonicalize current job data
-            canonical_title = self.canonicalize_text(job.get('title', ''))
-            canonical_company = self.canonicalize_company(job.get('company', ''))
-            canonical_url = self.canonicalize_url(job.get('url', ''))
-            
-            # Update job with canonical data
-            job['canonical_title'] = canonical_title
-            job['canonical_company'] = canonical_company
-            job['canonical_url'] = canonical_url
-            
-            # Check against already processed jobs
-            for existing_job in unique_jobs:
-                existing_title = existing_job.get('canonical_title', '')
-                existing_company = existing_job.get('canonical_company', '')
-                
-                # Exact match on canonical data
-                if (canonical_title == existing_title and 
-                    canonical_company == existing_company):
-                    is_duplicate = True
-                    break
-                
-                # Fuzzy match on title + company
-                if canonical_title and canonical_company and existing_title and existing_company:
-                    # Combine title and company for fuzzy matching
-                    current_combined = f"{canonical_title} {canonical_company}"
-                    existing_combined = f"{existing_title} {existing_company}"
-                    
-                    # Use token_set_ratio for better fuzzy matching
-                    similarity = fuzz.token_set_ratio(current_combined, existing_combined)
-                    
-                    if similarity >= 92:
-                        is_duplicate = True
-                        logger.debug(f"Fuzzy duplicate found: '{current_combined}' vs '{existing_combined}' (similarity: {similarity}%)")
-                        break
-            
-            if not is_duplicate:
-                unique_jobs.append(job)
+        # Exact title + company and canonical URL matches are hash lookups; fuzzy
+        # matching (token_set_ratio >= 92 on title + company) only compares jobs
+        # that share the company, the title's tokens or their leading words
+        unique_jobs = deduplicate(canonicalize_many(jobs), self._canonical_signature, engine=engine,
+                                  jaccard_threshold=jaccard_threshold, workers=workers)
         
         logger.info(f"Removed {len(jobs) - len(unique_jobs)} duplicates using advanced deduplication")
         return unique_jobs
 
+    def _dedup_signature(self, job: Dict) -> Signature:
+        """Canonicalize a job in place and return its OnlineDeduplicator signature (same rules as remove_duplicates)"""
+        return self._canonical_signature(canonicalize_job(job))
+
+    def _canonical_signature(self, job: Dict) -> Signature:
+        """_dedup_signature of a job canonicalize_many has already canonicalized"""
+        fuzzy_text = None
+        if job['canonical_title'] and job['canonical_company']:
+            fuzzy_text = f"{job['canonical_title']} {job['canonical_company']}"
+        blocks = (('company', job['canonical_company']), title_block(job['canonical_title']),
+                  leading_words_block(job['canonical_title'], job['canonical_company']))
+        return Signature((job['canonical_title'], job['canonical_company']), fuzzy_text, job['canonical_url'], blocks)
+
+    def _posting_fingerprints(self, job: Dict) -> Tuple[str, ...]:
+        """Seen-jobs store keys of a posting: its canonical URL and canonical title + company"""
+        return posting_fingerprints(self.canonicalize_url(job.get('url', '')), self.canonicalize_text(job.get('title', '')),
+                                    self.canonicalize_company(job.get('company', '')))
+
+    def _seen_before(self, jobs: List[Dict]) -> List[Optional[SeenJob]]:
+        """Earlier-run record of each job or parsed card, looked up in one query; all None without a seen-jobs store"""
+        if self.seen_jobs is None or not jobs:
+            return [None] * len(jobs)
+        return self.seen_jobs.lookup([self._posting_fingerprints(job) for job in jobs])
+
+    def _mark_seen(self, job: Dict, seen: Optional[SeenJob]) -> Dict:
+        """Flag a scraped job as seen before, restoring its stored details, or as new; no-op without a store"""
+        if self.seen_jobs is None:
+            return job
+        if seen is not None:
+            job.update((key, seen.details[key]) for key in SEEN_DETAILS if key in seen.details)
+            job['first_seen'] = datetime.fromtimestamp(seen.first_seen).isoformat()
+        else:
+            job['first_seen'] = None  # Set when _remember_seen records it
+        job['seen_before'] = seen is not None
+        return job
+
+    def _mark_seen_jobs(self, jobs: List[Dict]) -> List[Dict]:
+        """_mark_seen for the jobs of sources that did not look their cards up while scraping"""
+        unmarked = [job for job in jobs if 'seen_before' not in job]
+        for job, seen in zip(unmarked, self._seen_before(unmarked)):
+            self._mark_seen(job, seen)
+        return jobs
+
+    def _remember_seen(self, jobs: List[Dict]):
+        """Record returned jobs in the seen-jobs store, if there is one, dating the new ones' first_seen"""
+        if self.seen_jobs is None:
+            return
+        now = time.time()
+        for job in jobs:
+            if not job.get('first_seen'):
+                job['first_seen'] = datetime.fromtimestamp(now).isoformat()
+        self.seen_jobs.record(((self._posting_fingerprints(job), {key: job[key] for key in SEEN_DETAILS if key in job})
+                               for job in jobs), seen_at=now)
+
     def classify_citizenship_clearance(self, text: str) -> Dict[str, bool]:
         """Classify citizenship and clearance requirements using advanced keyword matching"""
-        text_lower = text.lower()
-        
-        # Enhanced citizenship/clearance keywords
-        citizenship_keywords = [
-            # Direct citizenship requirements
-            'us citizen', 'u.s. citizen', 'united states citizen',
-            'us citizenship', 'u.s. citizenship', 'united states citizenship',
-            'must be a us citizen', 'requires us citizenship',
-            'us citizen only', 'citizenship required',
-            
-            # Security clearance requirements
-            'eligible for security clearance', 'security clearance required',
-            'security clearance', 'government clearance', 'public trust',
-            'background check', 'federal clearance', 'defense clearance',
-            'top secret', 'secret clearance', 'confidential clearance',
-            'government contractor', 'department of defense', 'dod',
-            'federal government', 'national security',
-            
-            # Exclusion keywords
-            'no sponsorship', 'no visa sponsorship', 'citizens only',
-            'us citizens only', 'must be us citizen'
-        ]
-        
-        # Sponsorship/OPT-CPT friendly keywords
-        sponsorship_keywords = [
-            # Explicit sponsorship mentions
-            'sponsor', 'sponsorship', 'h1b', 'h-1b', 'visa sponsorship',
-            'international', 'global', 'remote', 'work from home',
-            'f1', 'opt', 'cpt', 'stem opt', 'optional practical training',
-            'diversity', 'inclusive', 'equal opportunity',
-            
-            # Positive indicators
-            'sponsor h1b', 'h1b sponsorship', 'visa support',
-            'international candidates welcome', 'global talent',
-            'remote work', 'work from anywhere'
-        ]
-        
-        # Calculate scores
-        citizenship_score = sum(1 for keyword in citizenship_keywords if keyword in text_lower)
-        sponsorship_score = sum(1 for keyword in sponsorship_keywords if keyword in text_lower)
-        
-        # Determine classifications
-        requires_citizenship = citizenship_score > 0
-        is_sponsorship_friendly = sponsorship_score > 0
-        
-        # Override logic: if explicit citizenship requirement, override sponsorship
-        if requires_citizenship and any(keyword in text_lower for keyword in ['citizens only', 'us citizens only', 'no sponsorship']):
-            is_sponsorship_friendly = False
-        
-        return {
-            'requires_us_citizenship': requires_citizenship,
-            'requires_security_clearance': any(keyword in text_lower for keyword in [
-                'security clearance', 'government clearance', 'top secret', 'secret clearance'
-            ]),
-            'is_sponsorship_friendly': is_sponsorship_friendly,
-            'is_f1_student_friendly': is_sponsorship_friendly and not requires_citizenship,
-            'citizenship_score': citizenship_score,
-            'sponsorship_score': sponsorship_score
-        }
+        return self.citizenship_classifier.classify(text)
     
     def filter_citizenship_clearance(self, jobs: List[Dict], exclude_citizenship_required: bool = False) -> List[Dict]:
         """Advanced citizenship and clearance filtering with intelligent classification"""
-        for job in jobs:
-            # Combine title and description for analysis
-            full_text = f"{job.get('title', '')} {job.get('description', '')}"
-            
-            # Get intelligent classifications
-            classifications = self.classify_citizenship_clearance(full_text)
-            
+        # Combine title and description for analysis, classifying the whole batch in one go;
+        # jobs seen on an earlier run kept their classification (see _mark_seen)
+        pending = [job for job in jobs if not (job.get('seen_before') and 'requires_us_citizenship' in job)]
+        texts = [f"{job.get('title', '')} {job.get('description', '')}" for job in pending]
+        for job, classifications in zip(pending, self.citizenship_classifier.classify_many(texts)):
             # Update job with all classification data
             job.update(classifications)
-            
+        
+        for job in jobs:
             # Add UI-friendly tags
             tags = []
             if job['requires_us_citizenship']:
@@ -1313,6 +1136,18 @@ class CyberSecurityJobScraper:
         logger.info(f"F1 student filter: kept {len(filtered_jobs)} out of {len(jobs)} jobs")
         return filtered_jobs
 
+    def retag(self, jobs: List[Dict], exclude_citizenship_required: bool = False, f1_student: bool = False) -> List[Dict]:
+        """Re-classify and re-filter previously scraped jobs (e.g. a saved JSON file) with the current keyword lists.
+
+        Runs column-wise over a pandas frame (see job_frame) rather than job by job, and drops
+        jobs that are no longer cybersecurity-related, like the scrapers' relevance checks would.
+        """
+        frame = job_frame(jobs)
+        frame = frame[relevance_mask(frame, compile_keywords(tuple(self.cyber_keywords) + tuple(self.job_titles)))]
+        frame = classify_citizenship(frame, self.citizenship_classifier)
+        frame = filter_frame(frame, exclude_citizenship_required=exclude_citizenship_required, f1_student=f1_student)
+        return updated_jobs(jobs, frame, CITIZENSHIP_COLUMNS)
+
     def scrape_indeed(self, location: str = "United States", max_pages: int = 5, time_filter: str = "7", experience_level: str = "all") -> List[Dict]:
         """Scrape cybersecurity jobs from Indeed with enhanced filtering"""
         jobs = []
@@ -1344,6 +1179,7 @@ class CyberSecurityJobScraper:
         }
         
         for page in range(max_pages):
+            page_start = len(jobs)
             try:
                 # Build query with experience filter
                 base_query = 'cybersecurity OR "cyber security" OR "information security" OR "security engineer" OR "penetration tester"'
@@ -1363,89 +1199,66 @@ class CyberSecurityJobScraper:
                 response = self.session.get(base_url, params=params)
                 response.raise_for_status()
                 
-                soup = BeautifulSoup(response.content, 'html.parser')
-                job_cards = soup.find_all('div', class_='job_seen_beacon')
+                # Parse every card first so detail pages can be fetched in parallel
+                company_selectors = self.selectors.order('indeed.com', 'company', INDEED_COMPANY_SELECTORS,
+                                                         INDEED_COMPANY_FALLBACKS)
+                parsed_cards = self.parser.parse('indeed', response.content, location, backend=self.config.html_backend,
+                                                 company_selectors=company_selectors)
+                for parsed in parsed_cards:
+                    self.selectors.record('indeed.com', 'company', parsed['company_selector'])
                 
-                for card in job_cards:
+                # Incremental crawl: skip postings this search returned on an earlier run
+                card_keys = [self._job_key(parsed['url'], parsed['title'], parsed['company']) for parsed in parsed_cards]
+                if self.watermarks is not None and parsed_cards:
+                    seen_keys = self.watermarks.known('Indeed', query, location, card_keys)
+                    if all(key in seen_keys for key in card_keys):
+                        # Results are sorted by date, so every later page is older still
+                        self.watermarks.update('Indeed', query, location, card_keys)
+                        logger.info(f"Indeed page {page + 1} has no new postings, stopping pagination")
+                        break
+                    parsed_cards = [parsed for parsed, key in zip(parsed_cards, card_keys) if key not in seen_keys]
+                
+                # Fetch all new job descriptions for this page concurrently (order is preserved);
+                # postings returned on an earlier run keep their stored description
+                seen = self._seen_before(parsed_cards)
+                fetched = iter(fetch_concurrently(
+                    self._fetch_indeed_description,
+                    [parsed['url'] for parsed, record in zip(parsed_cards, seen) if record is None],
+                    max_workers=self.config.detail_workers,
+                    limiter=self.host_limiter
+                ))
+                descriptions = [record.details.get('description', '') if record else next(fetched) for record in seen]
+                
+                for parsed, description, record in zip(parsed_cards, descriptions, seen):
                     try:
-                        title_elem = card.find('h2', class_='jobTitle')
-                        if not title_elem:
-                            continue
-                            
-                        title = title_elem.get_text(strip=True)
-                        
-                        # Try multiple selectors for company name (Indeed changes their HTML structure)
-                        company = "Unknown"
-                        company_selectors = [
-                            'span[data-testid="company-name"]',
-                            'span.companyName',
-                            '.companyName',
-                            '[data-testid="company-name"]',
-                            'span[title]',
-                            'div[data-testid="company-name"]'
-                        ]
-                        
-                        for selector in company_selectors:
-                            company_elem = card.select_one(selector)
-                            if company_elem:
-                                company = company_elem.get_text(strip=True)
-                                if company and company != "Unknown":
-                                    break
-                        
-                        # Fallback: look for any span with company-like content
-                        if company == "Unknown":
-                            spans = card.find_all('span')
-                            for span in spans:
-                                text = span.get_text(strip=True)
-                                if text and len(text) > 2 and len(text) < 50 and not any(char.isdigit() for char in text):
-                                    company = text
-                                    break
-                        
-                        location_elem = card.find('div', class_='companyLocation')
-                        job_location = location_elem.get_text(strip=True) if location_elem else location
-                        
-                        # Check for sponsored job
-                        sponsored = "Sponsored" in card.get_text() or "sponsored" in card.get_text()
-                        
-                        # Get job description link
-                        link_elem = title_elem.find('a')
-                        if link_elem:
-                            job_url = "https://www.indeed.com" + link_elem['href']
-                            
-                            # Get job description
-                            try:
-                                desc_response = self.session.get(job_url)
-                                desc_soup = BeautifulSoup(desc_response.content, 'html.parser')
-                                desc_elem = desc_soup.find('div', class_='jobsearch-jobDescriptionText')
-                                description = desc_elem.get_text(strip=True) if desc_elem else ""
-                            except Exception:
-                                description = ""
-                        else:
-                            description = ""
-                            job_url = ""
+                        title = parsed['title']
+                        description = description or ""
                         
                         # Check if it's a cybersecurity job
-                        if self.is_cybersecurity_job(title, description):
+                        if record is not None or self.is_cybersecurity_job(title, description):
                             job_data = {
                                 'title': title,
-                                'company': company,
-                                'location': job_location,
+                                'company': parsed['company'],
+                                'location': parsed['location'],
                                 'description': description[:1000] + "..." if len(description) > 1000 else description,
-                                'url': job_url,
+                                'url': parsed['url'],
                                 'source': 'Indeed',
                                 'scraped_at': datetime.now().isoformat(),
-                                'posted_date': self._extract_date(card),
-                                'sponsored': sponsored,
+                                'posted_date': parsed['posted_date'],
+                                'sponsored': parsed['sponsored'],
                                 'experience_level': experience_level
                             }
-                            jobs.append(job_data)
+                            jobs.append(self._mark_seen(job_data, record))
                             
                     except Exception as e:
                         logger.warning(f"Error parsing job card: {e}")
                         continue
                 
+                if self.watermarks is not None:
+                    self.watermarks.update('Indeed', query, location, card_keys)
+                
+                emit_page(jobs[page_start:])
                 logger.info(f"Scraped page {page + 1} from Indeed")
-                time.sleep(2)  # Be respectful to the server
                 
             except Exception as e:
                 logger.error(f"Error scraping Indeed page {page + 1}: {e}")
@@ -1453,6 +1266,14 @@ class CyberSecurityJobScraper:
         
         return jobs
 
+    def _fetch_indeed_description(self, job_url: str) -> str:
+        """Fetch an Indeed job page and return its description text"""
+        try:
+            desc_response = self.session.get(job_url, cache=True)
+            return self.parser.parse('indeed_detail', desc_response.content, backend=self.config.html_backend)
+        except Exception:
+            return ""
+
     def scrape_linkedin_jobs(self, location: str = "United States", max_pages: int = 3, time_filter: str = "7", experience_level: str = "all", exclude_easy_apply: bool = True) -> List[Dict]:
         """Scrape cybersecurity jobs from LinkedIn with enhanced filtering"""
         jobs = []
@@ -1493,6 +1314,7 @@ class CyberSecurityJobScraper:
             }
             
             for term in search_terms:
+                term_start = len(jobs)
                 # Build URL with filters
                 base_url = f"https://www.linkedin.com/jobs/search/?keywords={term}&location={location}&f_TPR={tpr_filter}"
                 if experience_level != "all" and experience_level in exp_mapping:
@@ -1500,63 +1322,32 @@ class CyberSecurityJobScraper:
                 
                 response = self.session.get(base_url)
                 if response.status_code == 200:
-                    soup = BeautifulSoup(response.content, 'html.parser')
-                    
                     # LinkedIn structure - this may need adjustment based on current site structure
-                    job_listings = soup.find_all('div', class_='job-search-card')
+                    parsed_cards = self.parser.parse('linkedin', response.content, location, max_cards=15)  # Limit to avoid rate limiting
                     
-                    for listing in job_listings[:15]:  # Limit to avoid rate limiting
+                    # Incremental crawl: skip postings this search returned on an earlier run
+                    listing_keys = []
+                    if self.watermarks is not None:
+                        # LinkedIn appends per-request tracking ids, so key on the bare posting URL
+                        listing_keys = [self._job_key(parsed['url'].split('?')[0], parsed['title'], parsed['company'])
+                                        for parsed in parsed_cards]
+                        seen_keys = self.watermarks.known('LinkedIn', term, location, listing_keys)
+                        parsed_cards = [parsed for parsed, key in zip(parsed_cards, listing_keys) if key not in seen_keys]
+                    
+                    # Postings returned on an earlier run were relevant then and keep their classification
+                    for parsed, record in zip(parsed_cards, self._seen_before(parsed_cards)):
                         try:
-                            title_elem = listing.find('h3', class_='base-search-card__title')
-                            title = title_elem.get_text(strip=True) if title_elem else ""
-                            
-                            company_elem = listing.find('h4', class_='base-search-card__subtitle')
-                            company = company_elem.get_text(strip=True) if company_elem else "Unknown"
-                            
-                            location_elem = listing.find('span', class_='job-search-card__location')
-                            job_location = location_elem.get_text(strip=True) if location_elem else location
-                            
-                            link_elem = listing.find('a')
-                            job_url = link_elem['href'] if link_elem else ""
-                            
-                            # Check for sponsored job
-                            sponsored = "sponsored" in listing.get_text().lower()
-                            
-                            # Check for Easy Apply job (filter these out if exclude_easy_apply is True)
-                            job_text = listing.get_text().lower()
-                            is_easy_apply = any(keyword in job_text for keyword in [
-                                "easy apply", "quick apply", "apply now", "one-click apply", 
-                                "instant apply", "apply instantly", "fast apply", "in easy apply"
-                            ])
-                            
-                            # Also check for Easy Apply button or icon in the HTML
-                            easy_apply_buttons = listing.find_all(['button', 'span', 'div'], 
-                                string=lambda text: text and any(keyword in text.lower() for keyword in [
-                                    "easy apply", "quick apply", "apply now", "in easy apply"
-                                ]))
-                            
-                            if easy_apply_buttons:
-                                is_easy_apply = True
-                            
-                            # Additional check for LinkedIn's specific Easy Apply indicators
-                            if 'linkedin' in job_url.lower():
-                                # Check if the job URL contains Easy Apply indicators
-                                if any(indicator in job_url.lower() for indicator in ['easy-apply', 'quick-apply']):
-                                    is_easy_apply = True
-                            
-                            # Check for Easy Apply in button text or aria-labels
-                            easy_apply_elements = listing.find_all(['button', 'span', 'div'], 
-                                attrs={'aria-label': lambda x: x and any(keyword in x.lower() for keyword in [
-                                    "easy apply", "quick apply", "apply now", "in easy apply"
-                                ])})
-                            
-                            if easy_apply_elements:
-                                is_easy_apply = True
+                            title = parsed['title']
+                            company = parsed['company']
+                            job_location = parsed['location']
+                            job_url = parsed['url']
+                            sponsored = parsed['sponsored']
+                            is_easy_apply = parsed['easy_apply']
                             
                             # Note: We don't skip Easy Apply jobs here anymore
                             # They will be categorized and can be filtered in the frontend
                             
-                            if title and self.is_cybersecurity_job(title, ""):
+                            if title and (record is not None or self.is_cybersecurity_job(title, "")):
                                 # Determine source based on company and Easy Apply status
                                 if company.lower() in ['lensa', 'dice']:
                                     source = 'Staffing'
@@ -1565,68 +1356,11 @@ class CyberSecurityJobScraper:
                                     source = 'Easy Apply'
                                     logger.info(f"🎯 Easy Apply job detected: {title} at {company}")
                                 else:
-                                    # IMPROVED Easy Apply detection
-                                    is_actually_easy_apply = False
-                                    
-                                    # Method 1: Check the entire job listing HTML for Easy Apply indicators
-                                    job_html = str(listing)
-                                    easy_apply_keywords = [
-                                        'easy apply', 'quick apply', 'apply now', 'one-click apply',
-                                        'instant apply', 'apply instantly', 'fast apply', 'in easy apply',
-                                        'easyapply', 'quickapply', 'applynow', 'easy-apply', 'quick-apply'
-                                    ]
-                                    
-                                    # Check if any Easy Apply keywords are in the HTML
-                                    for keyword in easy_apply_keywords:
-                                        if keyword in job_html.lower():
-                                            is_actually_easy_apply = True
-                                            logger.info(f"🔍 Easy Apply detected via keyword '{keyword}': {title}")
-                                            break
-                                    
-                                    # Method 2: Check for LinkedIn's specific Easy Apply button patterns
-                                    if not is_actually_easy_apply and 'linkedin' in job_url.lower():
-                                        # Look for buttons with Easy Apply text
-                                        buttons = listing.find_all(['button', 'span', 'div', 'a'])
-                                        for button in buttons:
-                                            button_text = button.get_text().lower().strip()
-                                            if any(keyword in button_text for keyword in easy_apply_keywords):
-                                                is_actually_easy_apply = True
-                                                logger.info(f"🔍 Easy Apply detected via button text '{button_text}': {title}")
-                                                break
-                                    
-                                    # Method 3: Check for LinkedIn's Easy Apply button classes and attributes
-                                    if not is_actually_easy_apply and 'linkedin' in job_url.lower():
-                                        # Look for elements with Easy Apply related classes or attributes
-                                        easy_apply_elements = listing.find_all(attrs={
-                                            'class': lambda x: x and any(
-                                                'easy' in str(x).lower() or 'apply' in str(x).lower() or 'quick' in str(x).lower()
-                                                for x in (x if isinstance(x, list) else [x])
-                                            )
-                                        })
-                                        
-                                        if easy_apply_elements:
-                                            # Double-check that these elements contain Easy Apply text
-                                            for element in easy_apply_elements:
-                                                element_text = element.get_text().lower()
-                                                if any(keyword in element_text for keyword in easy_apply_keywords):
-                                                    is_actually_easy_apply = True
-                                                    logger.info(f"🔍 Easy Apply detected via LinkedIn element: {title}")
-                                                    break
-                                    
-                                    # Method 4: Check for specific LinkedIn Easy Apply patterns in the URL
-                                    if not is_actually_easy_apply and 'linkedin' in job_url.lower():
-                                        url_indicators = ['easy-apply', 'quick-apply', 'easyapply', 'quickapply']
-                                        if any(indicator in job_url.lower() for indicator in url_indicators):
-                                            is_actually_easy_apply = True
-                                            logger.info(f"🔍 Easy Apply detected via URL: {title}")
-                                    
-                                    # Determine final source - All LinkedIn jobs together
-                                    if company.lower() in ['lensa', 'dice']:
-                                        source = 'Staffing'
-                                        logger.info(f"👥 Staffing job detected: {title} at {company}")
-                                    else:
-                                        source = 'LinkedIn'
-                                        logger.info(f"💼 LinkedIn job: {title} at {company}")
+                                    if parsed['easy_apply_markup']:
+                                        logger.info(f"🔍 Easy Apply markers found in card markup: {title}")
+                                    # All remaining LinkedIn jobs together
+                                    source = 'LinkedIn'
+                                    logger.info(f"💼 LinkedIn job: {title} at {company}")
                                 
                                 job_data = {
                                     'title': title,
@@ -1641,13 +1375,16 @@ class CyberSecurityJobScraper:
                                     'experience_level': experience_level,
                                     'easy_apply': is_easy_apply
                                 }
-                                jobs.append(job_data)
+                                jobs.append(self._mark_seen(job_data, record))
                                 
                         except Exception as e:
                             logger.warning(f"Error parsing LinkedIn job: {e}")
                             continue
+                    
+                    if self.watermarks is not None:
+                        self.watermarks.update('LinkedIn', term, location, listing_keys)
                 
-                time.sleep(3)  # Longer delay for LinkedIn
+                emit_page(jobs[term_start:])
                 
         except Exception as e:
             logger.error(f"Error scraping LinkedIn: {e}")
@@ -1662,6 +1399,7 @@ class CyberSecurityJobScraper:
             base_url = "https://www.glassdoor.com/Job/jobs.htm"
             
             for page in range(max_pages):
+                page_start = len(jobs)
                 params = {
                     'sc.keyword': 'cybersecurity engineer',
                     'locT': 'N',
@@ -1677,29 +1415,21 @@ class CyberSecurityJobScraper:
                 response = self.session.get(base_url, params=params)
                 response.raise_for_status()
                 
-                soup = BeautifulSoup(response.content, 'html.parser')
-                
-                # Glassdoor structure - this may need adjustment based on current site structure
-                job_cards = soup.find_all('div', {'data-test': 'jobListing'})
+                parsed_cards = self.parser.parse('glassdoor', response.content, location,
+                                                 backend=self.config.html_backend)
                 
-                for card in job_cards:
+                for parsed in parsed_cards:
                     try:
-                        title_elem = card.find('div', {'data-test': 'job-title'})
-                        title = title_elem.get_text(strip=True) if title_elem else ""
+                        title = parsed['title']
+                        company = parsed['company']
                         
-                        company_elem = card.find('div', {'data-test': 'employer-name'})
-                        company = company_elem.get_text(strip=True) if company_elem else ""
-                        
-                        location_elem = card.find('div', {'data-test': 'job-location'})
-                        job_location = location_elem.get_text(strip=True) if location_elem else location
-                        
-                        if title and self.is_cybersecurity_job(title, ""):
+                        if self.is_cybersecurity_job(title, ""):
                             job_data = {
                                 'title': title,
                                 'company': company,
-                                'location': job_location,
+                                'location': parsed['location'],
                                 'description': f"Cybersecurity position at {company}. Click link for full details.",
-                                'url': f"https://www.glassdoor.com{card.find('a')['href']}" if card.find('a') else "",
+                                'url': parsed['url'],
                                 'source': 'Glassdoor',
                                 'scraped_at': datetime.now().isoformat(),
                                 'posted_date': datetime.now().isoformat()
@@ -1710,8 +1440,8 @@ class CyberSecurityJobScraper:
                         logger.warning(f"Error parsing Glassdoor job: {e}")
                         continue
                 
+                emit_page(jobs[page_start:])
                 logger.info(f"Scraped page {page + 1} from Glassdoor")
-                time.sleep(3)
                 
         except Exception as e:
             logger.error(f"Error scraping Glassdoor: {e}")
@@ -1749,6 +1479,7 @@ class CyberSecurityJobScraper:
         
         try:
             for page in range(max_pages):
+                page_start = len(jobs)
                 params = {
                     'search': 'cybersecurity OR "cyber security" OR "information security" OR "security engineer" OR "penetration tester"',
                     'location': location,
@@ -1759,51 +1490,31 @@ class CyberSecurityJobScraper:
                 if experience_level != "all" and experience_level in exp_mapping:
                     params['experience'] = exp_mapping[experience_level]
                 
-                response = self.session.get(base_url, params=params, timeout=10)
+                response = self.session.get(base_url, params=params)
                 response.raise_for_status()
                 
-                soup = BeautifulSoup(response.content, 'html.parser')
-                job_cards = soup.find_all('div', class_='job_content')
+                parsed_cards = self.parser.parse('ziprecruiter', response.content, location,
+                                                 backend=self.config.html_backend)
                 
-                if not job_cards:
+                if not parsed_cards:
                     break
                 
-                for card in job_cards:
+                for parsed in parsed_cards:
                     try:
-                        title_elem = card.find('a', class_='job_link')
-                        if not title_elem:
-                            continue
-                        
-                        title = title_elem.get_text(strip=True)
-                        url = "https://www.ziprecruiter.com" + title_elem.get('href', '')
-                        
-                        # Get company
-                        company_elem = card.find('a', class_='company_link')
-                        company = company_elem.get_text(strip=True) if company_elem else "Unknown"
-                        
-                        # Get location
-                        location_elem = card.find('div', class_='job_location')
-                        location_text = location_elem.get_text(strip=True) if location_elem else location
-                        
-                        # Get description
-                        desc_elem = card.find('div', class_='job_snippet')
-                        description = desc_elem.get_text(strip=True) if desc_elem else ""
-                        
-                        # Get posted date
-                        date_elem = card.find('div', class_='job_posted')
-                        posted_date = self._extract_date(date_elem) if date_elem else datetime.now().isoformat()
+                        title = parsed['title']
+                        description = parsed['description']
                         
                         # Check if it's a cybersecurity job
                         if self.is_cybersecurity_job(title, description):
                             job_data = {
                                 'title': title,
-                                'company': company,
-                                'location': location_text,
+                                'company': parsed['company'],
+                                'location': parsed['location'],
                                 'description': description,
-                                'url': url,
+                                'url': parsed['url'],
                                 'source': 'ZipRecruiter',
                                 'scraped_at': datetime.now().isoformat(),
-                                'posted_date': posted_date,
+                                'posted_date': parsed['posted_date'],
                                 'sponsored': False,
                                 'experience_level': experience_level if experience_level != "all" else ""
                             }
@@ -1813,8 +1524,8 @@ class CyberSecurityJobScraper:
                         logger.warning(f"Error parsing ZipRecruiter job card: {e}")
                         continue
                 
+                emit_page(jobs[page_start:])
                 logger.info(f"Scraped page {page + 1} from ZipRecruiter")
-                time.sleep(1)  # Be respectful
                 
         except Exception as e:
             logger.error(f"Error scraping ZipRecruiter: {e}")
@@ -1853,6 +1564,7 @@ class CyberSecurityJobScraper:
         
         try:
             for page in range(max_pages):
+                page_start = len(jobs)
                 params = {
                     'q': 'cybersecurity OR "cyber security" OR "information security" OR "security engineer" OR "penetration tester"',
                     'l': location,
@@ -1863,51 +1575,31 @@ class CyberSecurityJobScraper:
                 if experience_level != "all" and experience_level in exp_mapping:
                     params['experienceLevel'] = exp_mapping[experience_level]
                 
-                response = self.session.get(base_url, params=params, timeout=10)
+                response = self.session.get(base_url, params=params)
                 response.raise_for_status()
                 
-                soup = BeautifulSoup(response.content, 'html.parser')
-                job_cards = soup.find_all('div', class_='card')
+                parsed_cards = self.parser.parse('dice', response.content, location,
+                                                 backend=self.config.html_backend)
                 
-                if not job_cards:
+                if not parsed_cards:
                     break
                 
-                for card in job_cards:
+                for parsed in parsed_cards:
                     try:
-                        title_elem = card.find('a', class_='card-title-link')
-                        if not title_elem:
-                            continue
-                        
-                        title = title_elem.get_text(strip=True)
-                        url = title_elem.get('href', '')
-                        
-                        # Get company
-                        company_elem = card.find('a', class_='card-company')
-                        company = company_elem.get_text(strip=True) if company_elem else "Unknown"
-                        
-                        # Get location
-                        location_elem = card.find('span', class_='jobLocation')
-                        location_text = location_elem.get_text(strip=True) if location_elem else location
-                        
-                        # Get description
-                        desc_elem = card.find('div', class_='card-description')
-                        description = desc_elem.get_text(strip=True) if desc_elem else ""
-                        
-                        # Get posted date
-                        date_elem = card.find('span', class_='posted')
-                        posted_date = self._extract_date(date_elem) if date_elem else datetime.now().isoformat()
+                        title = parsed['title']
+                        description = parsed['description']
                         
                         # Check if it's a cybersecurity job
                         if self.is_cybersecurity_job(title, description):
                             job_data = {
                                 'title': title,
-                                'company': company,
-                                'location': location_text,
+                                'company': parsed['company'],
+                                'location': parsed['location'],
                                 'description': description,
-                                'url': url,
+                                'url': parsed['url'],
                                 'source': 'Dice',
                                 'scraped_at': datetime.now().isoformat(),
-                                'posted_date': posted_date,
+                                'posted_date': parsed['posted_date'],
                                 'sponsored': False,
                                 'experience_level': experience_level if experience_level != "all" else ""
                             }
@@ -1917,8 +1609,8 @@ class CyberSecurityJobScraper:
                         logger.warning(f"Error parsing Dice job card: {e}")
                         continue
                 
+                emit_page(jobs[page_start:])
                 logger.info(f"Scraped page {page + 1} from Dice")
-                time.sleep(1)  # Be respectful
                 
         except Exception as e:
             logger.error(f"Error scraping Dice: {e}")
@@ -1933,6 +1625,7 @@ class CyberSecurityJobScraper:
         
         try:
             for page in range(max_pages):
+                page_start = len(jobs)
                 params = {
                     'search': 'cybersecurity OR "cyber security" OR "information security" OR "security engineer" OR "penetration tester"',
                     'location': location,
@@ -1940,68 +1633,31 @@ class CyberSecurityJobScraper:
                     'sort': 'newest'
                 }
                 
-                response = self.session.get(base_url, params=params, timeout=10)
+                response = self.session.get(base_url, params=params)
                 response.raise_for_status()
                 
-                soup = BeautifulSoup(response.content, 'html.parser')
-                job_cards = soup.find_all('div', class_='job-listing') or soup.find_all('div', class_='job-card') or soup.find_all('article')
+                parsed_cards = self.parser.parse('wellfound', response.content, location,
+                                                 backend=self.config.html_backend)
                 
-                if not job_cards:
+                if not parsed_cards:
                     break
                 
-                for card in job_cards:
+                for parsed in parsed_cards:
                     try:
-                        # Try multiple selectors for title
-                        title_elem = (card.find('h3') or card.find('h2') or 
-                                    card.find('a', class_='job-title') or 
-                                    card.find('span', class_='job-title'))
-                        
-                        if not title_elem:
-                            continue
-                        
-                        title = title_elem.get_text(strip=True)
-                        
-                        # Try to find job URL
-                        job_url_elem = card.find('a', href=True)
-                        job_url = job_url_elem.get('href', '') if job_url_elem else ''
-                        if job_url and not job_url.startswith('http'):
-                            job_url = f"https://wellfound.com{job_url}"
-                        
-                        # Try multiple selectors for company
-                        company_elem = (card.find('div', class_='company') or 
-                                      card.find('span', class_='company-name') or
-                                      card.find('h4', class_='company'))
-                        company = company_elem.get_text(strip=True) if company_elem else "Unknown"
-                        
-                        # Try multiple selectors for location
-                        location_elem = (card.find('div', class_='location') or 
-                                       card.find('span', class_='location') or
-                                       card.find('div', class_='job-location'))
-                        job_location = location_elem.get_text(strip=True) if location_elem else location
-                        
-                        # Try to find description
-                        description_elem = (card.find('div', class_='description') or 
-                                          card.find('p', class_='job-description') or
-                                          card.find('div', class_='job-summary'))
-                        description = description_elem.get_text(strip=True) if description_elem else ""
-                        
-                        # Posted date
-                        posted_elem = (card.find('time') or 
-                                     card.find('span', class_='posted-date') or
-                                     card.find('div', class_='posted'))
-                        posted_date = self._extract_date(posted_elem) if posted_elem else datetime.now().isoformat()
+                        title = parsed['title']
+                        description = parsed['description']
                         
                         # Check if it's a cybersecurity job
                         if self.is_cybersecurity_job(title, description):
                             job_data = {
                                 'title': title,
-                                'company': company,
-                                'location': job_location,
+                                'company': parsed['company'],
+                                'location': parsed['location'],
                                 'description': description,
-                                'url': job_url,
+                                'url': parsed['url'],
                                 'source': 'Wellfound',
                                 'scraped_at': datetime.now().isoformat(),
-                                'posted_date': posted_date,
+                                'posted_date': parsed['posted_date'],
                                 'sponsored': False,
                                 'experience_level': experience_level if experience_level != "all" else ""
                             }
@@ -2011,8 +1667,8 @@ class CyberSecurityJobScraper:
                         logger.warning(f"Error parsing Wellfound job card: {e}")
                         continue
                 
+                emit_page(jobs[page_start:])
                 logger.info(f"Scraped page {page + 1} from Wellfound")
-                time.sleep(2)  # Be more respectful to startup site
                 
         except Exception as e:
             logger.error(f"Error scraping Wellfound: {e}")
@@ -2031,11 +1687,6 @@ class CyberSecurityJobScraper:
                 logger.warning("SERP_API_KEY not found. Using fallback method...")
                 return self._fallback_google_search(location, max_results, time_filter, experience_level, state, city)
             
-            # Check if GoogleSearch is available
-            if GoogleSearch is None:
-                logger.warning("GoogleSearch not available. Using fallback method...")
-                return self._fallback_google_search(location, max_results, time_filter, experience_level, state, city)
-            
             # Build location string
             location_str = location
             if state:
@@ -2092,8 +1743,7 @@ class CyberSecurityJobScraper:
                         "safe": "active"
                     }
                     
-                    search = GoogleSearch(search_params)
-                    results = search.get_dict()
+                    results = self._serp_search(search_params)
                     
                     # Extract organic results
                     organic_results = results.get("organic_results", [])
@@ -2115,9 +1765,6 @@ class CyberSecurityJobScraper:
                             logger.warning(f"Error processing search result: {e}")
                             continue
                     
-                    # Be respectful with rate limiting
-                    time.sleep(1)
-                    
                 except Exception as e:
                     logger.warning(f"Error processing dork query: {e}")
                     continue
@@ -2129,6 +1776,12 @@ class CyberSecurityJobScraper:
             logger.error(f"Error in Google dorks search: {e}")
             return self._fallback_google_search(location, max_results, time_filter, experience_level, state, city)
 
+    def _serp_search(self, search_params: Dict) -> Dict:
+        """Run a Google search through SERP API using the scraper session (rate limits, retries, cassettes)"""
+        response = self.session.get(SERP_API_URL, params={'engine': 'google', 'output': 'json', **search_params})
+        response.raise_for_status()
+        return response.json()
+
     def _fallback_google_search(self, location: str, max_results: int, time_filter: str, experience_level: str, state: str, city: str) -> List[Dict]:
         """Fallback method when SERP API is not available"""
         logger.info("Using fallback Google search method...")
@@ -2145,29 +1798,31 @@ class CyberSecurityJobScraper:
                 'Accept-Language': 'en-US,en;q=0.5',
             }
             
-            response = self.session.get(url, headers=headers, timeout=10)
+            response = self.session.get(url, headers=headers, cache=True)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = make_soup(response.content)
             
             # Try to extract company name from various sources
             company = "Unknown"
             company_selectors = [
                 'h1.company-name', '.company-name', '.employer-name', '.company',
                 'h2.company', '.job-company', '.company-title', '.employer',
-                '.job-header-company', '.company-info', '.employer-info'
+                '.job-header-company'
             ]
+            # Containers that hold more than the name; never promoted above the selectors
+            company_fallbacks = ['.company-info', '.employer-info']
             
-            for selector in company_selectors:
-                company_elem = soup.select_one(selector)
-                if company_elem:
-                    company = company_elem.get_text(strip=True)
-                    break
+            # Selector chains are tried best-first for this site
+            scope = urlparse(url).hostname or ''
+            company_elem = self.selectors.first_match(soup, scope, 'company', company_selectors,
+                                                      fallbacks=company_fallbacks)
+            if company_elem:
+                company = company_elem.get_text(strip=True)
             
             # If no company found, try to extract from URL
             if company == "Unknown":
                 try:
-                    from urllib.parse import urlparse
                     domain = urlparse(url).netloc
                     if domain:
                         company = domain.replace('www.', '').split('.')[0].title()
@@ -2177,30 +1832,32 @@ class CyberSecurityJobScraper:
             # Try to extract job location
             job_location = location
             location_selectors = [
-                '.location', '.job-location', '.workplace', '.place',
-                '.job-place', '.location-info', '.work-location',
-                '.job-details-location', '.position-location'
+                '.location', '.job-location', '.workplace', '.job-place',
+                '.work-location', '.job-details-location', '.position-location'
             ]
+            location_fallbacks = ['.place', '.location-info']
             
-            for selector in location_selectors:
-                location_elem = soup.select_one(selector)
-                if location_elem:
-                    job_location = location_elem.get_text(strip=True)
-                    break
+            location_elem = self.selectors.first_match(soup, scope, 'location', location_selectors,
+                                                       fallbacks=location_fallbacks)
+            if location_elem:
+                job_location = location_elem.get_text(strip=True)
             
             # Try to extract full job description
             full_description = description
             desc_selectors = [
-                '.job-description', '.description', '.job-content', '.job-details',
-                '.content', '.job-summary', '.requirements', '.responsibilities',
-                '.job-body', '.position-description', '.role-description'
+                '.job-description', '.description', '.job-body',
+                '.position-description', '.role-description'
+            ]
+            # Wrappers or single sections of the posting, tried in this order only after the above
+            desc_fallbacks = [
+                '.job-content', '.job-details', '.content', '.job-summary',
+                '.requirements', '.responsibilities'
             ]
             
-            for selector in desc_selectors:
-                desc_elem = soup.select_one(selector)
-                if desc_elem:
-                    full_description = desc_elem.get_text(strip=True)
-                    break
+            desc_elem = self.selectors.first_match(soup, scope, 'description', desc_selectors,
+                                                   fallbacks=desc_fallbacks)
+            if desc_elem:
+                full_description = desc_elem.get_text(strip=True)
             
             # Check if it's Easy Apply
             is_easy_apply = False
@@ -2260,22 +1917,6 @@ class CyberSecurityJobScraper:
             logger.warning(f"Error extracting job details from {url}: {e}")
             return None
 
-    def _extract_date(self, job_card) -> str:
-        """Extract posted date from job card"""
-        try:
-            date_elem = job_card.find('span', class_='date')
-            if date_elem:
-                date_text = date_elem.get_text(strip=True)
-                # Parse relative dates like "2 days ago"
-                if 'day' in date_text:
-                    days = int(re.search(r'(\d+)', date_text).group(1))
-                    return (datetime.now() - timedelta(days=days)).isoformat()
-                elif 'hour' in date_text:
-                    return datetime.now().isoformat()
-            return datetime.now().isoformat()
-        except Exception:
-            return datetime.now().isoformat()
-
     def scrape_all_sources(self, location: str = "United States", time_filter: str = "7", experience_level: str = "all", sources: List[str] = None, exclude_citizenship_required: bool = False, f1_student: bool = False, exclude_easy_apply: bool = True, keywords: str = "") -> List[Dict]:
         """Scrape jobs from all sources with advanced filtering and intelligent classification"""
         all_jobs = []
@@ -2287,60 +1928,23 @@ class CyberSecurityJobScraper:
         logger.info(f"Starting job scraping from {', '.join(sources)}...")
         logger.info(f"Filters: Easy Apply excluded={exclude_easy_apply}, Exclude Citizenship Required={exclude_citizenship_required}, F1 Student={f1_student}")
         
-        # Scrape from Indeed
-        if 'Indeed' in sources:
-            logger.info("🔍 Scraping Indeed...")
-            indeed_jobs = self.scrape_indeed(location, time_filter=time_filter, experience_level=experience_level)
-            logger.info(f"✅ Found {len(indeed_jobs)} jobs from Indeed")
-            all_jobs.extend(indeed_jobs)
-        
-        # Scrape from LinkedIn
-        if 'LinkedIn' in sources:
-            logger.info("🔍 Scraping LinkedIn...")
-            linkedin_jobs = self.scrape_linkedin_jobs(location, time_filter=time_filter, experience_level=experience_level, exclude_easy_apply=exclude_easy_apply)
-            logger.info(f"✅ Found {len(linkedin_jobs)} jobs from LinkedIn")
-            all_jobs.extend(linkedin_jobs)
-        
-        # Scrape from Glassdoor
-        if 'Glassdoor' in sources:
-            logger.info("🔍 Scraping Glassdoor...")
-            glassdoor_jobs = self.scrape_glassdoor(location)
-            logger.info(f"✅ Found {len(glassdoor_jobs)} jobs from Glassdoor")
-            all_jobs.extend(glassdoor_jobs)
-        
-        # Scrape from ZipRecruiter
-        if 'ZipRecruiter' in sources:
-            logger.info("🔍 Scraping ZipRecruiter...")
-            ziprecruiter_jobs = self.scrape_ziprecruiter(location, time_filter=time_filter, experience_level=experience_level)
-            logger.info(f"✅ Found {len(ziprecruiter_jobs)} jobs from ZipRecruiter")
-            all_jobs.extend(ziprecruiter_jobs)
-        
-        # Scrape from Dice
-        if 'Dice' in sources:
-            logger.info("🔍 Scraping Dice...")
-            dice_jobs = self.scrape_dice(location, time_filter=time_filter, experience_level=experience_level)
-            logger.info(f"✅ Found {len(dice_jobs)} jobs from Dice")
-            all_jobs.extend(dice_jobs)
-        
-        # Scrape from Wellfound
-        if 'Wellfound' in sources:
-            logger.info("🔍 Scraping Wellfound...")
-            wellfound_jobs = self.scrape_wellfound(location, time_filter=time_filter, experience_level=experience_level)
-            logger.info(f"✅ Found {len(wellfound_jobs)} jobs from Wellfound")
-            all_jobs.extend(wellfound_jobs)
-        
-        # Scrape from Google Dorks (ATS platforms and company career pages)
-        if 'Google Dorks' in sources:
-            logger.info("🔍 Scraping Google Dorks (ATS platforms)...")
-            dorks_jobs = self.scrape_google_dorks(location, time_filter=time_filter, experience_level=experience_level)
-            logger.info(f"✅ Found {len(dorks_jobs)} jobs from Google Dorks")
-            all_jobs.extend(dorks_jobs)
+        # Each selected source runs on its own worker; results are merged in source order
+        tasks = self._source_tasks(location, time_filter, experience_level, sources, exclude_easy_apply)
+        
+        for name, source_jobs in run_sources_parallel(tasks, max_workers=self.config.source_workers):
+            logger.info(f"✅ Found {len(source_jobs)} jobs from {name}")
+            all_jobs.extend(source_jobs)
         
         # Advanced deduplication with canonicalization and fuzzy matching
         logger.info(f"Total jobs scraped before deduplication: {len(all_jobs)}")
         all_jobs = self.remove_duplicates(all_jobs)
         logger.info(f"Total jobs after deduplication: {len(all_jobs)}")
         
+        # Flag postings returned on an earlier run (Indeed and LinkedIn cards were looked up while scraping)
+        if self.seen_jobs is not None:
+            all_jobs = self._mark_seen_jobs(all_jobs)
+            logger.info(f"Seen on an earlier run: {sum(1 for job in all_jobs if job['seen_before'])}")
+        
         # Apply intelligent citizenship and clearance classification
         all_jobs = self.filter_citizenship_clearance(all_jobs, exclude_citizenship_required=exclude_citizenship_required)
         
@@ -2350,8 +1954,74 @@ class CyberSecurityJobScraper:
             logger.info(f"Total jobs after F1 student filter: {len(all_jobs)}")
         
         logger.info(f"Final total jobs: {len(all_jobs)}")
+        self._remember_seen(all_jobs)
+        cache_stats = self.session.cache_stats()
+        if cache_stats:
+            logger.info(f"HTTP cache: {cache_stats}")
+        logger.info(f"Classification cache: {self.classifications.stats()}")
+        self.selectors.log_markup_changes()
+        self.selectors.save()
+        self.classifications.save()
         return all_jobs
 
+    def _source_tasks(self, location: str, time_filter: str, experience_level: str, sources: List[str], exclude_easy_apply: bool) -> List[Tuple[str, Callable[[], List[Dict]]]]:
+        """(source name, scrape callable) pairs for the selected sources"""
+        source_tasks = {
+            'Indeed': lambda: self.scrape_indeed(location, time_filter=time_filter, experience_level=experience_level),
+            'LinkedIn': lambda: self.scrape_linkedin_jobs(location, time_filter=time_filter, experience_level=experience_level, exclude_easy_apply=exclude_easy_apply),
+            'Glassdoor': lambda: self.scrape_glassdoor(location),
+            'ZipRecruiter': lambda: self.scrape_ziprecruiter(location, time_filter=time_filter, experience_level=experience_level),
+            'Dice': lambda: self.scrape_dice(location, time_filter=time_filter, experience_level=experience_level),
+            'Wellfound': lambda: self.scrape_wellfound(location, time_filter=time_filter, experience_level=experience_level),
+            # ATS platforms and company career pages
+            'Google Dorks': lambda: self.scrape_google_dorks(location, time_filter=time_filter, experience_level=experience_level),
+        }
+        tasks = [(name, task) for name, task in source_tasks.items() if name in sources]
+        for name, _ in tasks:
+            logger.info(f"🔍 Scraping {name}...")
+        return tasks
+
+    def iter_all_sources(self, location: str = "United States", time_filter: str = "7", experience_level: str = "all", sources: List[str] = None, exclude_citizenship_required: bool = False, f1_student: bool = False, exclude_easy_apply: bool = True, keywords: str = "") -> Iterator[Dict]:
+        """Streaming scrape_all_sources: yield deduplicated, classified jobs as each page is parsed.
+
+        Applies the same dedup, classification and filters, but page by page, so the
+        first jobs arrive while the other sources are still running. Duplicates are
+        checked against every job seen so far, which means the kept copy is the one
+        that arrived first rather than the one from the earliest source.
+        """
+        if sources is None:
+            sources = ['Indeed', 'LinkedIn', 'Glassdoor', 'ZipRecruiter', 'Dice', 'Wellfound', 'Google Dorks']
+        
+        logger.info(f"Streaming jobs from {', '.join(sources)}...")
+        tasks = self._source_tasks(location, time_filter, experience_level, sources, exclude_easy_apply)
+        deduplicator = OnlineDeduplicator(self._dedup_signature)
+        yielded = 0
+        
+        for name, page_jobs in stream_sources(tasks, max_workers=self.config.source_workers):
+            page_jobs = [job for job in page_jobs if deduplicator.add(job)]
+            if self.seen_jobs is not None:
+                page_jobs = self._mark_seen_jobs(page_jobs)
+            page_jobs = self.filter_citizenship_clearance(page_jobs, exclude_citizenship_required=exclude_citizenship_required)
+            page_jobs = self.filter_f1_student_friendly(page_jobs, f1_student=f1_student)
+            self._remember_seen(page_jobs)
+            for job in page_jobs:
+                yielded += 1
+                yield job
+        
+        logger.info(f"Streamed {yielded} jobs ({deduplicator.dropped} duplicates dropped)")
+        self.selectors.log_markup_changes()
+        self.selectors.save()
+        self.classifications.save()
+
+    def close(self):
+        """Release the scraper's parse workers, connections and files (a recording cassette included) once it is done"""
+        self.parser.close()
+        self.selectors.save()
+        self.classifications.close()
+        if self.seen_jobs is not None:
+            self.seen_jobs.close()
+        self.session.close()
+
     def save_to_csv(self, jobs: List[Dict], filename: str = None) -> str:
         """Save jobs to CSV file"""
         if not filename:
@@ -0,0 +1,189 @@
+"""
+Compiled keyword matching for job classification
+A keyword set is compiled once into a single trie-shaped regex (or an Aho-Corasick
+automaton when pyahocorasick is installed), so checking a posting is one linear
+scan of its lowercased text instead of one `in` test per keyword, and the scan
+can also report which keywords matched and where
+"""
+
+import re
+import string
+from functools import lru_cache
+from typing import Collection, Dict, Iterable, Iterator, List, Set, Tuple
+
+try:
+    import ahocorasick
+except ImportError:  # Optional: the regex scan gives identical results
+    ahocorasick = None
+
+from classification_cache import keyword_version
+
+# Characters that continue a word; a keyword only matches between non-word characters
+_WORD = 'a-z0-9'
+_WORD_CHARS = frozenset(string.ascii_lowercase + string.digits)
+_BEFORE = f'(?<![{_WORD}])'
+_PLURAL = '(?:e?s)?'
+_AFTER = f'(?![{_WORD}])'
+_WORD_END = re.compile(_PLURAL + _AFTER)
+
+
+def _span_order(span: Tuple[str, int, int]) -> Tuple[int, int]:
+    """Order spans like the regex scan finds them: by start, longest keyword first"""
+    return span[1], -len(span[0])
+
+
+def _trie_regex(terms: Iterable[str]) -> str:
+    """Regex alternation shaped like a trie of terms, preferring the longest term at each position"""
+    trie: Dict = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def emit(node: Dict) -> str:
+        is_end = '' in node
+        branches = [re.escape(char) + emit(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        # A term ending here makes the rest optional; greedy, so longer terms are tried first
+        return f'(?:{body})?' if is_end else body
+
+    return emit(trie)
+
+
+class KeywordMatcher:
+    """A fixed keyword set compiled for one-pass matching.
+
+    With word_boundaries (the default) a keyword matches only as whole words,
+    optionally pluralized ("engineer" matches "engineers" but "intern" does not
+    match "internal"). Without it, keywords match anywhere as plain substrings,
+    exactly like `keyword in text`. Texts are lowercased once per call; pass
+    lowered=True when the caller already did it.
+    """
+
+    def __init__(self, terms: Iterable[str], word_boundaries: bool = True, use_automaton: bool = True):
+        self.terms = list(dict.fromkeys(term.lower() for term in terms if term))
+        self.word_boundaries = word_boundaries
+        # Identifies the keyword set for cached results (see classification_cache)
+        self.version = keyword_version('keywords', word_boundaries, frozenset(self.terms))
+        before, after = (_BEFORE, _PLURAL + _AFTER) if word_boundaries else ('', '')
+        trie = _trie_regex(self.terms) if self.terms else '(?!)'
+        self._search = re.compile(f'{before}(?:{trie}){after}')
+        self._locate = re.compile(f'{before}({trie}){after}')
+        # Terms implied by a match of a longer term starting at the same position
+        self._closure = {term: self._prefix_terms(term) for term in self.terms}
+
+        # The automaton reports every substring occurrence in one C-level pass;
+        # word boundaries are then checked per occurrence with the same rules
+        self._automaton = None
+        if use_automaton and ahocorasick is not None and self.terms:
+            self._automaton = ahocorasick.Automaton()
+            for term in self.terms:
+                self._automaton.add_word(term, term)
+            self._automaton.make_automaton()
+
+    def _prefix_terms(self, term: str) -> List[str]:
+        implied = []
+        for other in self.terms:
+            if other == term or not term.startswith(other):
+                continue
+            if not self.word_boundaries or self._boundary_at(term, len(other)):
+                implied.append(other)
+        return implied
+
+    @property
+    def has_automaton(self) -> bool:
+        """True if texts are scanned with pyahocorasick rather than the regex"""
+        return self._automaton is not None
+
+    @property
+    def pattern(self) -> 're.Pattern':
+        """Compiled regex matching any keyword in lowercased text, e.g. for pandas str.contains"""
+        return self._search
+
+    @staticmethod
+    def _boundary_at(text: str, index: int) -> bool:
+        return _WORD_END.match(text, index) is not None
+
+    def matches(self, text: str, lowered: bool = False) -> bool:
+        """True if any keyword occurs in text"""
+        text = text if lowered else text.lower()
+        if self._automaton is not None:
+            return next(self._automaton_spans(text), None) is not None
+        return self._search.search(text) is not None
+
+    def _end_at(self, text: str, index: int) -> int:
+        if not self.word_boundaries:
+            return index
+        return _WORD_END.match(text, index).end()
+
+    def spans(self, text: str, lowered: bool = False) -> List[Tuple[str, int, int]]:
+        """(keyword, start, end) for every keyword occurrence, overlaps included, in order of start.
+
+        Offsets index the lowercased text; end includes a matched plural suffix.
+        """
+        text = text if lowered else text.lower()
+        if self._automaton is not None:
+            found = list(self._automaton_spans(text))
+            if len(found) > 1:
+                found.sort(key=_span_order)
+            return found
+        found = []
+        position = 0
+        while True:
+            # Resuming one character after each match start also finds overlapping keywords
+            match = self._locate.search(text, position)
+            if match is None:
+                return found
+            start, term = match.start(), match.group(1)
+            found.append((term, start, match.end()))
+            for implied in self._closure[term]:
+                found.append((implied, start, self._end_at(text, start + len(implied))))
+            position = start + 1
+
+    def _automaton_spans(self, text: str) -> Iterator[Tuple[str, int, int]]:
+        if not self.word_boundaries:
+            for last, term in self._automaton.iter(text):
+                yield term, last - len(term) + 1, last + 1
+            return
+        word_end = _WORD_END.match
+        for last, term in self._automaton.iter(text):
+            start = last - len(term) + 1
+            if start and text[start - 1] in _WORD_CHARS:
+                continue
+            end = word_end(text, last + 1)
+            if end is not None:
+                yield term, start, end.end()
+
+    def found(self, text: str, lowered: bool = False) -> Set[str]:
+        """The distinct keywords occurring in text; cheaper than spans() when positions don't matter"""
+        text = text if lowered else text.lower()
+        if self._automaton is not None:
+            return {term for term, _, _ in self._automaton_spans(text)}
+        return {term for term in self.terms if term in text and self._occurs(text, term)}
+
+    def _occurs(self, text: str, term: str) -> bool:
+        if not self.word_boundaries:
+            return True
+        start = text.find(term)
+        while start != -1:
+            if (not start or text[start - 1] not in _WORD_CHARS) and _WORD_END.match(text, start + len(term)):
+                return True
+            start = text.find(term, start + 1)
+        return False
+
+    def find(self, text: str, lowered: bool = False) -> List[str]:
+        """Every keyword occurring in text, in order of first occurrence"""
+        return list(dict.fromkeys(term for term, _, _ in self.spans(text, lowered)))
+
+
+@lru_cache(maxsize=64)
+def compile_keywords(terms: Collection[str], word_boundaries: bool = True) -> KeywordMatcher:
+    """Shared KeywordMatcher per distinct keyword collection (a tuple or frozenset, so it can be hashed).
+
+    Callers pass their current keyword lists on every call; a list that changes
+    simply compiles a new matcher.
+    """
+    return KeywordMatcher(terms, word_boundaries=word_boundaries)
@@ -0,0 +1,132 @@
+"""
+MinHash / LSH near-duplicate index for job postings
+Each posting is reduced to a short MinHash signature of its shingles (character
+4-grams of the title and company, word 3-grams of the description), and a
+locality-sensitive hash of signature bands finds the postings likely to exceed
+a Jaccard threshold without comparing against the whole history
+"""
+
+import logging
+import re
+import zlib
+from functools import lru_cache
+from typing import Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_TOKEN = re.compile(r'[a-z0-9]+')
+# Multiply-shift hashing works on 64-bit words; overflow is the point
+_SHIFT = np.uint64(32)
+# Keeps description shingles apart from title/company character grams
+_WORD_SHINGLE = np.uint64(1 << 63)
+# numpy < 2.0 only has the old name
+_trapezoid = getattr(np, 'trapezoid', None) or np.trapz
+
+
+def _false_rates(threshold: float, bands: int, rows: int) -> Tuple[float, float]:
+    """Probability mass of (false positive, false negative) candidates for a band layout"""
+    below = np.linspace(0, threshold, 101)
+    above = np.linspace(threshold, 1, 101)
+    candidate = lambda s: 1 - (1 - s ** rows) ** bands
+    return float(_trapezoid(candidate(below), below)), float(_trapezoid(1 - candidate(above), above))
+
+
+@lru_cache(maxsize=32)
+def band_layout(threshold: float, num_perm: int) -> Tuple[int, int]:
+    """(bands, rows per band) whose candidate curve best separates Jaccard similarities around threshold"""
+    best, best_error = (1, num_perm), float('inf')
+    for bands in range(1, num_perm + 1):
+        rows = num_perm // bands
+        false_positive, false_negative = _false_rates(threshold, bands, rows)
+        # Candidates are verified against the threshold, so extra ones only cost
+        # time while missed ones are duplicates kept; favor recall
+        error = 0.1 * false_positive + 0.9 * false_negative
+        if error < best_error:
+            best, best_error = (bands, rows), error
+    return best
+
+
+class MinHashIndex:
+    """Near-duplicate lookup by estimated Jaccard similarity of shingle sets.
+
+    candidates() returns the keys of indexed postings whose signature agrees
+    with the query's on at least threshold of its hash functions (the MinHash
+    estimate of Jaccard similarity); only postings sharing an LSH band bucket
+    are looked at, so a lookup costs a few dict probes instead of a scan.
+    Shingles are hashed with crc32, so signatures do not depend on Python's
+    per-process string hashing.
+    """
+
+    def __init__(self, threshold: float = 0.6, num_perm: int = 128, seed: int = 1):
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands, self.rows = band_layout(threshold, num_perm)
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, 2 ** 63, num_perm, dtype=np.uint64) | np.uint64(1)
+        self._b = rng.integers(0, 2 ** 63, num_perm, dtype=np.uint64)
+        self._buckets: List[Dict[bytes, List[int]]] = [{} for _ in range(self.bands)]
+        self._keys: List[Hashable] = []
+        self._signatures = np.empty((0, num_perm), dtype=np.uint32)
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @staticmethod
+    def shingles(text: str, description: str = '') -> np.ndarray:
+        """Distinct shingle hashes: character 4-grams of text, word 3-grams of description"""
+        hashes = []
+        text = ' '.join(_TOKEN.findall(text.lower()))
+        if text:
+            codes = np.frombuffer(text.encode('utf-8'), dtype=np.uint8).astype(np.uint64)
+            if len(codes) < 4:
+                codes = np.concatenate([codes, np.zeros(4 - len(codes), dtype=np.uint64)])
+            grams = codes[:-3] << np.uint64(24) | codes[1:-2] << np.uint64(16) | codes[2:-1] << np.uint64(8) | codes[3:]
+            hashes.append(grams)
+        words = np.array([zlib.crc32(word.encode('utf-8')) for word in _TOKEN.findall(description.lower())],
+                         dtype=np.uint64)
+        if len(words):
+            if len(words) >= 3:
+                words = (words[:-2] << np.uint64(21)) ^ (words[1:-1] << np.uint64(10)) ^ words[2:]
+            hashes.append(words | _WORD_SHINGLE)
+        if not hashes:
+            return np.empty(0, dtype=np.uint64)
+        return np.unique(np.concatenate(hashes))
+
+    def signature(self, text: str, description: str = '') -> Optional[np.ndarray]:
+        """MinHash signature of a posting, or None when it has nothing to shingle"""
+        shingles = self.shingles(text, description)
+        if not len(shingles):
+            return None
+        hashed = (self._a[:, None] * shingles[None, :] + self._b[:, None]) >> _SHIFT
+        return hashed.min(axis=1).astype(np.uint32)
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        return [signature[band * self.rows:(band + 1) * self.rows].tobytes() for band in range(self.bands)]
+
+    def candidates(self, signature: np.ndarray) -> List[Hashable]:
+        """Keys of indexed postings with estimated Jaccard similarity >= threshold, most similar first"""
+        found = set()
+        for buckets, band_key in zip(self._buckets, self._band_keys(signature)):
+            found.update(buckets.get(band_key, ()))
+        if not found:
+            return []
+        rows = np.fromiter(found, dtype=np.int64, count=len(found))
+        similarity = (self._signatures[rows] == signature).mean(axis=1)
+        order = np.argsort(-similarity, kind='stable')
+        return [self._keys[rows[i]] for i in order if similarity[i] >= self.threshold]
+
+    def add(self, key: Hashable, signature: np.ndarray):
+        """Index a posting's signature under key"""
+        row = self._size
+        if row == len(self._signatures):
+            grown = np.empty((max(1024, 2 * row), self.num_perm), dtype=np.uint32)
+            grown[:row] = self._signatures[:row]
+            self._signatures = grown
+        self._signatures[row] = signature
+        self._keys.append(key)
+        self._size += 1
+        for buckets, band_key in zip(self._buckets, self._band_keys(signature)):
+            buckets.setdefault(band_key, []).append(row)
@@ -0,0 +1,69 @@
+"""
+Process-pool parse stage for the job scrapers
+Raw response bytes and a page type go out to worker processes and plain job
+dicts come back, so HTML parsing scales across cores and stops competing for
+the GIL with fetch threads and the web server
+"""
+
+import multiprocessing
+import threading
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from job_parsers import (parse_dice_results, parse_glassdoor_results, parse_indeed_description,
+                         parse_indeed_results, parse_linkedin_results, parse_wellfound_results,
+                         parse_ziprecruiter_results)
+
+logger = logging.getLogger(__name__)
+
+# Page type -> picklable module-level parser taking the response body first
+PAGE_PARSERS: Dict[str, Callable[..., Any]] = {
+    'indeed': parse_indeed_results,
+    'indeed_detail': parse_indeed_description,
+    'linkedin': parse_linkedin_results,
+    'glassdoor': parse_glassdoor_results,
+    'ziprecruiter': parse_ziprecruiter_results,
+    'dice': parse_dice_results,
+    'wellfound': parse_wellfound_results,
+}
+
+
+def _run_parser(page_type: str, content: bytes, args: tuple, kwargs: dict):
+    return PAGE_PARSERS[page_type](content, *args, **kwargs)
+
+
+class ParseStage:
+    """Runs PAGE_PARSERS inline (workers=0) or on a shared process pool.
+
+    The pool is started on first use with the 'spawn' method, since forking a
+    process that already runs fetch threads can deadlock. parse() is safe to
+    call from any number of threads.
+    """
+
+    def __init__(self, workers: int = 0):
+        self.workers = max(0, workers)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context('spawn')
+                )
+                logger.info(f"Started parse pool with {self.workers} worker processes")
+            return self._executor
+
+    def parse(self, page_type: str, content: bytes, *args, **kwargs):
+        """PAGE_PARSERS[page_type](content, *args, **kwargs), in a worker process when enabled"""
+        if not self.workers:
+            return _run_parser(page_type, content, args, kwargs)
+        return self._pool().submit(_run_parser, page_type, content, args, kwargs).result()
+
+    def close(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
@@ -0,0 +1,90 @@
+"""
+Per-host rate limiting for the job scrapers
+Token buckets keyed by hostname so each job board sees a bounded request rate
+while requests to different boards proceed independently
+"""
+
+import threading
+import time
+import logging
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Thread-safe token bucket allowing `burst` requests at once and `rate` per second after that"""
+
+    def __init__(self, rate: float, burst: int = 1):
+        if rate <= 0:
+            raise ValueError(f"Rate must be positive, got {rate}")
+        self.rate = float(rate)
+        self.burst = max(1, int(burst))
+        self._tokens = float(self.burst)
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._last_refill) * self.rate)
+        self._last_refill = now
+
+    def try_acquire(self) -> float:
+        """Take a token if one is available; otherwise return the seconds to wait"""
+        with self._lock:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self) -> float:
+        """Block until a token is available and return the total time waited"""
+        waited = 0.0
+        while True:
+            wait = self.try_acquire()
+            if wait <= 0:
+                return waited
+            time.sleep(wait)
+            waited += wait
+
+
+class HostRateLimiter:
+    """Shared registry of token buckets, one per configured host.
+
+    host_rates maps a hostname suffix (e.g. 'indeed.com') to (requests per
+    second, burst). Any subdomain of a configured host shares its bucket;
+    unknown hosts get their own bucket at default_rate.
+    """
+
+    def __init__(self, host_rates: Optional[Dict[str, Tuple[float, int]]] = None,
+                 default_rate: Tuple[float, int] = (1.0, 2)):
+        self.host_rates = {host.lower(): rate for host, rate in (host_rates or {}).items()}
+        self.default_rate = default_rate
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def _bucket_key(self, host: str) -> Tuple[str, Tuple[float, int]]:
+        host = host.lower()
+        for configured_host, rate in self.host_rates.items():
+            if host == configured_host or host.endswith('.' + configured_host):
+                return configured_host, rate
+        return host, self.default_rate
+
+    def bucket_for(self, url_or_host: str) -> TokenBucket:
+        host = urlparse(url_or_host).hostname if '://' in url_or_host else url_or_host
+        key, (rate, burst) = self._bucket_key(host or '')
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = TokenBucket(rate, burst)
+                self._buckets[key] = bucket
+            return bucket
+
+    def acquire(self, url_or_host: str) -> float:
+        """Wait for the host's next request slot and return the time waited"""
+        waited = self.bucket_for(url_or_host).acquire()
+        if waited > 0:
+            logger.debug(f"Rate limited {url_or_host} for {waited:.2f}s")
+        return waited
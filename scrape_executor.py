@@ -0,0 +1,165 @@
+"""
+Concurrency helpers shared by the job scrapers
+Bounded thread pools for fetching job detail pages and running sources side by side
+"""
+
+import queue
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple, TypeVar
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+# Where emit_page() publishes pages for the source running on the current thread
+_page_sink = threading.local()
+
+
+class HostConcurrencyLimiter:
+    """Caps the number of in-flight requests per hostname"""
+
+    def __init__(self, per_host_limit: int = 4):
+        self.per_host_limit = max(1, per_host_limit)
+        self._semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    def _semaphore_for(self, url: str) -> threading.BoundedSemaphore:
+        host = (urlparse(url).hostname or '').lower()
+        with self._lock:
+            semaphore = self._semaphores.get(host)
+            if semaphore is None:
+                semaphore = threading.BoundedSemaphore(self.per_host_limit)
+                self._semaphores[host] = semaphore
+            return semaphore
+
+    @contextmanager
+    def slot(self, url: str):
+        """Hold one of the host's request slots for the duration of the block"""
+        semaphore = self._semaphore_for(url)
+        semaphore.acquire()
+        try:
+            yield
+        finally:
+            semaphore.release()
+
+
+def fetch_concurrently(fetch: Callable[[str], T],
+                       urls: Sequence[str],
+                       max_workers: int = 8,
+                       limiter: Optional[HostConcurrencyLimiter] = None) -> List[Optional[T]]:
+    """Run fetch(url) for every URL on a bounded thread pool.
+
+    Results are returned in the same order as urls. Empty URLs and fetches
+    that raise are reported as None so a single bad page never drops the batch.
+    """
+    limiter = limiter or HostConcurrencyLimiter()
+
+    def run(url: str) -> Optional[T]:
+        if not url:
+            return None
+        try:
+            with limiter.slot(url):
+                return fetch(url)
+        except Exception as e:
+            logger.warning(f"Error fetching {url}: {e}")
+            return None
+
+    if not urls:
+        return []
+
+    workers = max(1, min(max_workers, len(urls)))
+    if workers == 1:
+        return [run(url) for url in urls]
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(run, urls))
+
+
+def run_sources_parallel(tasks: Sequence[Tuple[str, Callable[[], List[T]]]],
+                         max_workers: int = 7) -> List[Tuple[str, List[T]]]:
+    """Run every source scraper on its own worker thread.
+
+    Each task is a (source name, zero-argument callable) pair. Results come back
+    as (source name, jobs) pairs in the order the tasks were given, no matter
+    which source finishes first. A source that raises contributes no jobs.
+    """
+    if not tasks:
+        return []
+
+    workers = max(1, min(max_workers, len(tasks)))
+    results = []
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='source') as executor:
+        futures = [(name, executor.submit(task)) for name, task in tasks]
+        for name, future in futures:
+            try:
+                jobs = future.result() or []
+            except Exception as e:
+                logger.error(f"Error scraping {name}: {e}")
+                jobs = []
+            results.append((name, jobs))
+    return results
+
+
+def emit_page(jobs: Sequence[T]):
+    """Publish a freshly parsed page of jobs to the stream_sources consumer.
+
+    Scrapers call this once per results page. Outside stream_sources (e.g. under
+    run_sources_parallel) it does nothing.
+    """
+    sink = getattr(_page_sink, 'sink', None)
+    if sink is not None and jobs:
+        sink(list(jobs))
+
+
+def stream_sources(tasks: Sequence[Tuple[str, Callable[[], List[T]]]],
+                   max_workers: int = 7) -> Iterator[Tuple[str, List[T]]]:
+    """Run every source scraper on its own worker thread and yield pages as they land.
+
+    Yields (source name, jobs) batches in arrival order: one per emit_page() call,
+    plus a final batch with whatever a source returned without emitting (sources
+    that never call emit_page therefore show up once, when they finish). A source
+    that raises is logged and simply stops contributing.
+    """
+    if not tasks:
+        return
+
+    pages: queue.Queue = queue.Queue()
+    finished = object()
+
+    def run(name: str, task: Callable[[], List[T]]):
+        emitted = set()
+
+        def sink(jobs: List[T]):
+            emitted.update(id(job) for job in jobs)
+            pages.put((name, jobs))
+
+        _page_sink.sink = sink
+        try:
+            remaining = [job for job in (task() or []) if id(job) not in emitted]
+            if remaining:
+                pages.put((name, remaining))
+        except Exception as e:
+            logger.error(f"Error scraping {name}: {e}")
+        finally:
+            _page_sink.sink = None
+            pages.put((name, finished))
+
+    workers = max(1, min(max_workers, len(tasks)))
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='source')
+    try:
+        for name, task in tasks:
+            executor.submit(run, name, task)
+        pending = len(tasks)
+        while pending:
+            name, jobs = pages.get()
+            if jobs is finished:
+                pending -= 1
+                continue
+            yield name, jobs
+    finally:
+        # A consumer that stops early doesn't wait for the remaining sources
+        executor.shutdown(wait=False)
@@ -0,0 +1,128 @@
+"""
+Persistent record of postings shown on earlier runs
+Each posting is remembered under its canonical URL and its (canonical title,
+canonical company) fingerprint with first-seen/last-seen times and the details
+worth keeping (description, classification), so a later run can look a whole
+results page up in one query, skip what it already knows and mark it seen before
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import logging
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class SeenJob(NamedTuple):
+    """What an earlier run recorded about a posting; times are Unix timestamps"""
+    first_seen: float
+    last_seen: float
+    details: Dict
+
+
+def posting_fingerprints(canonical_url: str, canonical_title: str, canonical_company: str) -> Tuple[str, ...]:
+    """Keys a posting is remembered under: its URL, and its title + company when both are known"""
+    fingerprints = []
+    if canonical_url:
+        fingerprints.append(f"url:{canonical_url}")
+    if canonical_title and canonical_company:
+        fingerprints.append(f"job:{canonical_title}|{canonical_company}")
+    return tuple(fingerprints)
+
+
+class SeenJobStore:
+    """SQLite-backed seen postings of one scope, forgetting those not seen for max_age_days.
+
+    Scrapers sharing a file keep apart under their own scope, since what one
+    found relevant and how it classified it means nothing to another. A posting
+    matches a record when any of its fingerprints does, so a repost under a new
+    URL is still recognized by title and company (and vice versa); its
+    first_seen is the earliest of its fingerprints'.
+    """
+
+    def __init__(self, path: str, scope: str = '', max_age_days: float = 90):
+        self.path = path
+        self.scope = scope
+        self.max_age_days = max_age_days
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS seen_jobs (
+                scope TEXT NOT NULL,
+                fingerprint TEXT NOT NULL,
+                first_seen REAL NOT NULL,
+                last_seen REAL NOT NULL,
+                details TEXT NOT NULL,
+                PRIMARY KEY (scope, fingerprint)
+            )
+        ''')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS seen_jobs_last_seen ON seen_jobs (last_seen)')
+        self._conn.commit()
+
+    def _rows(self, fingerprints: Iterable[str]) -> Dict[str, Tuple[float, float, str]]:
+        fingerprints = list(set(fingerprints))
+        found = {}
+        # Stay well under SQLite's bound-parameter limit
+        for start in range(0, len(fingerprints), 500):
+            chunk = fingerprints[start:start + 500]
+            placeholders = ','.join('?' * len(chunk))
+            rows = self._conn.execute(
+                f'SELECT fingerprint, first_seen, last_seen, details FROM seen_jobs '
+                f'WHERE scope = ? AND fingerprint IN ({placeholders})',
+                (self.scope, *chunk)
+            ).fetchall()
+            found.update((row[0], row[1:]) for row in rows)
+        return found
+
+    def lookup(self, postings: Sequence[Sequence[str]]) -> List[Optional[SeenJob]]:
+        """Earlier record of each posting (given as its fingerprints), or None for new ones"""
+        with self._lock:
+            rows = self._rows(fingerprint for fingerprints in postings for fingerprint in fingerprints)
+        seen = []
+        for fingerprints in postings:
+            matches = [rows[fingerprint] for fingerprint in fingerprints if fingerprint in rows]
+            if not matches:
+                seen.append(None)
+                continue
+            # The most recently recorded details are the freshest
+            latest = max(matches, key=lambda row: row[1])
+            seen.append(SeenJob(min(row[0] for row in matches), latest[1], json.loads(latest[2])))
+        return seen
+
+    def record(self, postings: Iterable[Tuple[Sequence[str], Dict]], seen_at: Optional[float] = None):
+        """Record (fingerprints, details) postings as seen at seen_at (now) and forget those unseen for max_age_days"""
+        postings = [(tuple(fingerprints), details) for fingerprints, details in postings if fingerprints]
+        if not postings:
+            return
+        now = time.time() if seen_at is None else seen_at
+        with self._lock:
+            rows = self._rows(fingerprint for fingerprints, _ in postings for fingerprint in fingerprints)
+            updates = []
+            for fingerprints, details in postings:
+                first_seen = min([rows[fingerprint][0] for fingerprint in fingerprints if fingerprint in rows],
+                                 default=now)
+                serialized = json.dumps(details, default=str)
+                updates.extend((self.scope, fingerprint, first_seen, now, serialized) for fingerprint in fingerprints)
+            self._conn.executemany('INSERT OR REPLACE INTO seen_jobs VALUES (?, ?, ?, ?, ?)', updates)
+            self._conn.execute('DELETE FROM seen_jobs WHERE scope = ? AND last_seen < ?',
+                               (self.scope, now - self.max_age_days * 86400))
+            self._conn.commit()
+
+    def reset(self):
+        """Forget every posting of this scope"""
+        with self._lock:
+            self._conn.execute('DELETE FROM seen_jobs WHERE scope = ?', (self.scope,))
+            self._conn.commit()
+
+    def close(self):
+        """Release the SQLite connection; every record is already committed"""
+        with self._lock:
+            self._conn.close()
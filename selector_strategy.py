@@ -0,0 +1,130 @@
+"""
+Adaptive CSS selector ordering
+Remembers which selector in a fallback chain actually matched for each
+source/domain and field, tries the usual winner first next time, and keeps the
+counts on disk so the ordering (and the hit-rate history) survives restarts
+"""
+
+import json
+import os
+import threading
+import logging
+from typing import Callable, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+# Counter for lookups where no selector in the chain matched
+MISS = '__miss__'
+
+
+class SelectorStrategy:
+    """Per (scope, field) hit counts for selector chains.
+
+    scope is a source name or domain ('indeed.com', 'boards.greenhouse.io'),
+    field the thing being extracted ('company', 'location', ...). order()
+    returns a chain sorted by past hits, keeping the original priority between
+    selectors with equal counts, so an unseen domain behaves exactly like the
+    fixed chain did.
+
+    Only selectors that find the same element belong in a reordered chain.
+    Generic ones that can also match something else ('span[title]' is a job
+    title as often as a company) go in fallbacks, which are always tried
+    afterwards in their given order: promoted by a run of cards without the
+    specific markup, they would shadow it on every later card.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_lookups: int = 1000):
+        self.path = path
+        self.max_lookups = max_lookups
+        self._lock = threading.Lock()
+        self._hits: Dict[str, Dict[str, Dict[str, int]]] = {}
+        self._dirty = False
+        if path:
+            self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self._hits = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable selector stats {self.path}: {e}")
+            self._hits = {}
+
+    def order(self, scope: str, field: str, selectors: Sequence[str],
+              fallbacks: Sequence[str] = ()) -> List[str]:
+        """selectors best-first for this scope and field, then fallbacks in their fixed order"""
+        with self._lock:
+            counts = self._hits.get(scope, {}).get(field)
+            if not counts:
+                return list(selectors) + list(fallbacks)
+            return sorted(selectors, key=lambda selector: -counts.get(selector, 0)) + list(fallbacks)
+
+    def record(self, scope: str, field: str, selector: Optional[str]):
+        """Count a lookup; selector None means nothing in the chain matched"""
+        with self._lock:
+            counts = self._hits.setdefault(scope, {}).setdefault(field, {})
+            key = selector or MISS
+            counts[key] = counts.get(key, 0) + 1
+            # Age old counts so a redesign is reflected within a few hundred lookups
+            if sum(counts.values()) > self.max_lookups:
+                for name in list(counts):
+                    counts[name] //= 2
+                    if not counts[name]:
+                        del counts[name]
+            self._dirty = True
+
+    def first_match(self, root, scope: str, field: str, selectors: Sequence[str],
+                    accept: Optional[Callable] = None, fallbacks: Sequence[str] = ()):
+        """First element matched by the chain (best selector first), recording which selector won.
+
+        root is anything with select_one(css): a BeautifulSoup tag or an html_parsing.Node.
+        accept can reject a match (e.g. empty text) so the next selector is tried.
+        """
+        for selector in self.order(scope, field, selectors, fallbacks):
+            element = root.select_one(selector)
+            if element is not None and (accept is None or accept(element)):
+                self.record(scope, field, selector)
+                return element
+        self.record(scope, field, None)
+        return None
+
+    def hit_rates(self, scope: str = None) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """Share of lookups won by each selector (and missed), per scope and field"""
+        with self._lock:
+            scopes = {scope: self._hits.get(scope, {})} if scope else self._hits
+            rates = {}
+            for scope_name, fields in scopes.items():
+                for field, counts in fields.items():
+                    total = sum(counts.values())
+                    rates.setdefault(scope_name, {})[field] = {
+                        selector: round(count / total, 3) for selector, count in counts.items()
+                    }
+            return rates
+
+    def log_markup_changes(self, min_lookups: int = 20, max_miss_rate: float = 0.5):
+        """Warn about fields whose chains mostly miss, which usually means the site's markup changed"""
+        with self._lock:
+            for scope, fields in self._hits.items():
+                for field, counts in fields.items():
+                    total = sum(counts.values())
+                    if total >= min_lookups and counts.get(MISS, 0) / total > max_miss_rate:
+                        logger.warning(f"⚠️ {scope} {field}: {counts[MISS]}/{total} lookups matched no selector "
+                                       f"- markup may have changed")
+
+    def save(self):
+        """Write the counts to path, if they changed; the scrapers call this when a scrape ends"""
+        if not self.path:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._hits, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.path)
+            self._dirty = False
@@ -0,0 +1,100 @@
+"""
+Tests for recording HTTP traffic to a cassette and replaying it offline
+"""
+
+import gzip
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+import requests
+
+from cassette import scrub_url
+from http_session import ScraperSession
+from job_scraper import CyberSecurityJobScraper
+from unified_scraper import ScrapingConfig
+
+
+class CountingHandler(BaseHTTPRequestHandler):
+    """Answers every GET with its path and how many requests came before it"""
+    served = 0
+
+    def do_GET(self):
+        type(self).served += 1
+        body = f"{self.path} #{self.served}".encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    CountingHandler.served = 0
+    httpd = HTTPServer(('127.0.0.1', 0), CountingHandler)
+    thread = threading.Thread(target=httpd.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_port}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _session(tmp_path, mode: str) -> ScraperSession:
+    config = ScrapingConfig(state_dir=str(tmp_path), cassette_mode=mode, host_rates={},
+                            default_rate=(1000.0, 100))
+    return ScraperSession(config)
+
+
+def test_scrub_url_drops_only_secrets():
+    assert scrub_url('https://serpapi.com/search?q=soc+analyst&api_key=s3cret&Token=t') == \
+        'https://serpapi.com/search?q=soc+analyst'
+    assert scrub_url('https://www.indeed.com/jobs') == 'https://www.indeed.com/jobs'
+
+
+def test_record_then_replay_round_trip(server, tmp_path):
+    recorder = _session(tmp_path, 'record')
+    first = recorder.get(f"{server}/search", params={'q': 'python', 'api_key': 's3cret'})
+    second = recorder.get(f"{server}/search", params={'q': 'python', 'api_key': 's3cret'})
+    recorder.get(f"{server}/viewjob?jk=1")
+    recorder.close()
+    assert (first.text, second.text) == ('/search?q=python&api_key=s3cret #1', '/search?q=python&api_key=s3cret #2')
+
+    # The server echoes the key back in the body; only the request side must not keep it
+    with gzip.open(tmp_path / 'cassette.jsonl.gz', 'rt', encoding='utf-8') as f:
+        entries = [json.loads(line) for line in f]
+    assert [entry['url'] for entry in entries] == [f"{server}/search?q=python"] * 2 + [f"{server}/viewjob?jk=1"]
+
+    # Replay matches without the key (whatever its value) and never touches the network
+    player = _session(tmp_path, 'replay')
+    replayed = [player.get(f"{server}/search", params={'q': 'python', 'api_key': 'other'}) for _ in range(3)]
+    assert [response.text for response in replayed] == [first.text, second.text, second.text]
+    assert all(response.from_cassette for response in replayed)
+    assert player.get(f"{server}/viewjob?jk=1").headers['Content-Type'] == 'text/plain; charset=utf-8'
+    assert CountingHandler.served == 3
+
+    with pytest.raises(requests.ConnectionError):
+        player.get(f"{server}/viewjob?jk=2")
+    assert (player.cassette.replayed, player.cassette.missed) == (4, 1)
+    player.close()
+
+
+def test_replay_needs_a_recording(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        _session(tmp_path, 'replay')
+
+
+def test_scraper_close_finishes_the_recording(tmp_path):
+    config = ScrapingConfig(state_dir=str(tmp_path), cassette_mode='record', cassette_path=str(tmp_path / 'run.gz'))
+    scraper = CyberSecurityJobScraper(config)
+    request = requests.Request('GET', 'https://www.dice.com/jobs?q=soc').prepare()
+    response = requests.Response()
+    response.status_code, response._content = 200, b'<html></html>'
+    scraper.session.cassette.record(request, response)
+    scraper.close()
+    with gzip.open(tmp_path / 'run.gz', 'rt', encoding='utf-8') as f:
+        assert [json.loads(line)['url'] for line in f] == ['https://www.dice.com/jobs?q=soc']
@@ -0,0 +1,67 @@
+"""
+Regression tests for memoized classification
+"""
+
+import gc
+import weakref
+
+from citizenship import CitizenshipClassifier
+from classification_cache import ClassificationCache
+from job_scraper import CyberSecurityJobScraper
+from unified_scraper import ScrapingConfig
+
+SPLIT_PHRASE = 'Applicants must be a US\ncitizen and able to obtain a security\nclearance.'
+
+
+def test_cached_results_match_direct_classification():
+    direct = CitizenshipClassifier()
+    cache = ClassificationCache()
+    cached = CitizenshipClassifier(cache=cache)
+
+    # The single-spaced variant is classified first; it must not answer for the split one
+    single_spaced = ' '.join(SPLIT_PHRASE.split())
+    assert cached.classify(single_spaced) == direct.classify(single_spaced)
+    assert cached.classify(SPLIT_PHRASE) == direct.classify(SPLIT_PHRASE)
+    assert cached.classify(SPLIT_PHRASE) == direct.classify(SPLIT_PHRASE)
+    assert cache.hits == 1
+    assert cache.misses == 2
+
+
+def _classify(cache: ClassificationCache, text: str, computed: list):
+    return cache.get_or_compute('v1', text, lambda normalized: computed.append(normalized) or len(normalized))
+
+
+def test_close_persists_results_for_the_next_run(tmp_path):
+    path = str(tmp_path / 'classifications.sqlite')
+    computed = []
+    cache = ClassificationCache(path=path)
+    assert _classify(cache, 'Security Engineer', computed) == 17
+    cache.close()
+    # Still answers from memory once closed
+    assert _classify(cache, 'Security Engineer', computed) == 17
+
+    again = ClassificationCache(path=path)
+    assert _classify(again, 'security engineer', computed) == 17
+    assert computed == ['security engineer']
+    assert (again.hits, again.misses) == (1, 0)
+    again.close()
+
+
+def test_scraper_close_saves_classifications(tmp_path):
+    config = ScrapingConfig(state_dir=str(tmp_path), persist_classifications=True)
+    scraper = CyberSecurityJobScraper(config)
+    scraper.classify_citizenship_clearance('US citizens only')
+    scraper.close()
+    restarted = CyberSecurityJobScraper(config)
+    restarted.classify_citizenship_clearance('US citizens only')
+    assert restarted.classifications.stats()['hits'] == 1
+    restarted.close()
+
+
+def test_caches_are_not_kept_alive_until_exit(tmp_path):
+    # A web server builds a scraper (and cache) per scrape; they must go with it
+    cache = ClassificationCache(path=str(tmp_path / 'classifications.sqlite'))
+    ref = weakref.ref(cache)
+    del cache
+    gc.collect()
+    assert ref() is None
@@ -0,0 +1,94 @@
+"""
+Tests for incremental crawling with per-search watermarks
+"""
+
+import requests
+
+from crawl_state import WatermarkStore
+from job_scraper import SoftwareEngineeringJobScraper
+from unified_scraper import ScrapingConfig
+
+CARD = '''
+<div class="job_seen_beacon">
+  <h2 class="jobTitle"><a href="/viewjob?jk={jk}"><span title="Software Engineer">Software Engineer</span></a></h2>
+  <span data-testid="company-name">Company {jk}</span>
+  <div class="companyLocation">Remote</div>
+</div>
+'''
+
+
+def _page(*jks: int) -> bytes:
+    return ('<html><body>' + ''.join(CARD.format(jk=jk) for jk in jks) + '</body></html>').encode()
+
+
+class StubIndeed:
+    """Serves results pages by offset and counts results and detail requests"""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.offsets = []
+        self.details = []
+
+    def get(self, url, params=None, **kwargs):
+        self.offsets.append(params['start'])
+        response = requests.Response()
+        response.status_code = 200
+        response._content = self.pages.get(params['start'], _page())
+        return response
+
+    def describe(self, job_url: str) -> str:
+        self.details.append(job_url.rsplit('=', 1)[1])
+        return 'Python software engineer building backend services'
+
+
+def _scrape(tmp_path, pages):
+    scraper = SoftwareEngineeringJobScraper(ScrapingConfig(state_dir=str(tmp_path), incremental=True,
+                                                           http_cache=False))
+    indeed = StubIndeed(pages)
+    scraper.session.get = indeed.get
+    scraper._fetch_indeed_description = indeed.describe
+    jobs = scraper.scrape_indeed(max_pages=3)
+    scraper.close()
+    return jobs, indeed
+
+
+def test_known_and_update_are_per_search(tmp_path):
+    store = WatermarkStore(str(tmp_path / 'watermarks.sqlite'))
+    store.update('Indeed', 'python', 'Remote', ['a', 'b', ''])
+    assert store.known('Indeed', 'python', 'Remote', ['a', 'b', 'c']) == {'a', 'b'}
+    assert store.known('Indeed', 'python', 'Austin', ['a']) == set()
+    assert store.known('LinkedIn', 'python', 'Remote', ['a']) == set()
+    assert store.known('Indeed', 'python', 'Remote', []) == set()
+
+    store.reset('LinkedIn')
+    assert store.known('Indeed', 'python', 'Remote', ['a']) == {'a'}
+    store.reset()
+    assert store.known('Indeed', 'python', 'Remote', ['a']) == set()
+
+
+def test_only_the_newest_keys_are_kept(tmp_path, monkeypatch):
+    clock = iter(range(1000, 2000))
+    monkeypatch.setattr('crawl_state.time.time', lambda: next(clock))
+    store = WatermarkStore(str(tmp_path / 'watermarks.sqlite'), max_keys=3)
+    for key in 'abcde':
+        store.update('Indeed', 'python', 'Remote', [key])
+    assert store.known('Indeed', 'python', 'Remote', 'abcde') == {'c', 'd', 'e'}
+
+
+def test_repeat_runs_skip_known_postings_and_stop_paginating(tmp_path):
+    jobs, indeed = _scrape(tmp_path, {0: _page(1, 2, 3), 10: _page(4, 5)})
+    assert [job['company'] for job in jobs] == [f"Company {jk}" for jk in range(1, 6)]
+    assert indeed.offsets == [0, 10, 20]
+    assert sorted(indeed.details) == ['1', '2', '3', '4', '5']
+
+    # One new posting on top: only it is fetched, and the next page (all known) ends the crawl
+    jobs, indeed = _scrape(tmp_path, {0: _page(0, 1, 2), 10: _page(3, 4, 5)})
+    assert [job['company'] for job in jobs] == ['Company 0']
+    assert indeed.offsets == [0, 10]
+    assert indeed.details == ['0']
+
+    # Nothing new: a single results request
+    jobs, indeed = _scrape(tmp_path, {0: _page(0, 1, 2), 10: _page(3, 4, 5)})
+    assert jobs == []
+    assert indeed.offsets == [0]
+    assert indeed.details == []
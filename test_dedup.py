@@ -0,0 +1,163 @@
+"""
+Tests for the deduplication engines
+"""
+
+import random
+import sys
+
+import pytest
+from rapidfuzz import fuzz
+
+import cli
+import dedup
+from dedup import OnlineDeduplicator, Signature, batch_deduplicate, deduplicate, leading_words_block, title_block
+from job_scraper import SoftwareEngineeringJobScraper
+from unified_scraper import ScrapingConfig
+
+
+def _job(title: str, company: str, url: str = '', **fields) -> dict:
+    return dict(title=title, company=company, url=url, location='Remote', source='Indeed', **fields)
+
+
+def _listings(count: int, seed: int = 7) -> list:
+    """Postings at a few employers, a third of them reposted with a reworded title or company"""
+    rng = random.Random(seed)
+    words = ['Security', 'Software', 'Cloud', 'Engineer', 'Analyst', 'Senior', 'Platform', 'SOC', 'Developer']
+    companies = ['Initech', 'Globex Corporation', 'Hooli', 'Umbrella Labs', 'Wayne Enterprises']
+    jobs = []
+    for index in range(count):
+        if jobs and rng.random() < 0.35:
+            original = rng.choice(jobs)
+            title = rng.choice([original['title'] + ' (Remote)', 'Sr. ' + original['title'], original['title']])
+            company = rng.choice([original['company'], original['company'] + ', Inc.'])
+        else:
+            title, company = ' '.join(rng.choices(words, k=rng.randint(2, 4))), rng.choice(companies)
+        jobs.append(_job(title, company, f"https://jobs.example.com/{index}"))
+    return jobs
+
+
+@pytest.fixture
+def scraper(tmp_path):
+    scraper = SoftwareEngineeringJobScraper(ScrapingConfig(state_dir=str(tmp_path), http_cache=False))
+    yield scraper
+    scraper.close()
+
+
+def test_subset_titles_at_a_longer_company_name_are_compared(scraper):
+    # token_set_ratio is 100 here, though neither the company keys nor the title tokens are equal
+    jobs = [_job('Software Engineer, Backend', 'Meta Platforms'), _job('Software Engineer', 'Meta')]
+    assert fuzz.token_set_ratio('software engineer backend meta platforms', 'software engineer meta') == 100
+    assert scraper.remove_duplicates(jobs) == jobs[:1]
+
+
+def test_blocks_of_a_signature():
+    assert leading_words_block('software engineer backend', 'meta platforms') == \
+        leading_words_block('software engineer', 'meta') == ('leading', 'software', 'meta')
+    assert leading_words_block('', '') == ('leading', '', '')
+    assert title_block('engineer software') == title_block('software  engineer software')
+
+
+def test_same_canonical_url_is_a_duplicate(scraper):
+    jobs = [
+        _job('Backend Developer', 'Initech', 'https://jobs.example.com/42?utm_source=feed'),
+        _job('Platform Engineer', 'Initech Labs', 'https://jobs.example.com/42?utm_campaign=spring'),
+        _job('Platform Engineer', 'Globex', 'https://jobs.example.com/43'),
+    ]
+    assert scraper.remove_duplicates(jobs) == [jobs[0], jobs[2]]
+
+
+def test_fuzzy_texts_are_compared_as_given():
+    # rapidfuzz 2.x extractOne lowercases and strips punctuation unless processor=None
+    signature = lambda job: Signature(job['title'], job['title'])
+    jobs = [{'title': 'SOC Analyst!!'}, {'title': 'soc analyst'}, {'title': 'SOC Analyst!!'}]
+    assert deduplicate(jobs, signature, scorer=fuzz.ratio, threshold=95) == jobs[:2]
+    deduplicator = OnlineDeduplicator(signature, scorer=fuzz.ratio, threshold=95)
+    assert [deduplicator.add(job) for job in jobs] == [True, True, False]
+
+
+def test_blocking_matches_all_pairs_within_blocks():
+    # Jobs with no blocks are compared against every kept job, like the loops blocking replaced
+    titles = ['Security Engineer', 'Security Engineer II', 'Engineer Security', 'SOC Analyst', 'SOC Analyst Tier 2',
+              'Penetration Tester', 'Senior Penetration Tester', 'Security Engineer (Remote)']
+    jobs = [{'title': title, 'id': index} for index, title in enumerate(titles)]
+    expected = []
+    for job in jobs:
+        if not any(fuzz.token_set_ratio(job['title'], kept['title']) >= 92 for kept in expected):
+            expected.append(job)
+    assert deduplicate(jobs, lambda job: Signature(job['id'], job['title'])) == expected
+
+
+@pytest.mark.parametrize('chunk_size', [1, 7, 256])
+@pytest.mark.parametrize('matrices', [False, True])
+def test_cdist_keeps_what_blocking_keeps(scraper, monkeypatch, chunk_size, matrices):
+    if matrices:
+        # Score even the smallest blocks with cdist rather than extractOne
+        monkeypatch.setattr(dedup, '_MATRIX_CELLS', 0)
+    jobs = _listings(300)
+    expected = deduplicate(jobs, scraper._dedup_signature)
+    # Most duplicates here are fuzzy ones, not equal keys or URLs
+    assert len(expected) < len(deduplicate(jobs, lambda job: scraper._dedup_signature(job)._replace(text=None))) / 2
+    assert batch_deduplicate(jobs, scraper._dedup_signature, chunk_size=chunk_size, workers=1) == expected
+    assert scraper.remove_duplicates(jobs, engine='cdist') == scraper.remove_duplicates(jobs)
+
+
+def test_merge_keeps_the_longest_description_every_url_and_the_earliest_date():
+    jobs = [
+        _job('Security Engineer', 'Initech', 'https://a.example.com/1', description='Short',
+             posted_date='2024-03-02'),
+        dict(_job('Security Engineer', 'Initech Inc', 'https://b.example.com/1', description='  A longer one  ',
+                  posted_date='2024-03-01T09:00:00+00:00'), source='LinkedIn'),
+        _job('Sr Security Engineer', 'Initech', 'https://a.example.com/1', description='Also short',
+             posted_date='not a date'),
+        _job('Security Engineer', 'Initech', '', description='', posted_date=None),
+    ]
+    merged = dedup.merge_duplicates(jobs)
+    assert merged['description'] == '  A longer one  '
+    assert merged['company'] == 'Initech Inc'
+    assert merged['urls'] == ['https://a.example.com/1', 'https://b.example.com/1']
+    assert merged['sources'] == ['Indeed', 'LinkedIn']
+    assert merged['posted_date'] == '2024-03-01T09:00:00+00:00'
+    assert merged['duplicate_count'] == 3
+    # The jobs themselves are left alone
+    assert 'urls' not in jobs[1] and jobs[0]['posted_date'] == '2024-03-02'
+
+
+def test_merge_ties_go_to_the_first_job():
+    jobs = [_job('SOC Analyst', 'Globex', description='Same'), _job('SOC Analyst', 'Globex', description='Also')]
+    merged = dedup.merge_duplicates(jobs)
+    assert merged['description'] == 'Same'
+    assert 'posted_date' not in merged and merged['urls'] == [] and merged['duplicate_count'] == 1
+
+
+def test_cluster_engine_merges_what_blocking_drops(scraper):
+    jobs = _listings(300)
+    kept = scraper.remove_duplicates(jobs)
+    merged = scraper.remove_duplicates(jobs, engine='cluster')
+    # Clusters are closed under matching, so there are at most as many as blocking keeps
+    assert len(merged) <= len(kept)
+    assert sum(job['duplicate_count'] + 1 for job in merged) == len(jobs)
+    assert sorted(url for job in merged for url in job['urls']) == sorted(job['url'] for job in jobs)
+
+
+@pytest.mark.parametrize('engine', ['blocking', 'cdist'])
+def test_any_number_of_workers_keeps_the_same_jobs(scraper, engine):
+    jobs = _listings(300)
+    inline = scraper.remove_duplicates(jobs, engine=engine, workers=1)
+    assert scraper.remove_duplicates(jobs, engine=engine, workers=2) == inline
+    # Sharded, fuzzy matches stay within a company, unlike the default unsharded run
+    jobs = [_job('Software Engineer, Backend', 'Meta Platforms'), _job('Software Engineer', 'Meta')]
+    assert scraper.remove_duplicates(jobs) == jobs[:1]
+    assert scraper.remove_duplicates(jobs, engine=engine, workers=1) == jobs
+    assert scraper.remove_duplicates(jobs, engine=engine, workers=2) == jobs
+
+
+def test_minhash_cannot_be_sharded(scraper, monkeypatch, capsys):
+    with pytest.raises(ValueError):
+        scraper.remove_duplicates(_listings(10), engine='minhash', workers=1)
+    # The CLI refuses before scraping anything
+    monkeypatch.setattr(sys, 'argv', ['cli.py', '--dedup-engine', 'minhash', '--dedup-workers', '2'])
+    monkeypatch.setattr(cli, 'CyberSecurityJobScraper', None)
+    with pytest.raises(SystemExit) as exit_info:
+        cli.main()
+    assert exit_info.value.code == 2
+    assert '--dedup-workers cannot be used with --dedup-engine minhash' in capsys.readouterr().err
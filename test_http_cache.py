@@ -0,0 +1,143 @@
+"""
+Tests for the on-disk response cache and conditional revalidation
+"""
+
+from collections import deque
+
+import pytest
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+import http_cache
+from http_cache import ResponseCache
+from http_session import ScraperSession
+from unified_scraper import ScrapingConfig
+
+URL = 'https://www.indeed.com/viewjob?jk=abc'
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        return self.now
+
+
+class StubAdapter(BaseAdapter):
+    """Answers with queued (status, headers, body) tuples and keeps the requests it was sent"""
+
+    def __init__(self, *responses):
+        super().__init__()
+        self.responses = deque(responses)
+        self.requests = []
+
+    def send(self, request, **kwargs):
+        self.requests.append(request)
+        status, headers, body = self.responses.popleft()
+        response = requests.Response()
+        response.status_code = status
+        response.headers = CaseInsensitiveDict(headers)
+        response._content = body
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self):
+        pass
+
+
+def _response(body: bytes, url: str = URL, **headers) -> requests.Response:
+    response = requests.Response()
+    response.status_code = 200
+    response.headers = CaseInsensitiveDict(headers)
+    response._content = body
+    response.url = url
+    return response
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(http_cache, 'time', fake)
+    return fake
+
+
+def _session(tmp_path, adapter: StubAdapter, ttl: float) -> ScraperSession:
+    config = ScrapingConfig(state_dir=str(tmp_path), cache_ttl=ttl, default_rate=(1000.0, 100))
+    session = ScraperSession(config)
+    session.mount('https://', adapter)
+    return session
+
+
+def test_store_and_get_round_trip(tmp_path):
+    cache = ResponseCache(str(tmp_path / 'cache.sqlite'))
+    cache.store('k', _response(b'<html>job</html>', ETag='"v1"', **{'Content-Encoding': 'gzip'}))
+    entry = cache.get('k')
+    assert entry.body == b'<html>job</html>'
+    assert entry.conditional_headers() == {'If-None-Match': '"v1"'}
+    # The stored body is already decoded, so the transfer encoding must not come back
+    assert 'Content-Encoding' not in entry.to_response().headers
+    assert entry.to_response().from_cache
+    assert cache.get('missing') is None
+    cache.close()
+
+
+def test_no_store_responses_are_not_cached(tmp_path):
+    cache = ResponseCache(str(tmp_path / 'cache.sqlite'))
+    cache.store('k', _response(b'secret', **{'Cache-Control': 'private, no-store'}))
+    assert cache.get('k') is None
+    cache.close()
+
+
+def test_least_recently_used_entries_are_evicted_first(tmp_path, clock):
+    cache = ResponseCache(str(tmp_path / 'cache.sqlite'), max_bytes=25)
+    for key in ('a', 'b'):
+        cache.store(key, _response(b'x' * 10))
+        clock.now += 1
+    cache.get('a')
+    clock.now += 1
+    cache.store('c', _response(b'x' * 10))
+
+    assert cache.get('b') is None
+    assert cache.get('a') is not None and cache.get('c') is not None
+    assert cache.stats()['evictions'] == 1
+    assert cache.stats()['bytes'] == 20
+
+    # Reopening restores the byte count, so the budget holds across runs
+    cache.close()
+    assert ResponseCache(str(tmp_path / 'cache.sqlite'), max_bytes=25).stats()['bytes'] == 20
+
+
+def test_fresh_entries_are_served_without_a_request(tmp_path):
+    adapter = StubAdapter((200, {'ETag': '"v1"'}, b'first'))
+    session = _session(tmp_path, adapter, ttl=3600)
+    assert session.get(URL, cache=True).content == b'first'
+    cached = session.get(URL, cache=True)
+    assert cached.content == b'first' and cached.from_cache
+    assert len(adapter.requests) == 1
+    assert session.cache_stats()['hits'] == 1
+    session.close()
+
+
+def test_stale_entries_are_revalidated_with_their_validators(tmp_path):
+    adapter = StubAdapter(
+        (200, {'ETag': '"v1"', 'Last-Modified': 'Mon, 05 Oct 2026 10:00:00 GMT'}, b'first'),
+        (304, {'ETag': '"v2"'}, b''),
+        (200, {'ETag': '"v3"'}, b'changed'),
+    )
+    session = _session(tmp_path, adapter, ttl=0)
+    session.get(URL, cache=True)
+
+    # 304: the stored body is served and the new validator kept
+    revalidated = session.get(URL, cache=True)
+    assert revalidated.status_code == 200 and revalidated.content == b'first'
+    assert adapter.requests[1].headers['If-None-Match'] == '"v1"'
+    assert adapter.requests[1].headers['If-Modified-Since'] == 'Mon, 05 Oct 2026 10:00:00 GMT'
+
+    # 200: the new body replaces the stored one
+    assert session.get(URL, cache=True).content == b'changed'
+    assert adapter.requests[2].headers['If-None-Match'] == '"v2"'
+    assert session.cache_stats()['revalidated'] == 1
+    session.close()
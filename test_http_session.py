@@ -0,0 +1,100 @@
+"""
+Tests for the retrying scraper session transport
+"""
+
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+from urllib3.response import HTTPResponse
+
+from http_session import JitteredRetry, ScraperSession
+from unified_scraper import ScrapingConfig
+
+
+def _throttled(retry_after: str) -> HTTPResponse:
+    return HTTPResponse(status=429, headers={'Retry-After': retry_after})
+
+
+def test_retry_after_is_capped():
+    retry = JitteredRetry(total=3, max_retry_after=30)
+    assert retry.get_retry_after(_throttled('3600')) == 30
+    assert retry.get_retry_after(_throttled('5')) == 5
+    assert retry.get_retry_after(HTTPResponse(status=429)) is None
+
+
+def test_cap_and_class_survive_increments():
+    retry = JitteredRetry(total=3, status_forcelist={429}, max_retry_after=7)
+    retry = retry.increment(method='GET', url='/jobs', response=_throttled('60'))
+    assert isinstance(retry, JitteredRetry)
+    assert retry.max_retry_after == 7
+    assert retry.get_retry_after(_throttled('60')) == 7
+
+
+def test_backoff_is_jittered_between_one_and_two_times_the_base():
+    retry = JitteredRetry(total=5, status_forcelist={503}, backoff_factor=1)
+    assert retry.get_backoff_time() == 0
+    for _ in range(3):
+        retry = retry.increment(method='GET', url='/jobs', response=HTTPResponse(status=503))
+    # urllib3 waits backoff_factor * 2 ** (consecutive errors - 1) = 4s before jitter
+    delays = {retry.get_backoff_time() for _ in range(50)}
+    assert all(4 <= delay <= 8 for delay in delays)
+    assert len(delays) > 1
+
+
+class FlakyHandler(BaseHTTPRequestHandler):
+    """503 for the first `failures` requests, then 200"""
+    failures = 2
+    seen = 0
+
+    def do_GET(self):
+        type(self).seen += 1
+        status = 503 if self.seen <= self.failures else 200
+        self.send_response(status)
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        self.wfile.write(b'ok')
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    FlakyHandler.seen = 0
+    httpd = HTTPServer(('127.0.0.1', 0), FlakyHandler)
+    thread = threading.Thread(target=httpd.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_port}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _session(tmp_path, **overrides) -> ScraperSession:
+    config = ScrapingConfig(state_dir=str(tmp_path), http_cache=False, backoff_factor=0, host_rates={},
+                            default_rate=(1000.0, 100), **overrides)
+    return ScraperSession(config)
+
+
+def test_server_errors_are_retried(server, tmp_path):
+    session = _session(tmp_path, max_retries=3)
+    response = session.get(f"{server}/jobs")
+    assert response.status_code == 200
+    assert FlakyHandler.seen == 3
+    session.close()
+
+
+def test_last_error_is_returned_once_retries_run_out(server, tmp_path):
+    session = _session(tmp_path, max_retries=1)
+    assert session.get(f"{server}/jobs").status_code == 503
+    assert FlakyHandler.seen == 2
+    session.close()
+
+
+def test_requests_get_the_default_timeout(tmp_path, monkeypatch):
+    session = _session(tmp_path, timeout=7)
+    sent = []
+    monkeypatch.setattr('requests.Session.request', lambda self, method, url, **kwargs: sent.append(kwargs))
+    session.get('https://www.dice.com/jobs')
+    session.get('https://www.dice.com/jobs', timeout=2)
+    assert [kwargs['timeout'] for kwargs in sent] == [7, 2]
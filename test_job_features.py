@@ -0,0 +1,78 @@
+"""
+Tests for whole-word job feature extraction
+"""
+
+import pytest
+
+from job_features import CITIZENSHIP_REQUIRED, Evidence, FeatureExtractor, evidence_phrases
+from keyword_matching import KeywordMatcher
+from unified_scraper import JobCategory, ScrapingConfig, UnifiedJobScraper
+
+TEXTS = [
+    'Staff Security Engineer, remote. US citizenship required.',
+    'Staffing agency hiring for an internal help desk role',
+    'Junior SOC analyst - internship available, hybrid',
+    'Sr. engineer with TS/SCI clearance; work from home',
+    'Senior or entry level; visa sponsorship for the right US citizen',
+    '',
+]
+
+
+@pytest.fixture(params=['automaton', 'regex'])
+def extractor(request):
+    extractor = FeatureExtractor()
+    if request.param == 'regex':
+        extractor.matcher = KeywordMatcher(extractor.matcher.terms, use_automaton=False)
+    return extractor
+
+
+def test_keywords_match_whole_words_only(extractor):
+    flags, level, citizenship = extractor.labels('Staffing agency hiring for an internal help desk role')
+    assert (level, citizenship) == ('mid', False)
+    assert not any(flags.values())
+    assert extractor.labels('Staff engineer')[1] == 'senior'
+    assert extractor.labels('Leads the team remotely')[0]['remote_friendly']
+
+
+@pytest.mark.parametrize('text, level', [
+    ('Principal engineer', 'senior'),
+    ('Sr. engineer', 'senior'),
+    ('Internship, then a junior role', 'entry'),
+    ('Associate or senior engineer', 'senior'),
+    ('Software engineer', 'mid'),
+])
+def test_experience_levels(extractor, text, level):
+    assert extractor.labels(text)[1] == level
+    assert extractor.extract(text).experience_level == level
+
+
+def test_labels_agree_with_extract(extractor):
+    for text in TEXTS:
+        features = extractor.extract(text)
+        assert extractor.labels(text) == (features.flags, features.experience_level, features.citizenship_required)
+
+
+def test_evidence_indexes_the_lowercased_text(extractor):
+    text = 'Remote role. US Citizens only; no security clearances'
+    features = extractor.extract(text)
+    lowered = text.lower()
+    assert all(lowered[item.start:item.end] == item.text for item in features.evidence)
+    assert Evidence('remote_friendly', 'remote', 0, 6, 'remote') in features.evidence
+    assert evidence_phrases(features.evidence) == {
+        'remote_friendly': ['remote'],
+        CITIZENSHIP_REQUIRED: ['us citizens', 'security clearances'],
+        'security_clearance_required': ['security clearances'],
+    }
+    assert features.citizenship_required and features.flags['security_clearance_required']
+
+
+@pytest.mark.parametrize('evidence', [False, True])
+def test_classify_job_matches_whole_words(tmp_path, evidence):
+    config = ScrapingConfig(state_dir=str(tmp_path), classification_evidence=evidence)
+    scraper = UnifiedJobScraper(JobCategory.SOFTWARE_ENGINEERING, config)
+    job = scraper.classify_job({'title': 'Software Engineer', 'company': 'Initech', 'location': 'Austin, TX',
+                                'description': 'Join our staffing platform team and build internal tools'})
+    assert job.experience_level == 'mid'
+    assert 'F1 Student Friendly' in job.classification_tags
+    assert job.classification_evidence == {}
+    scraper.close()
@@ -0,0 +1,81 @@
+"""
+Tests for the columnar (pandas) job classification path
+"""
+
+import json
+
+import pytest
+
+import job_frame
+from citizenship import CitizenshipClassifier
+from job_features import FeatureExtractor
+from job_scraper import CyberSecurityJobScraper
+from keyword_matching import KeywordMatcher
+from unified_scraper import JobCategory, ScrapingConfig, UnifiedJobScraper
+
+JOBS = [
+    {'title': 'Security Engineer', 'company': 'Initech', 'location': 'Remote',
+     'description': 'H1B sponsorship available. Work from home.', 'url': 'https://example.com/1'},
+    {'title': 'SOC Analyst', 'company': 'Globex', 'location': 'Austin, TX',
+     'description': 'US citizens only; no sponsorship. Secret clearance required.', 'url': 'https://example.com/2'},
+    {'title': 'Staff Accountant', 'company': 'Hooli', 'location': '',
+     'description': 'Join our staffing team', 'url': 'https://example.com/3'},
+    {'title': 'Junior Penetration Tester', 'company': 'Initech', 'location': 'Remote',
+     'description': 'H1B sponsorship available. Work from home.', 'url': 'https://example.com/4',
+     'experience_level': 'senior'},
+    {'title': 'Threat Hunter', 'company': 'Umbrella', 'description': 'Internal tools, top secret', 'url': ''},
+]
+
+
+@pytest.fixture
+def scraper(tmp_path):
+    scraper = CyberSecurityJobScraper(ScrapingConfig(state_dir=str(tmp_path), http_cache=False))
+    yield scraper
+    scraper.close()
+
+
+@pytest.mark.parametrize('use_automaton', [True, False])
+def test_citizenship_matches_the_dict_path(scraper, use_automaton):
+    classifier = CitizenshipClassifier(use_automaton=use_automaton)
+    expected = scraper.filter_citizenship_clearance([dict(job) for job in JOBS])
+    framed = job_frame.frame_to_jobs(job_frame.classify_citizenship(job_frame.job_frame(JOBS), classifier))
+    assert [{key: job[key] for key in job_frame.CITIZENSHIP_COLUMNS} for job in framed] == \
+        [{key: job[key] for key in job_frame.CITIZENSHIP_COLUMNS} for job in expected]
+    # Plain Python values, so the jobs can be saved with json again
+    json.dumps(framed)
+
+
+@pytest.mark.parametrize('use_automaton', [True, False])
+def test_features_match_classify_job(tmp_path, use_automaton):
+    extractor = FeatureExtractor()
+    extractor.matcher = KeywordMatcher(extractor.matcher.terms, use_automaton=use_automaton)
+    unified = UnifiedJobScraper(JobCategory.CYBERSECURITY, ScrapingConfig(state_dir=str(tmp_path)))
+    framed = job_frame.frame_to_jobs(job_frame.classify_features(job_frame.job_frame(JOBS), extractor))
+    for job, row in zip(JOBS, framed):
+        listing = unified.classify_job(job)
+        assert (row['remote_friendly'], row['visa_sponsorship'], row['security_clearance_required'],
+                row['experience_level'], row['classification_tags']) == \
+            (listing.remote_friendly, listing.visa_sponsorship, listing.security_clearance_required,
+             listing.experience_level, listing.classification_tags)
+    assert [row['experience_level'] for row in framed] == ['mid', 'mid', 'senior', 'senior', 'mid']
+    unified.close()
+
+
+@pytest.mark.parametrize('use_automaton', [True, False])
+def test_relevance_matches_the_scraper(scraper, use_automaton):
+    matcher = KeywordMatcher(tuple(scraper.cyber_keywords) + tuple(scraper.job_titles), use_automaton=use_automaton)
+    relevant = job_frame.relevance_mask(job_frame.job_frame(JOBS), matcher)
+    assert list(relevant) == [scraper.is_cybersecurity_job(job['title'], job['description']) for job in JOBS]
+
+
+@pytest.mark.parametrize('exclude_citizenship_required, f1_student', [(False, False), (True, False), (True, True)])
+def test_retag_filters_like_the_scrape(scraper, exclude_citizenship_required, f1_student):
+    relevant = [dict(job) for job in JOBS if scraper.is_cybersecurity_job(job['title'], job['description'])]
+    expected = scraper.filter_citizenship_clearance(relevant, exclude_citizenship_required=exclude_citizenship_required)
+    expected = scraper.filter_f1_student_friendly(expected, f1_student=f1_student)
+    retagged = scraper.retag(JOBS, exclude_citizenship_required=exclude_citizenship_required, f1_student=f1_student)
+    assert retagged == expected
+
+
+def test_retag_without_jobs(scraper):
+    assert scraper.retag([]) == []
@@ -0,0 +1,84 @@
+"""
+Tests for the per-source card parsers on both HTML backends
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from html_parsing import BACKENDS, parse_document
+from job_parsers import (parse_dice_results, parse_glassdoor_results, parse_wellfound_results,
+                         parse_ziprecruiter_results)
+
+GLASSDOOR = b'''
+<div data-test="jobListing">
+  <div data-test="job-title">Security Engineer</div>
+  <div data-test="employer-name">Initech</div>
+  <a href="/job/1">View</a>
+</div>
+<div data-test="jobListing"><div data-test="employer-name">No title</div></div>
+'''
+ZIPRECRUITER = b'''
+<div class="job_content">
+  <a class="job_link" href="/c/1">SOC <b>Analyst</b></a>
+  <a class="company_link">Globex</a>
+  <div class="job_location">Remote</div>
+  <div class="job_snippet">Monitor the SIEM</div>
+  <div class="job_posted"><span class="date">3 days ago</span></div>
+</div>
+<div class="job_content"><div class="job_snippet">No title link</div></div>
+'''
+# Dice wraps cards in other .card elements; each card's fields come from inside it
+DICE = b'''
+<div class="card search-card">
+  <div class="card">
+    <a class="card-title-link" href="https://www.dice.com/job/2">Penetration Tester</a>
+    <span class="jobLocation">Austin, TX</span>
+  </div>
+</div>
+'''
+WELLFOUND = b'''
+<article><h2>Security Engineer</h2><a href="/jobs/3">Apply</a><span class="company-name">Hooli</span></article>
+<article><p class="job-description">No title</p></article>
+'''
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_glassdoor(backend):
+    assert parse_glassdoor_results(GLASSDOOR, 'United States', backend=backend) == [{
+        'title': 'Security Engineer', 'company': 'Initech', 'location': 'United States',
+        'url': 'https://www.glassdoor.com/job/1',
+    }]
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_ziprecruiter(backend):
+    [card] = parse_ziprecruiter_results(ZIPRECRUITER, 'United States', backend=backend)
+    assert {key: card[key] for key in ('title', 'company', 'location', 'description', 'url')} == {
+        'title': 'SOCAnalyst', 'company': 'Globex', 'location': 'Remote', 'description': 'Monitor the SIEM',
+        'url': 'https://www.ziprecruiter.com/c/1',
+    }
+    assert card['posted_date'][:10] == (datetime.now() - timedelta(days=3)).date().isoformat()
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_dice_nested_cards(backend):
+    cards = parse_dice_results(DICE, 'United States', backend=backend)
+    assert [(card['title'], card['company'], card['location']) for card in cards] == [
+        ('Penetration Tester', 'Unknown', 'Austin, TX'),
+        ('Penetration Tester', 'Unknown', 'Austin, TX'),
+    ]
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_wellfound(backend):
+    [card] = parse_wellfound_results(WELLFOUND, 'Remote', backend=backend)
+    assert (card['title'], card['company'], card['location'], card['url']) == (
+        'Security Engineer', 'Hooli', 'Remote', 'https://wellfound.com/jobs/3')
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_select_only_searches_descendants(backend):
+    outer = parse_document(DICE, 'dice', backend).select_one('div.card')
+    assert [node.attr('class') for node in outer.select('div.card')] == ['card']
+    assert outer.select_one('div.card').select_one('div.card') is None
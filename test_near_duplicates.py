@@ -0,0 +1,79 @@
+"""
+Tests for the MinHash / LSH near-duplicate index
+"""
+
+import pytest
+
+from dedup import Signature, minhash_deduplicate
+from near_duplicates import MinHashIndex, band_layout
+
+WORDS = [f"word{index}" for index in range(200)]
+DESCRIPTION = ' '.join(WORDS[:100])
+TITLE = 'Security Engineer Initech'
+
+
+def _shifted(shift: int) -> str:
+    """DESCRIPTION with its first shift words swapped for new ones"""
+    return ' '.join(WORDS[shift:100 + shift])
+
+
+def _jaccard(first: tuple, second: tuple) -> float:
+    first, second = set(MinHashIndex.shingles(*first).tolist()), set(MinHashIndex.shingles(*second).tolist())
+    return len(first & second) / len(first | second)
+
+
+@pytest.mark.parametrize('shift', [0, 5, 20, 40, 80])
+def test_signatures_estimate_jaccard_similarity(shift):
+    index = MinHashIndex(num_perm=256)
+    first, second = (TITLE, DESCRIPTION), (TITLE, _shifted(shift))
+    estimate = (index.signature(*first) == index.signature(*second)).mean()
+    assert estimate == pytest.approx(_jaccard(first, second), abs=0.1)
+
+
+def test_candidates_are_the_postings_at_or_above_the_threshold():
+    index = MinHashIndex(threshold=0.6)
+    index.add('original', index.signature(TITLE, DESCRIPTION))
+    index.add('rewritten', index.signature(TITLE, _shifted(20)))
+    assert _jaccard((TITLE, DESCRIPTION), (TITLE, _shifted(5))) > 0.9
+    assert index.candidates(index.signature(TITLE, _shifted(5))) == ['original', 'rewritten']
+    assert index.candidates(index.signature(TITLE, _shifted(25))) == ['rewritten', 'original']
+    assert _jaccard((TITLE, DESCRIPTION), (TITLE, _shifted(80))) < 0.3
+    assert index.candidates(index.signature(TITLE, _shifted(80))) == []
+    assert len(index) == 2
+
+    strict = MinHashIndex(threshold=0.95)
+    strict.add('original', strict.signature(TITLE, DESCRIPTION))
+    assert strict.candidates(strict.signature(TITLE, DESCRIPTION)) == ['original']
+    assert strict.candidates(strict.signature(TITLE, _shifted(5))) == []
+
+
+def test_nothing_to_shingle():
+    assert len(MinHashIndex.shingles('', '')) == 0
+    assert MinHashIndex().signature('!!', '') is None
+    # Texts shorter than one gram still get one
+    assert len(MinHashIndex.shingles('QA')) == 1
+
+
+def test_band_layout_narrows_with_the_threshold():
+    layouts = [band_layout(threshold, 128) for threshold in (0.4, 0.6, 0.8)]
+    assert all(bands * rows <= 128 for bands, rows in layouts)
+    assert [rows for _, rows in layouts] == sorted(rows for _, rows in layouts)
+    assert layouts[0][1] < layouts[-1][1]
+
+
+def _signature(job: dict) -> Signature:
+    return Signature((job['title'], job['company']), f"{job['title']} {job['company']}", job['url'])
+
+
+def test_minhash_dedup_drops_reposts_across_companies():
+    jobs = [
+        {'title': 'Security Engineer', 'company': 'Initech', 'url': 'a', 'description': DESCRIPTION},
+        # Reworded and reposted by an agency: no shared fuzzy block, nearly the same description
+        {'title': 'Security Engineer II', 'company': 'TEKsystems', 'url': 'b', 'description': _shifted(2)},
+        {'title': 'Security Engineer', 'company': 'Initech', 'url': 'c', 'description': _shifted(80)},
+        {'title': 'Security Engineer', 'company': 'Globex', 'url': 'a', 'description': _shifted(90)},
+        {'title': 'Security Engineer', 'company': 'Globex', 'url': 'd', 'description': _shifted(95)},
+    ]
+    # Equal keys and URLs are duplicates whatever the description
+    assert minhash_deduplicate(jobs, _signature, jaccard_threshold=0.6) == [jobs[0], jobs[4]]
+    assert minhash_deduplicate(jobs, _signature, jaccard_threshold=0.95) == [jobs[0], jobs[1], jobs[4]]
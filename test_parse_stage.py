@@ -0,0 +1,33 @@
+"""
+Tests for the process-pool parse stage
+"""
+
+from job_scraper import CyberSecurityJobScraper
+from parse_stage import ParseStage
+from unified_scraper import ScrapingConfig
+
+PAGE = b'''
+<div class="card">
+  <a class="card-title-link" href="https://www.dice.com/job/1">Security Engineer</a>
+  <a class="card-company">Initech</a>
+</div>
+'''
+
+
+def _titles(cards):
+    return [(card['title'], card['company']) for card in cards]
+
+
+def test_pool_parses_like_inline_and_shuts_down():
+    stage = ParseStage(workers=1)
+    assert _titles(stage.parse('dice', PAGE, 'Remote')) == _titles(ParseStage().parse('dice', PAGE, 'Remote'))
+    assert stage._executor is not None
+    stage.close()
+    assert stage._executor is None
+
+
+def test_scraper_close_shuts_the_pool_down(tmp_path):
+    scraper = CyberSecurityJobScraper(ScrapingConfig(state_dir=str(tmp_path), parse_workers=1))
+    assert _titles(scraper.parser.parse('dice', PAGE, 'Remote')) == [('Security Engineer', 'Initech')]
+    scraper.close()
+    assert scraper.parser._executor is None
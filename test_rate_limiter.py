@@ -0,0 +1,84 @@
+"""
+Tests for per-host token-bucket rate limiting
+"""
+
+import pytest
+
+import rate_limiter
+from rate_limiter import HostRateLimiter, TokenBucket
+
+
+class FakeClock:
+    """Stands in for the time module: sleeping advances monotonic() instantly"""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(rate_limiter, 'time', fake)
+    return fake
+
+
+def test_burst_then_rate(clock):
+    bucket = TokenBucket(rate=2, burst=3)
+    assert [bucket.try_acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.try_acquire() == pytest.approx(0.5)
+
+    clock.now += 0.25
+    assert bucket.try_acquire() == pytest.approx(0.25)
+    clock.now += 0.25
+    assert bucket.try_acquire() == 0.0
+
+
+def test_refill_is_capped_at_burst(clock):
+    bucket = TokenBucket(rate=1, burst=2)
+    bucket.try_acquire()
+    bucket.try_acquire()
+    clock.now += 60
+    assert [bucket.try_acquire() for _ in range(2)] == [0.0, 0.0]
+    assert bucket.try_acquire() == pytest.approx(1.0)
+
+
+def test_acquire_sleeps_until_a_token_is_free(clock):
+    bucket = TokenBucket(rate=4, burst=1)
+    assert bucket.acquire() == 0.0
+    assert bucket.acquire() == pytest.approx(0.25)
+    assert clock.slept == [pytest.approx(0.25)]
+
+
+def test_rate_must_be_positive():
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0)
+
+
+def test_subdomains_share_the_configured_bucket(clock):
+    limiter = HostRateLimiter({'Indeed.com': (1.0, 1)}, default_rate=(5.0, 1))
+    bucket = limiter.bucket_for('https://www.indeed.com/jobs?q=python')
+    assert limiter.bucket_for('indeed.com') is bucket
+    assert limiter.bucket_for('https://secure.indeed.com/viewjob') is bucket
+    assert bucket.rate == 1.0
+
+    # Look-alike and unknown hosts get their own buckets at the default rate
+    lookalike = limiter.bucket_for('https://notindeed.com/jobs')
+    assert lookalike is not bucket
+    assert lookalike.rate == 5.0
+    assert limiter.bucket_for('https://dice.com/jobs') is not lookalike
+
+
+def test_hosts_are_limited_independently(clock):
+    limiter = HostRateLimiter({'indeed.com': (1.0, 1), 'dice.com': (1.0, 1)})
+    assert limiter.acquire('https://www.indeed.com/a') == 0.0
+    assert limiter.acquire('https://www.dice.com/a') == 0.0
+    assert limiter.acquire('https://www.indeed.com/b') == pytest.approx(1.0)
+    assert clock.slept == [pytest.approx(1.0)]
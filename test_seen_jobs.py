@@ -0,0 +1,103 @@
+"""
+Tests for the cross-run seen-jobs store
+"""
+
+import sqlite3
+
+import pytest
+
+from job_scraper import CyberSecurityJobScraper
+from seen_jobs import SeenJob, SeenJobStore, posting_fingerprints
+from unified_scraper import JobCategory, ScrapingConfig, UnifiedJobScraper
+
+DAY = 86400
+INITECH = posting_fingerprints('https://example.com/1', 'security engineer', 'initech')
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SeenJobStore(str(tmp_path / 'seen_jobs.sqlite'), 'cyber', max_age_days=30)
+    yield store
+    store.close()
+
+
+def test_fingerprints():
+    assert INITECH == ('url:https://example.com/1', 'job:security engineer|initech')
+    assert posting_fingerprints('', 'security engineer', '') == ()
+    assert posting_fingerprints('', 'security engineer', 'initech') == ('job:security engineer|initech',)
+
+
+def test_lookup_answers_a_whole_page_in_order(store):
+    postings = [posting_fingerprints(f"https://example.com/{index}", f"title {index}", 'initech')
+                for index in range(1200)]
+    # More fingerprints than one query may bind
+    store.record(((fingerprints, {'index': index}) for index, fingerprints in enumerate(postings[::2])), seen_at=10)
+    seen = store.lookup(postings + [()])
+    assert [job is not None for job in seen] == [index % 2 == 0 for index in range(1200)] + [False]
+    assert seen[4] == SeenJob(10, 10, {'index': 2})
+
+
+def test_reposts_match_by_title_and_company(store):
+    store.record([(INITECH, {'description': 'old'})], seen_at=100)
+    moved = posting_fingerprints('https://example.com/2', 'security engineer', 'initech')
+    store.record([(posting_fingerprints('https://example.com/3', 'soc analyst', 'initech'), {})], seen_at=150)
+    assert store.lookup([moved]) == [SeenJob(100, 100, {'description': 'old'})]
+
+    store.record([(moved, {'description': 'new'})], seen_at=200)
+    assert store.lookup([moved]) == [SeenJob(100, 200, {'description': 'new'})]
+    # Matched by URL and by title: first seen at the URL, details of the latest match
+    renamed = posting_fingerprints('https://example.com/1', 'soc analyst', 'initech')
+    assert store.lookup([renamed]) == [SeenJob(100, 150, {})]
+
+
+def test_first_seen_is_the_earliest_of_the_fingerprints(store):
+    store.record([(posting_fingerprints('https://example.com/1', '', ''), {})], seen_at=300)
+    store.record([(posting_fingerprints('https://example.com/2', 'security engineer', 'initech'), {})], seen_at=100)
+    assert store.lookup([INITECH]) == [SeenJob(100, 300, {})]
+    store.record([(INITECH, {'seen': 'again'})], seen_at=400)
+    assert store.lookup([INITECH]) == [SeenJob(100, 400, {'seen': 'again'})]
+
+
+def test_postings_unseen_for_max_age_days_are_forgotten(store):
+    store.record([(INITECH, {})], seen_at=0)
+    store.record([(('url:https://example.com/9',), {})], seen_at=29 * DAY)
+    assert store.lookup([INITECH]) != [None]
+    store.record([(('url:https://example.com/9',), {})], seen_at=31 * DAY)
+    assert store.lookup([INITECH, ('url:https://example.com/9',)]) == [None, SeenJob(29 * DAY, 31 * DAY, {})]
+    # Recording nothing prunes nothing
+    store.record([((), {'no': 'fingerprints'})], seen_at=100 * DAY)
+    assert store.lookup([('url:https://example.com/9',)]) != [None]
+
+
+def test_scopes_keep_apart(store):
+    other = SeenJobStore(store.path, 'software', max_age_days=30)
+    store.record([(INITECH, {'scope': 'cyber'})], seen_at=0)
+    other.record([(INITECH, {'scope': 'software'})], seen_at=100 * DAY)
+    # Pruning the other scope leaves this one alone, however old its postings
+    assert store.lookup([INITECH]) == [SeenJob(0, 0, {'scope': 'cyber'})]
+    other.reset()
+    assert other.lookup([INITECH]) == [None]
+    assert store.lookup([INITECH]) != [None]
+    other.close()
+
+
+def test_close_releases_the_connection(store):
+    store.record([(INITECH, {})], seen_at=0)
+    store.close()
+    with pytest.raises(sqlite3.ProgrammingError):
+        store.lookup([INITECH])
+    reopened = SeenJobStore(store.path, 'cyber')
+    assert reopened.lookup([INITECH]) == [SeenJob(0, 0, {})]
+    reopened.close()
+
+
+@pytest.mark.parametrize('make_scraper', [
+    CyberSecurityJobScraper,
+    lambda config: UnifiedJobScraper(JobCategory.CYBERSECURITY, config),
+])
+def test_scraper_close_closes_the_store(tmp_path, make_scraper):
+    scraper = make_scraper(ScrapingConfig(state_dir=str(tmp_path), http_cache=False, remember_seen=True))
+    store = scraper.seen_jobs
+    scraper.close()
+    with pytest.raises(sqlite3.ProgrammingError):
+        store.lookup([INITECH])
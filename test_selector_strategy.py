@@ -0,0 +1,67 @@
+"""
+Regression tests for adaptive selector ordering
+"""
+
+import gc
+import json
+import weakref
+
+from job_parsers import INDEED_COMPANY_FALLBACKS, INDEED_COMPANY_SELECTORS, parse_indeed_results
+from job_scraper import CyberSecurityJobScraper
+from selector_strategy import SelectorStrategy
+from unified_scraper import ScrapingConfig
+
+CARD = '''
+<div class="job_seen_beacon">
+  <h2 class="jobTitle"><a href="/viewjob?jk=1"><span title="Backend Dev">Backend Dev</span></a></h2>
+  {company}
+  <div class="companyLocation">Remote</div>
+</div>
+'''
+
+
+def _company(strategy: SelectorStrategy, company_markup: str) -> str:
+    selectors = strategy.order('indeed.com', 'company', INDEED_COMPANY_SELECTORS, INDEED_COMPANY_FALLBACKS)
+    parsed = parse_indeed_results(CARD.format(company=company_markup), 'United States',
+                                  company_selectors=selectors)[0]
+    strategy.record('indeed.com', 'company', parsed['company_selector'])
+    return parsed['company']
+
+
+def test_generic_fallback_is_not_promoted(tmp_path):
+    path = str(tmp_path / 'selector_stats.json')
+    strategy = SelectorStrategy(path)
+    # Cards without company markup: only the title's span[title] matches
+    for _ in range(20):
+        _company(strategy, '')
+    assert strategy.order('indeed.com', 'company', INDEED_COMPANY_SELECTORS,
+                          INDEED_COMPANY_FALLBACKS)[-1] == 'span[title]'
+    assert _company(strategy, '<span data-testid="company-name">Globex</span>') == 'Globex'
+
+    # Counts saved by a run that did promote it carry over, but still do not reorder the fallback
+    strategy.save()
+    assert _company(SelectorStrategy(path), '<span data-testid="company-name">Globex</span>') == 'Globex'
+
+
+def test_specific_selectors_are_reordered_by_hits():
+    strategy = SelectorStrategy()
+    for _ in range(5):
+        assert _company(strategy, '<span class="companyName">Initech</span>') == 'Initech'
+    assert strategy.order('indeed.com', 'company', INDEED_COMPANY_SELECTORS)[0] == 'span.companyName'
+
+
+def test_scraper_close_saves_counts(tmp_path):
+    scraper = CyberSecurityJobScraper(ScrapingConfig(state_dir=str(tmp_path)))
+    scraper.selectors.record('indeed.com', 'company', 'span.companyName')
+    scraper.close()
+    with open(tmp_path / 'selector_stats.json', encoding='utf-8') as f:
+        assert json.load(f) == {'indeed.com': {'company': {'span.companyName': 1}}}
+
+
+def test_strategies_are_not_kept_alive_until_exit(tmp_path):
+    # A web server builds a scraper per scrape; their strategies must go with them
+    strategy = SelectorStrategy(str(tmp_path / 'selector_stats.json'))
+    ref = weakref.ref(strategy)
+    del strategy
+    gc.collect()
+    assert ref() is None
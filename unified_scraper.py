@@ -3,16 +3,13 @@ Unified Job Scraper Architecture
 Eliminates code duplication between CyberSecurityJobScraper and SoftwareEngineeringJobScraper
 """
 
-import requests
-from bs4 import BeautifulSoup
 import pandas as pd
 import time
 import json
 from datetime import datetime, timedelta
 from fake_useragent import UserAgent
 import re
-import random
-from typing import List, Dict, Optional, Set, Callable
+from typing import List, Dict, Optional, Set, Callable, Tuple, Iterator
 import logging
 import os
 from abc import ABC, abstractmethod
@@ -28,6 +25,14 @@ matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 from rapidfuzz import fuzz
 from urllib.parse import urlparse, parse_qs
+from scrape_executor import emit_page, run_sources_parallel, stream_sources
+from http_session import ScraperSession
+from dedup import OnlineDeduplicator, Signature, company_block, deduplicate, leading_words_block, title_block
+from html_parsing import make_soup
+from keyword_matching import KeywordMatcher, compile_keywords
+from classification_cache import ClassificationCache
+from seen_jobs import SeenJob, SeenJobStore, posting_fingerprints
+from job_features import FeatureExtractor, evidence_phrases
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -57,14 +62,68 @@ class JobKeywords:
     exclusions: Set[str] = field(default_factory=set)
 
 
+# Politeness per job board: hostname -> (requests per second, burst)
+DEFAULT_HOST_RATES: Dict[str, Tuple[float, int]] = {
+    'indeed.com': (2.0, 4),
+    'linkedin.com': (0.33, 1),
+    'glassdoor.com': (0.33, 1),
+    'ziprecruiter.com': (1.0, 1),
+    'dice.com': (1.0, 1),
+    'wellfound.com': (0.5, 1),
+    'serpapi.com': (1.0, 1),
+}
+
+
+def default_state_dir() -> str:
+    """Directory for the scrapers' on-disk caches and crawl state"""
+    return os.getenv('JOB_SCRAPER_STATE_DIR', os.path.join(os.path.expanduser('~'), '.cache', 'job_scraper'))
+
+
 @dataclass
 class ScrapingConfig:
     """Configuration for scraping parameters"""
     max_pages: int = 3
     delay_range: tuple = (1, 3)
-    timeout: int = 10
-    max_retries: int = 3
+    timeout: int = 10  # Seconds; applied to every request made through the scraper session
+    max_retries: int = 3  # Retries on connection errors, 429 and 5xx responses
     user_agents: List[str] = field(default_factory=list)
+    detail_workers: int = 8  # Parallel job detail page fetches
+    per_host_limit: int = 4  # Max in-flight requests to any single host
+    source_workers: int = 7  # Sources scraped side by side in scrape_all_sources
+    host_rates: Dict[str, Tuple[float, int]] = field(default_factory=lambda: dict(DEFAULT_HOST_RATES))
+    default_rate: Tuple[float, int] = (1.0, 2)  # Any host not listed in host_rates
+    backoff_factor: float = 0.5  # Exponential backoff base between retries (jittered)
+    max_retry_after: float = 60  # Upper bound on honoring a server's Retry-After
+    pool_connections: int = 16  # Distinct hosts kept in the connection pool
+    state_dir: str = field(default_factory=default_state_dir)
+    http_cache: bool = True  # Cache job detail pages on disk between runs
+    cache_ttl: float = 24 * 3600  # Seconds before a cached page is revalidated
+    cache_max_bytes: int = 256 * 1024 * 1024
+    cassette_mode: Optional[str] = None  # 'record' or 'replay' HTTP traffic for offline runs
+    cassette_path: Optional[str] = None  # Defaults to <state_dir>/cassette.jsonl.gz
+    incremental: bool = False  # Only fetch postings each search hasn't returned on a previous run
+    html_backend: Optional[str] = None  # 'selectolax' or 'soup'; None picks selectolax when installed
+    parse_workers: int = 0  # Worker processes for HTML parsing; 0 parses on the scraping threads
+    classification_cache_size: int = 100_000  # Classification results memoized per text; 0 disables
+    persist_classifications: bool = False  # Keep memoized classifications in <state_dir>/classifications.sqlite
+    remember_seen: bool = False  # Mark postings shown on an earlier run as seen_before (<state_dir>/seen_jobs.sqlite)
+    seen_max_age_days: float = 90  # Postings not seen for this long are forgotten
+    classification_evidence: bool = False  # classify_job also records the matched phrases (somewhat slower)
+
+
+def classification_cache(config: ScrapingConfig) -> ClassificationCache:
+    """The classification cache a scraper with this config uses"""
+    path = None
+    if config.persist_classifications:
+        path = os.path.join(config.state_dir, 'classifications.sqlite')
+    return ClassificationCache(config.classification_cache_size, path)
+
+
+def seen_job_store(config: ScrapingConfig, scope: str) -> Optional[SeenJobStore]:
+    """The cross-run seen-jobs store a scraper with this config uses under scope, if any"""
+    if not config.remember_seen:
+        return None
+    return SeenJobStore(os.path.join(config.state_dir, 'seen_jobs.sqlite'), scope, config.seen_max_age_days)
 
 
 @dataclass
@@ -84,6 +143,9 @@ class JobListing:
     remote_friendly: bool = False
     visa_sponsorship: bool = False
     security_clearance_required: bool = False
+    classification_evidence: Dict[str, List[str]] = field(default_factory=dict)
+    seen_before: bool = False  # Returned by an earlier run (ScrapingConfig.remember_seen)
+    first_seen: Optional[str] = None
     
     def to_dict(self) -> Dict:
         """Convert to dictionary for compatibility"""
@@ -102,9 +164,19 @@ class JobListing:
             'remote_friendly': self.remote_friendly,
             'visa_sponsorship': self.visa_sponsorship,
             'security_clearance_required': self.security_clearance_required,
+            'classification_evidence': self.classification_evidence,
+            'seen_before': self.seen_before,
+            'first_seen': self.first_seen,
         }
 
 
+# JobListing fields a seen-jobs store keeps, so a posting seen before is not classified again
+SEEN_DETAILS = (
+    'description', 'experience_level', 'salary_range', 'classification_tags', 'remote_friendly',
+    'visa_sponsorship', 'security_clearance_required', 'classification_evidence',
+)
+
+
 class JobCategoryConfig:
     """Configuration for different job categories"""
     
@@ -177,7 +249,7 @@ class BaseJobScraper(ABC):
         self.category = category
         self.config = config or ScrapingConfig()
         self.ua = UserAgent()
-        self.session = requests.Session()
+        self.session = ScraperSession(self.config)
         self._setup_session()
         
         # Get category-specific configuration
@@ -187,6 +259,9 @@ class BaseJobScraper(ABC):
             self.job_config = JobCategoryConfig.get_software_engineering_config()
         else:
             raise ValueError(f"Unsupported job category: {category}")
+        self.feature_extractor = FeatureExtractor()
+        self.classifications = classification_cache(self.config)
+        self.seen_jobs = seen_job_store(self.config, f"unified:{category.value}")
     
     def _setup_session(self):
         """Setup HTTP session with headers and configuration"""
@@ -200,19 +275,23 @@ class BaseJobScraper(ABC):
     
     def is_relevant_job(self, title: str, description: str, keywords: str = "") -> bool:
         """Check if a job posting is relevant to the category"""
-        text = (title + ' ' + description + ' ' + keywords).lower()
-        
-        # Check for category-specific keywords
-        for keyword in self.job_config.keywords:
-            if keyword.lower() in text:
-                return True
-        
-        # Check for category-specific job titles
-        for job_title in self.job_config.job_titles:
-            if job_title.lower() in text:
-                return True
-        
-        return False
+        matcher = self._relevance_matcher()
+        return self.classifications.get_or_compute(
+            f"relevance:{matcher.version}", title + ' ' + description + ' ' + keywords,
+            lambda text: matcher.matches(text, lowered=True)
+        )
+    
+    def relevance_terms(self, title: str, description: str, keywords: str = "") -> List[str]:
+        """Category keywords and titles found in the posting, in order of appearance"""
+        matcher = self._relevance_matcher()
+        return list(self.classifications.get_or_compute(
+            f"relevance_terms:{matcher.version}", title + ' ' + description + ' ' + keywords,
+            lambda text: matcher.find(text, lowered=True)
+        ))
+    
+    def _relevance_matcher(self) -> KeywordMatcher:
+        # Keywords and titles compiled into one whole-word matcher (cached per keyword set)
+        return compile_keywords(frozenset(self.job_config.keywords) | frozenset(self.job_config.job_titles))
     
     def classify_job(self, job_data: Dict) -> JobListing:
         """Classify and enhance job data"""
@@ -234,29 +313,22 @@ class BaseJobScraper(ABC):
             sponsored=job_data.get('sponsored', False),
         )
         
-        # Classify job characteristics
-        text = (title + ' ' + description + ' ' + location).lower()
-        
-        # Remote work detection
-        remote_keywords = ['remote', 'work from home', 'telecommute', 'distributed', 'anywhere']
-        job.remote_friendly = any(keyword in text for keyword in remote_keywords)
-        
-        # Visa sponsorship detection
-        visa_keywords = ['visa sponsorship', 'h1b', 'sponsor visa', 'work authorization']
-        job.visa_sponsorship = any(keyword in text for keyword in visa_keywords)
-        
-        # Security clearance detection (mainly for cybersecurity)
-        clearance_keywords = ['security clearance', 'top secret', 'secret clearance', 'ts/sci']
-        job.security_clearance_required = any(keyword in text for keyword in clearance_keywords)
+        # Classify job characteristics: remote work, visa sponsorship, security clearance
+        # (mainly for cybersecurity), experience level and citizenship, all as whole
+        # words; the matched phrases are kept as evidence when configured
+        text = title + ' ' + description + ' ' + location
+        if self.config.classification_evidence:
+            features = self.classifications.get_or_compute(self.feature_extractor.version, text, self._job_features)
+        else:
+            features = self.classifications.get_or_compute(self.feature_extractor.labels_version, text,
+                                                           self._job_labels)
+        for flag, value in features['flags'].items():
+            setattr(job, flag, value)
+        job.classification_evidence = {feature: list(phrases) for feature, phrases in features['evidence'].items()}
         
         # Experience level detection
         if not job.experience_level:
-            if any(keyword in text for keyword in ['senior', 'sr.', 'lead', 'principal', 'staff']):
-                job.experience_level = 'senior'
-            elif any(keyword in text for keyword in ['junior', 'jr.', 'entry', 'associate', 'intern']):
-                job.experience_level = 'entry'
-            else:
-                job.experience_level = 'mid'
+            job.experience_level = features['experience_level']
         
         # Classification tags
         tags = []
@@ -273,18 +345,66 @@ class BaseJobScraper(ABC):
             tags.append('No Security Clearance Required')
         
         # F1 student friendly detection
-        citizenship_required = any(keyword in text for keyword in [
-            'us citizen', 'citizenship required', 'must be citizen',
-            'security clearance', 'clearance required'
-        ])
-        
-        if not citizenship_required and not job.security_clearance_required:
+        if not features['citizenship_required'] and not job.security_clearance_required:
             tags.append('F1 Student Friendly')
         
         job.classification_tags = tags
         
         return job
     
+    def _seen_listing(self, job_data: Dict, seen: Optional[SeenJob]) -> Optional[JobListing]:
+        """JobListing of a posting returned by an earlier run, from its stored details instead of classify_job"""
+        if seen is None:
+            return None
+        details = {key: seen.details[key] for key in SEEN_DETAILS if key in seen.details}
+        return JobListing(**{**job_data, **details}, seen_before=True,
+                          first_seen=datetime.fromtimestamp(seen.first_seen).isoformat())
+    
+    def _posting_fingerprints(self, job: Dict) -> Tuple[str, ...]:
+        """Seen-jobs store keys of a job: its URL, lowercased title and company blocking key"""
+        return posting_fingerprints(
+            (job.get('url') or '').strip(),
+            ' '.join(str(job.get('title') or '').lower().split()),
+            company_block(str(job.get('company') or ''))[1],
+        )
+    
+    def _seen_before(self, jobs: List[Dict]) -> List[Optional[SeenJob]]:
+        """Earlier-run record of each job, looked up in one query; all None without a seen-jobs store"""
+        if self.seen_jobs is None or not jobs:
+            return [None] * len(jobs)
+        return self.seen_jobs.lookup([self._posting_fingerprints(job) for job in jobs])
+    
+    def _remember_seen(self, jobs: List[Dict]):
+        """Record returned jobs in the seen-jobs store, if there is one, dating the new ones' first_seen"""
+        if self.seen_jobs is None:
+            return
+        now = time.time()
+        for job in jobs:
+            if not job.get('first_seen'):
+                job['first_seen'] = datetime.fromtimestamp(now).isoformat()
+        self.seen_jobs.record(((self._posting_fingerprints(job), {key: job[key] for key in SEEN_DETAILS if key in job})
+                               for job in jobs), seen_at=now)
+    
+    def _job_features(self, text: str) -> Dict:
+        """What classify_job needs from the feature extractor, in a form the classification cache can store"""
+        features = self.feature_extractor.extract(text, lowered=True)
+        return {
+            'flags': features.flags,
+            'experience_level': features.experience_level,
+            'citizenship_required': features.citizenship_required,
+            'evidence': evidence_phrases(features.evidence),
+        }
+    
+    def _job_labels(self, text: str) -> Dict:
+        """_job_features without the evidence, which labels() doesn't collect"""
+        flags, experience_level, citizenship_required = self.feature_extractor.labels(text, lowered=True)
+        return {
+            'flags': flags,
+            'experience_level': experience_level,
+            'citizenship_required': citizenship_required,
+            'evidence': {},
+        }
+    
     @abstractmethod
     def scrape_source(self, source: JobSource, **kwargs) -> List[JobListing]:
         """Scrape jobs from a specific source"""
@@ -306,28 +426,13 @@ class BaseJobScraper(ABC):
         
         all_jobs = []
         
-        for source_name in sources:
-            try:
-                source = JobSource(source_name)
-                logger.info(f"Scraping {source.value}...")
-                
-                jobs = self.scrape_source(
-                    source,
-                    location=location,
-                    time_filter=time_filter,
-                    experience_level=experience_level,
-                    keywords=keywords
-                )
-                
-                all_jobs.extend([job.to_dict() for job in jobs])
-                logger.info(f"Found {len(jobs)} jobs from {source.value}")
-                
-                # Respectful delay between sources
-                time.sleep(random.uniform(*self.config.delay_range))
-                
-            except Exception as e:
-                logger.error(f"Error scraping {source_name}: {str(e)}")
-                continue
+        # Each source runs on its own worker
+        tasks = self._source_tasks(sources, location=location, time_filter=time_filter,
+                                   experience_level=experience_level, keywords=keywords)
+        
+        for source_name, jobs in run_sources_parallel(tasks, max_workers=self.config.source_workers):
+            all_jobs.extend([job.to_dict() for job in jobs])
+            logger.info(f"Found {len(jobs)} jobs from {source_name}")
         
         # Apply filters
         if exclude_citizenship_required or f1_student:
@@ -337,29 +442,102 @@ class BaseJobScraper(ABC):
         all_jobs = self.remove_duplicates(all_jobs)
         
         logger.info(f"Total unique jobs found: {len(all_jobs)}")
+        if self.seen_jobs is not None:
+            logger.info(f"Seen on an earlier run: {sum(1 for job in all_jobs if job.get('seen_before'))}")
+            self._remember_seen(all_jobs)
+        cache_stats = self.session.cache_stats()
+        if cache_stats:
+            logger.info(f"HTTP cache: {cache_stats}")
+        logger.info(f"Classification cache: {self.classifications.stats()}")
+        self.classifications.save()
         return all_jobs
     
-    def remove_duplicates(self, jobs: List[Dict], similarity_threshold: int = 85) -> List[Dict]:
-        """Remove duplicate job listings based on similarity"""
+    def _source_tasks(self, sources: List[str], **kwargs) -> List[Tuple[str, Callable[[], List[JobListing]]]]:
+        """(source name, scrape callable) pairs for the requested source names"""
+        tasks = []
+        for source_name in sources:
+            try:
+                source = JobSource(source_name)
+            except ValueError as e:
+                logger.error(f"Error scraping {source_name}: {str(e)}")
+                continue
+            
+            logger.info(f"Scraping {source.value}...")
+            tasks.append((source.value, lambda source=source: self.scrape_source(source, **kwargs)))
+        return tasks
+    
+    def iter_all_sources(self,
+                         location: str = "United States",
+                         time_filter: str = "7d",
+                         experience_level: str = "all",
+                         sources: List[str] = None,
+                         exclude_citizenship_required: bool = False,
+                         f1_student: bool = False,
+                         exclude_easy_apply: bool = True,
+                         keywords: str = "",
+                         similarity_threshold: int = 85) -> Iterator[Dict]:
+        """Yield filtered, deduplicated jobs as each page is scraped instead of all at the end"""
+        
+        if sources is None:
+            sources = [source.value for source in JobSource if source != JobSource.GOOGLE_DORKS]
+        
+        tasks = self._source_tasks(sources, location=location, time_filter=time_filter,
+                                   experience_level=experience_level, keywords=keywords)
+        deduplicator = OnlineDeduplicator(self._dedup_signature, scorer=fuzz.ratio, threshold=similarity_threshold)
+        
+        for source_name, jobs in stream_sources(tasks, max_workers=self.config.source_workers):
+            page_jobs = []
+            for job in jobs:
+                job = job.to_dict()
+                if (exclude_citizenship_required or f1_student) and 'F1 Student Friendly' not in job.get('classification_tags', []):
+                    continue
+                if deduplicator.add(job):
+                    page_jobs.append(job)
+            self._remember_seen(page_jobs)
+            yield from page_jobs
+        
+        logger.info(f"Streamed {deduplicator.kept} unique jobs ({deduplicator.dropped} duplicates dropped)")
+    
+    def close(self):
+        """Release the scraper's connections and files (a recording cassette included) once it is done"""
+        self.classifications.close()
+        if self.seen_jobs is not None:
+            self.seen_jobs.close()
+        self.session.close()
+    
+    def _dedup_signature(self, job: Dict) -> Signature:
+        """Deduplication signature: the lowercased title, company and location, compared with fuzz.ratio"""
+        job_signature = f"{job['title']} {job['company']} {job['location']}".lower()
+        company, title = company_block(str(job['company'] or '')), str(job['title'] or '').lower()
+        blocks = (company, title_block(title), leading_words_block(title, company[1]))
+        return Signature(job_signature, job_signature, job.get('url') or '', blocks)
+    
+    def remove_duplicates(self, jobs: List[Dict], similarity_threshold: int = 85,
+                          engine: str = 'blocking', jaccard_threshold: float = 0.6,
+                          workers: Optional[int] = None) -> List[Dict]:
+        """Remove duplicate job listings based on similarity.
+
+        engine 'cdist' gives the same result from batched score matrices on all
+        cores; it is slower on one core and only worth it for large blocks (few
+        employers) on a multi-core machine. 'minhash' also finds reposts with a
+        reworded title or another company name, by Jaccard similarity of title,
+        company, location and description shingles; 'cluster' merges each group
+        of duplicates, transitively, into one record listing all of their URLs
+        and sources (see dedup.merge_duplicates). See dedup.ENGINES.
+
+        Given workers (-1: one per core), a large backfill is split into shards
+        by company, deduplicated in that many processes (see
+        dedup.sharded_deduplicate); not with 'minhash'. Fuzzy matches are then
+        only looked for within a company: any number of workers, 1 included,
+        keeps the same jobs, but they can differ from the default unsharded run.
+        """
         if not jobs:
             return jobs
         
-        unique_jobs = []
-        seen_jobs = []
-        
-        for job in jobs:
-            is_duplicate = False
-            job_signature = f"{job['title']} {job['company']} {job['location']}"
-            
-            for seen_signature in seen_jobs:
-                similarity = fuzz.ratio(job_signature.lower(), seen_signature.lower())
-                if similarity >= similarity_threshold:
-                    is_duplicate = True
-                    break
-            
-            if not is_duplicate:
-                unique_jobs.append(job)
-                seen_jobs.append(job_signature)
+        # Identical signatures and URLs are hash lookups; fuzz.ratio only compares
+        # jobs that share the company, the title's tokens or their leading words
+        unique_jobs = deduplicate(jobs, self._dedup_signature, scorer=fuzz.ratio, threshold=similarity_threshold,
+                                  engine=engine, jaccard_threshold=jaccard_threshold, workers=workers)
         
         logger.info(f"Removed {len(jobs) - len(unique_jobs)} duplicate jobs")
         return unique_jobs
@@ -477,6 +655,7 @@ class UnifiedJobScraper(BaseJobScraper):
             base_query += f' OR {keywords}'
         
         for page in range(max_pages):
+            page_start = len(jobs)
             try:
                 params = {
                     'q': base_query,
@@ -485,12 +664,13 @@ class UnifiedJobScraper(BaseJobScraper):
                     'fromage': time_filter.replace('d', '') if 'd' in time_filter else '7'
                 }
                 
-                response = self.session.get(base_url, params=params, timeout=self.config.timeout)
+                response = self.session.get(base_url, params=params)
                 response.raise_for_status()
                 
-                soup = BeautifulSoup(response.content, 'html.parser')
+                soup = make_soup(response.content, 'indeed')
                 job_cards = soup.find_all('div', class_='job_seen_beacon')
                 
+                page_cards = []
                 for card in job_cards:
                     try:
                         # Extract job data
@@ -509,27 +689,29 @@ class UnifiedJobScraper(BaseJobScraper):
                         link_elem = title_elem.find('a') if title_elem else None
                         job_url = f"https://www.indeed.com{link_elem['href']}" if link_elem and link_elem.get('href') else ""
                         
-                        # Check if relevant
-                        if self.is_relevant_job(title, description, keywords):
-                            job_data = {
-                                'title': title,
-                                'company': company,
-                                'location': job_location,
-                                'description': description,
-                                'url': job_url,
-                                'source': JobSource.INDEED.value,
-                                'posted_date': datetime.now().isoformat(),
-                            }
-                            
-                            job = self.classify_job(job_data)
-                            jobs.append(job)
+                        page_cards.append({
+                            'title': title,
+                            'company': company,
+                            'location': job_location,
+                            'description': description,
+                            'url': job_url,
+                            'source': JobSource.INDEED.value,
+                            'posted_date': datetime.now().isoformat(),
+                        })
                     
                     except Exception as e:
                         logger.error(f"Error parsing job card: {str(e)}")
                         continue
                 
-                # Respectful delay
-                time.sleep(random.uniform(*self.config.delay_range))
+                # Postings returned on an earlier run were relevant then and keep their classification
+                for job_data, seen in zip(page_cards, self._seen_before(page_cards)):
+                    job = self._seen_listing(job_data, seen)
+                    if job is None and self.is_relevant_job(job_data['title'], job_data['description'], keywords):
+                        job = self.classify_job(job_data)
+                    if job is not None:
+                        jobs.append(job)
+                
+                emit_page(jobs[page_start:])
                 
             except Exception as e:
                 logger.error(f"Error scraping Indeed page {page}: {str(e)}")
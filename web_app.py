@@ -4,6 +4,7 @@ import os
 import socket
 from datetime import datetime
 from job_scraper import CyberSecurityJobScraper, SoftwareEngineeringJobScraper
+from unified_scraper import ScrapingConfig
 import pandas as pd
 import threading
 import time
@@ -82,14 +83,18 @@ def scrape_jobs():
     def scrape_worker():
         global scraped_jobs, scraping_status
         
+        scraper = None
         try:
             scraping_status = {"running": True, "progress": 0, "message": "Initializing scraper..."}
             
+            # Parse pages in worker processes so the scrape doesn't hold the GIL the web server needs
+            config = ScrapingConfig(parse_workers=min(4, os.cpu_count() or 1))
+            
             # Choose the appropriate scraper based on job type
             if request_job_type == 'software':
-                scraper = SoftwareEngineeringJobScraper()
+                scraper = SoftwareEngineeringJobScraper(config)
             else:
-                scraper = CyberSecurityJobScraper()
+                scraper = CyberSecurityJobScraper(config)
             
             # Use the enhanced scraping method with filters
                 # Optionally enable Google Dorks by injecting into sources and env
@@ -100,7 +105,9 @@ def scrape_jobs():
                 if request_serp_api_key:
                     os.environ['SERP_API_KEY'] = request_serp_api_key
 
-                all_jobs = scraper.scrape_all_sources(
+                # Stream jobs into scraped_jobs so /api/jobs shows results while scraping continues
+                all_jobs = scraped_jobs
+                for job in scraper.iter_all_sources(
                 location=request_location,
                 time_filter=request_time_filter,
                 experience_level=request_experience_level,
@@ -109,7 +116,9 @@ def scrape_jobs():
                 f1_student=request_f1_student,
                 exclude_easy_apply=request_exclude_easy_apply,
                 keywords=request_keywords
-            )
+            ):
+                    all_jobs.append(job)
+                    scraping_status["message"] = f"Scraping... found {len(all_jobs)} jobs so far"
             
             # Save results
             scraping_status["message"] = "Saving results..."
@@ -138,6 +147,9 @@ def scrape_jobs():
                 
         except Exception as e:
             scraping_status = {"running": False, "progress": 0, "message": f"Error: {str(e)}"}
+        finally:
+            if scraper is not None:
+                scraper.close()
     
     # Start scraping in background
     scraping_thread = threading.Thread(target=scrape_worker)